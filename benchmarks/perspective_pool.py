@@ -0,0 +1,124 @@
+"""Benchmark: pooled PerspectiveScorer vs. a fresh client per request.
+
+Spins up a local stub of the Perspective `comments:analyze` endpoint and
+times sequential scoring calls through both client strategies.
+
+Run:
+  python benchmarks/perspective_pool.py [--requests 300] [--tls]
+
+`--tls` serves the stub over HTTPS with a throwaway self-signed cert
+(needs the `openssl` binary) so handshake cost is included, which is what
+the production path pays.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from modbot.infrastructure.providers.toxicity.perspective import PerspectiveScorer  # noqa: E402
+
+_BODY = json.dumps({"attributeScores": {"TOXICITY": {"summaryScore": {"value": 0.42}}}}).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        # header and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *a):  # silence
+        pass
+
+
+def _start_stub(tls_dir: str | None):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    scheme = "http"
+    if tls_dir:
+        cert, key = os.path.join(tls_dir, "cert.pem"), os.path.join(tls_dir, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(cert, key)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/v1alpha1/comments:analyze"
+
+
+async def _fresh_client_call(endpoint: str, verify) -> None:
+    # Mirrors the previous implementation: one AsyncClient per message.
+    async with httpx.AsyncClient(timeout=10, verify=verify) as client:
+        r = await client.post(endpoint, params={"key": "x"}, json={"comment": {"text": "hi"}})
+        r.raise_for_status()
+        r.json()
+
+
+async def _run(n: int, endpoint: str, verify) -> dict:
+    fresh: list[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await _fresh_client_call(endpoint, verify)
+        fresh.append((time.perf_counter() - t0) * 1000)
+
+    scorer = PerspectiveScorer("x", endpoint=endpoint, http2=False)
+    scorer._client = httpx.AsyncClient(timeout=10, limits=scorer.limits, verify=verify)
+    pooled: list[float] = []
+    try:
+        for _ in range(n):
+            t0 = time.perf_counter()
+            await scorer.score("hi")
+            pooled.append((time.perf_counter() - t0) * 1000)
+    finally:
+        await scorer.aclose()
+
+    def summary(xs: list[float]) -> dict:
+        xs = sorted(xs)
+        return {"p50_ms": round(statistics.median(xs), 3), "p95_ms": round(xs[int(len(xs) * 0.95) - 1], 3)}
+
+    return {"fresh_client": summary(fresh), "pooled_client": summary(pooled)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        server, endpoint = _start_stub(tmp if args.tls else None)
+        verify = ssl.create_default_context(cafile=os.path.join(tmp, "cert.pem")) if args.tls else True
+        try:
+            result = asyncio.run(_run(args.requests, endpoint, verify))
+        finally:
+            server.shutdown()
+    print(json.dumps({"requests": args.requests, "tls": args.tls, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
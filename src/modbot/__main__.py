@@ -33,6 +33,10 @@ def _validate_policy(verbose: bool = False):
     if verbose:
         text = format_rules(pol, detail=False)
         print("Policy rules loaded:\n" + (text or "(none)"))
+        if pol.diagnostics:
+            print("\nPolicy warnings:")
+            for issue in pol.diagnostics:
+                print(f"  - {issue}")
     return True
 
 
@@ -53,6 +57,8 @@ def main(argv: list[str] | None = None, *, dry_run: bool | None = None):  # prag
     _print_header()
 
     if args.dry_run:
+        if not _validate_policy(verbose=True):
+            sys.exit(1)
         print("\nDry run validation successful.")
         # In dry run, we can also try to initialize commands to catch startup errors
         try:
@@ -34,12 +34,65 @@ class BotConfig(BaseSettings):
 
 	# Toxicity / external APIs
 	perspective_api_key: Optional[str] = Field(None, env="PERSPECTIVE_API_KEY")
+	perspective_timeout_seconds: int = Field(10, env="PERSPECTIVE_TIMEOUT_SECONDS")
+	perspective_max_connections: int = Field(20, env="PERSPECTIVE_MAX_CONNECTIONS")
+	perspective_max_keepalive: int = Field(10, env="PERSPECTIVE_MAX_KEEPALIVE")
+	perspective_http2: bool = Field(True, env="PERSPECTIVE_HTTP2")
+	perspective_qps: float = Field(1.0, env="PERSPECTIVE_QPS")
+	perspective_burst: float = Field(1.0, env="PERSPECTIVE_BURST")
+	perspective_max_queue: int = Field(50, env="PERSPECTIVE_MAX_QUEUE")
+	perspective_deadline_seconds: float = Field(2.0, env="PERSPECTIVE_DEADLINE_SECONDS")
 	detoxify_enabled: bool = Field(False, env="DETOXIFY_ENABLED")
+	detoxify_batch_size: int = Field(16, env="DETOXIFY_BATCH_SIZE")
+	detoxify_batch_wait_ms: float = Field(5.0, env="DETOXIFY_BATCH_WAIT_MS")
+	detoxify_mode: Literal["thread", "process"] = Field("thread", env="DETOXIFY_MODE")
+	detoxify_workers: int = Field(2, env="DETOXIFY_WORKERS")
+	detoxify_torch_threads: int = Field(1, env="DETOXIFY_TORCH_THREADS")
+	toxicity_cache_size: int = Field(10000, env="TOXICITY_CACHE_SIZE")
+	toxicity_cache_ttl_seconds: float = Field(600.0, env="TOXICITY_CACHE_TTL_SECONDS")
+	toxicity_window_tokens: int = Field(64, env="TOXICITY_WINDOW_TOKENS")
+	toxicity_window_max_tokens: int = Field(512, env="TOXICITY_WINDOW_MAX_TOKENS")
+	toxicity_window_reducer: str = Field("max", env="TOXICITY_WINDOW_REDUCER")
+	prefilter_enabled: bool = Field(True, env="PREFILTER_ENABLED")
+	prefilter_wordlist: Optional[str] = Field(None, env="PREFILTER_WORDLIST")
+	prefilter_max_benign_len: int = Field(1, env="PREFILTER_MAX_BENIGN_LEN")
+	prefilter_benign_terms: Optional[str] = Field(None, env="PREFILTER_BENIGN_TERMS")  # None = built-in list
+	prefilter_hit_score: float = Field(0.95, env="PREFILTER_HIT_SCORE")
+	toxicity_latency_budget_ms: int = Field(2500, env="TOXICITY_LATENCY_BUDGET_MS")
+	toxicity_breaker_failures: int = Field(5, env="TOXICITY_BREAKER_FAILURES")
+	toxicity_breaker_reset_seconds: float = Field(30.0, env="TOXICITY_BREAKER_RESET_SECONDS")
+
+	# Moderation work queue
+	mod_queue_workers: int = Field(4, env="MOD_QUEUE_WORKERS")
+	mod_queue_capacity: int = Field(1000, env="MOD_QUEUE_CAPACITY")
+	mod_queue_overflow: Literal["drop_oldest", "drop_newest", "skip_llm"] = Field("drop_oldest", env="MOD_QUEUE_OVERFLOW")
+	load_shed_enabled: bool = Field(True, env="LOAD_SHED_ENABLED")
+	load_shed_depth_fractions: str = Field("0.5,0.75,0.9", env="LOAD_SHED_DEPTH_FRACTIONS")
+	load_shed_wait_seconds: str = Field("2,5,10", env="LOAD_SHED_WAIT_SECONDS")
+	load_shed_recover_seconds: float = Field(10.0, env="LOAD_SHED_RECOVER_SECONDS")
+
+	# Sharding
+	bot_sharding: Literal["off", "auto"] = Field("off", env="BOT_SHARDING")
+	shard_count: Optional[int] = Field(None, env="SHARD_COUNT")  # None = Discord's recommendation
+	shard_ids: Optional[str] = Field(None, env="SHARD_IDS")  # e.g. "0-3,8"; needs SHARD_COUNT
+	shard_identify_stagger_seconds: float = Field(5.0, env="SHARD_IDENTIFY_STAGGER_SECONDS")
+	coordination_backend: Literal["sqlite", "memory"] = Field("sqlite", env="COORDINATION_BACKEND")
 
 	# Moderation & escalation
 	mod_exempt_role_names: str = Field("mod,admin", env="MOD_EXEMPT_ROLE_NAMES")
 	mod_alert_channel_name: Optional[str] = Field(None, env="MOD_ALERT_CHANNEL_NAME")
 	mod_alert_role_name: Optional[str] = Field(None, env="MOD_ALERT_ROLE_NAME")
+	action_timeout_seconds: float = Field(10.0, env="ACTION_TIMEOUT_SECONDS")
+	policy_reload_seconds: float = Field(5.0, env="POLICY_RELOAD_SECONDS")
+	edit_rescoring_enabled: bool = Field(True, env="EDIT_RESCORING_ENABLED")
+	edit_debounce_seconds: float = Field(2.0, env="EDIT_DEBOUNCE_SECONDS")
+	delete_batch_window_ms: int = Field(500, env="DELETE_BATCH_WINDOW_MS")
+	warn_dm_coalesce_seconds: float = Field(3.0, env="WARN_DM_COALESCE_SECONDS")
+	rest_max_concurrent: int = Field(8, env="REST_MAX_CONCURRENT")
+	rest_route_concurrency: int = Field(2, env="REST_ROUTE_CONCURRENCY")
+	action_outbox_enabled: bool = Field(True, env="ACTION_OUTBOX_ENABLED")
+	action_outbox_max_attempts: int = Field(6, env="ACTION_OUTBOX_MAX_ATTEMPTS")
+	message_dedup_size: int = Field(50000, env="MESSAGE_DEDUP_SIZE")
 
 	# MCP
 	mcp_server_url: Optional[str] = Field(None, env="MCP_SERVER_URL")
@@ -57,6 +110,13 @@ class BotConfig(BaseSettings):
 	def _normalize_provider(cls, v: str):  # noqa: D401
 		return (v or "").lower()
 
+	@field_validator("test_guild_id", "shard_count", "shard_ids", mode="before")
+	def _blank_is_unset(cls, v):
+		# `SHARD_COUNT=` in .env means "not set", not an invalid int
+		if isinstance(v, str) and not v.strip():
+			return None
+		return v
+
 	@field_validator("llm_timeout_seconds", "llm_max_retries", mode="before")
 	def _coerce_positive(cls, v):
 		try:
@@ -75,6 +135,8 @@ class BotConfig(BaseSettings):
 			raise ValueError(
 				f"MODEL_PROVIDER must be one of {_ALLOWED_MODEL_PROVIDERS}, got '{self.model_provider}'"
 			)
+		if self.shard_ids and not self.shard_count:
+			raise ValueError("SHARD_IDS requires SHARD_COUNT (the total across all processes)")
 		return self
 
 
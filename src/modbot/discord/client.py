@@ -1,6 +1,7 @@
 """ModerationBot Discord client definition moved from main.py."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import discord
 from discord import app_commands
@@ -10,6 +11,20 @@ from ..domain.policy.loader import load_policy
 from ..infrastructure.providers.llm.factory import create_llm_provider as get_llm_provider  # type: ignore
 from ..infrastructure.providers.toxicity.factory import create_toxicity_scorer  # type: ignore
 from ..infrastructure.persistence.db_core import ActionDB
+from ..domain.moderation.actions.runner import ActionRunner
+from ..services.moderation_pipeline import ModerationPipeline
+from ..services.work_queue import ModerationWorkQueue
+from ..services.load_shedding import LoadShedder, parse_thresholds
+from ..services.policy_reload import PolicyReloader
+from ..services.exemptions import ExemptionIndex
+from ..services.edit_tracker import EditTracker
+from ..services.raid_detection import RaidDetector
+from ..services.message_dedup import RecentIdSet
+from ..services.deletion_batcher import DeletionBatcher
+from ..services.warning_dispatcher import WarningDispatcher
+from ..services.rest_scheduler import RestScheduler
+from ..services.action_outbox import ActionOutbox
+from ..services.sharding import ShardLane, ShardedWorkQueue, parse_shard_ids
 
 from ..infrastructure.logging.structured_logging import init_logging
 
@@ -26,10 +41,24 @@ if not CONFIG.discord_token:
     logger.error("DISCORD_TOKEN missing. Check your .env file.")
     raise SystemExit(1)
 
-class ModerationBot(discord.Client):
+# BOT_SHARDING=auto switches to discord.py's AutoShardedClient (one gateway
+# connection per shard, each with its own moderation lane).
+_SHARDED = CONFIG.bot_sharding == "auto"
+_ClientBase = discord.AutoShardedClient if _SHARDED else discord.Client
+
+
+class ModerationBot(_ClientBase):  # type: ignore[misc,valid-type]
     """Discord client wiring policies, providers, DB, and slash commands."""
     def __init__(self):
-        super().__init__(intents=INTENTS)
+        shard_kwargs = {}
+        if _SHARDED and CONFIG.shard_count:
+            shard_kwargs["shard_count"] = CONFIG.shard_count
+            if CONFIG.shard_ids:
+                # This process owns only these shards; others run elsewhere
+                # against the same SQLite action log (see coordination.py).
+                shard_kwargs["shard_ids"] = parse_shard_ids(CONFIG.shard_ids)
+        super().__init__(intents=INTENTS, **shard_kwargs)
+        self._identify_lock = asyncio.Lock()
         self.tree = app_commands.CommandTree(self)
         self.policy = self._load_policy()
         self.config = CONFIG
@@ -46,10 +75,67 @@ class ModerationBot(discord.Client):
             self.toxicity_scorer = create_toxicity_scorer(self.config)
         except Exception as e:  # pragma: no cover
             logger.warning("Toxicity scorer initialization failed: %s (continuing; may be dry-run)", e)
-        self.db = ActionDB()
+        self.db = ActionDB(coordination=self.config.coordination_backend)
         self.test_guild_id = str(self.config.test_guild_id) if self.config.test_guild_id else None
         roles_env = self.config.mod_exempt_role_names or "mod,admin"
         self.moderator_role_names = {r.strip().lower() for r in roles_env.split(',') if r.strip()}
+        self.exemptions = ExemptionIndex(self.moderator_role_names, lambda: self.policy)
+        self.raid_detector = RaidDetector(lambda: self.policy)
+        self.recent_messages = RecentIdSet(self.config.message_dedup_size)  # first gate in on_message
+        self.rest_scheduler = RestScheduler(
+            max_concurrent=self.config.rest_max_concurrent,
+            route_limit=self.config.rest_route_concurrency,
+        )
+        self.deletion_batcher = DeletionBatcher(
+            window_seconds=self.config.delete_batch_window_ms / 1000.0,
+            scheduler=self.rest_scheduler,
+        )
+        self.warning_dispatcher = WarningDispatcher(
+            window_seconds=self.config.warn_dm_coalesce_seconds,
+            scheduler=self.rest_scheduler,
+            on_result=self.db.update_action_status,  # 'queued' warn rows -> success / failure
+        )
+        self.outbox = ActionOutbox(
+            self.db,
+            self,
+            scheduler=self.rest_scheduler,
+            max_attempts=self.config.action_outbox_max_attempts,
+        ) if self.config.action_outbox_enabled else None
+        self.action_runner = ActionRunner(self.config.action_timeout_seconds)
+        self.work_queue = ShardedWorkQueue(self._make_lane, sharded=_SHARDED)
+        self.edit_tracker = EditTracker(
+            submit=lambda message: self.work_queue.put(message, is_edit=True),
+            debounce_seconds=self.config.edit_debounce_seconds,
+        )
+        self.policy_reloader = PolicyReloader(
+            apply=self.set_policy,
+            current=lambda: self.policy,
+            poll_seconds=self.config.policy_reload_seconds,
+        )
+
+    def _make_lane(self, shard_id: int) -> ShardLane:
+        queue = ModerationWorkQueue(
+            handler=lambda item: pipeline.process_message(self, item.message, skip_llm=item.skip_llm, is_edit=item.is_edit, raid=item.raid),
+            workers=self.config.mod_queue_workers,
+            capacity=self.config.mod_queue_capacity,
+            overflow=self.config.mod_queue_overflow,
+        )
+        shedder = LoadShedder(
+            queue,
+            depth_fractions=parse_thresholds(self.config.load_shed_depth_fractions),
+            wait_seconds=parse_thresholds(self.config.load_shed_wait_seconds),
+            recover_seconds=self.config.load_shed_recover_seconds,
+            enabled=self.config.load_shed_enabled,
+        )
+        pipeline = ModerationPipeline(self.toxicity_scorer, self.action_runner, self.policy, self.db, shedder=shedder)
+        return ShardLane(shard_id=shard_id, queue=queue, shedder=shedder, pipeline=pipeline)
+
+    def set_policy(self, policy) -> None:
+        """Swap the active policy; no await in between, so all views change together."""
+        self.policy = policy
+        for lane in self.work_queue.lanes.values():
+            lane.pipeline.policy = policy
+        self.exemptions.invalidate_all()  # exempt_roles / scope may have changed
 
     def is_moderator(self, member: discord.Member | None) -> bool:
         if member is None:
@@ -77,7 +163,25 @@ class ModerationBot(discord.Client):
             logger.error("Failed to load policy: %s", e)
             return None
 
+    def shard_latencies(self) -> dict:
+        if _SHARDED:
+            return dict(self.latencies)
+        return {0: self.latency}
+
+    async def before_identify_hook(self, shard_id: int | None, *, initial: bool = False) -> None:
+        # Serialize IDENTIFYs with a fixed gap so a mass reconnect brings
+        # shards back one at a time instead of all at once after the same
+        # 5 s default delay.
+        async with self._identify_lock:
+            if not initial:
+                await asyncio.sleep(self.config.shard_identify_stagger_seconds)
+            logger.info("Identifying shard %s", shard_id)
+
     async def setup_hook(self) -> None:
+        self.work_queue.start()
+        self.policy_reloader.start()
+        if self.outbox is not None:
+            self.outbox.start()  # also picks up entries left by a previous run
         if self.test_guild_id:
             try:
                 gid = int(self.test_guild_id)
@@ -91,6 +195,22 @@ class ModerationBot(discord.Client):
             await self.tree.sync()
             logger.info("Global slash commands sync requested (may take up to 1 hour to propagate)")
 
+    async def close(self) -> None:
+        await self.policy_reloader.stop()
+        self.edit_tracker.cancel_all()
+        await self.work_queue.stop()
+        await self.deletion_batcher.aclose()
+        await self.warning_dispatcher.aclose()
+        if self.outbox is not None:
+            await self.outbox.stop()  # undelivered entries stay in the table for the next start
+        closer = getattr(self.toxicity_scorer, 'aclose', None)
+        if closer is not None:
+            try:
+                await closer()
+            except Exception as e:  # pragma: no cover
+                logger.warning("Toxicity scorer shutdown failed: %s", e)
+        await super().close()
+
 bot = ModerationBot()
 
 __all__ = ["ModerationBot", "bot"]
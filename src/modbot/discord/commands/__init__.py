@@ -5,6 +5,7 @@ from .mod_llm_ping import setup_mod_llm_ping
 from .mod_history import setup_mod_history
 from .mod_metrics import setup_mod_metrics
 from .mod_config import setup_mod_config
+from .mod_reload import setup_mod_reload
 from .appeal import setup_appeal
 from .appeals_review import setup_appeals_review
 
@@ -15,6 +16,7 @@ ALL_SETUP_FUNCS = [
     setup_mod_history,
     setup_mod_metrics,
     setup_mod_config,
+    setup_mod_reload,
     setup_appeal,
     setup_appeals_review,
 ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import discord
 from ..client import ModerationBot
+from ...services.rest_scheduler import RestPriority, rest_slot
 from ...infrastructure.logging.structured_logging import warning as log_warning, info as log_info
 from discord import app_commands
 from ...utils.channel_utils import find_text_channel
@@ -33,7 +34,8 @@ def setup_appeal(bot: ModerationBot):
             ch = find_text_channel(guild, bot.policy.appeals.channel)
             if ch:
                 try:
-                    await ch.send(f"[Appeal #{appeal_id}] from {user.mention} referencing action {action_id or 'n/a'}: {reason[:180]}")
+                    async with rest_slot(bot.rest_scheduler, RestPriority.ESCALATE, ('channel', ch.id)):
+                        await ch.send(f"[Appeal #{appeal_id}] from {user.mention} referencing action {action_id or 'n/a'}: {reason[:180]}")
                 except Exception:  
                     log_warning("appeal.notify_channel_failed", appeal_id=appeal_id)
         await interaction.followup.send(f"Appeal submitted (id={appeal_id}). A moderator will review it.")
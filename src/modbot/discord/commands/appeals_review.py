@@ -2,6 +2,7 @@ from __future__ import annotations
 import time
 import discord
 from ..client import ModerationBot
+from ...services.rest_scheduler import RestPriority, rest_slot
 from ...infrastructure.logging.structured_logging import info as log_info, warning as log_warning
 from ...utils.decorators import moderator_only
 from ...utils.format_utils import format_rel_age, truncate_for_discord
@@ -72,7 +73,8 @@ def setup_appeals_review(bot: ModerationBot):
                             f"Resolution: {resolution[:380]}"
                         )
                         try:
-                            await member.send(dm_text)
+                            async with rest_slot(bot.rest_scheduler, RestPriority.DM, ('dm', member.id)):
+                                await member.send(dm_text)
                             notified = " (user notified)"
                         except Exception:  
                             notified = " (DM failed)"
@@ -0,0 +1,15 @@
+from __future__ import annotations
+import discord
+from ..client import ModerationBot
+from ...utils.decorators import moderator_only
+from ...infrastructure.logging.structured_logging import info as log_info
+
+
+def setup_mod_reload(bot: ModerationBot):
+    @bot.tree.command(name="mod_reload", description="Reload the moderation policy file without restarting")
+    @moderator_only("/mod_reload restricted to moderators", "cmd.mod_reload.denied")
+    async def mod_reload(interaction: discord.Interaction):
+        log_info("cmd.mod_reload", user_id=interaction.user.id, guild_id=getattr(interaction.guild, 'id', None))
+        _, outcome = await bot.policy_reloader.reload(source="command")
+        await interaction.followup.send(outcome, ephemeral=True)
+    return bot
@@ -2,13 +2,39 @@ from __future__ import annotations
 import discord
 from ..client import ModerationBot
 from ...infrastructure.logging.structured_logging import info as log_info
+from ...utils.format_utils import truncate_for_discord
+
+
+def _format_component_stats(stats: dict) -> list[str]:
+    lines = []
+    for component, values in stats.items():
+        parts = ' '.join(f"{k}={v}" for k, v in values.items())
+        lines.append(f"  {component}: {parts}")
+    return lines
+
 
 def setup_mod_status(bot: ModerationBot):
     @bot.tree.command(name="mod_status", description="Show moderation system status")
     async def mod_status(interaction: discord.Interaction):
         log_info("cmd.mod_status", user_id=interaction.user.id, guild_id=getattr(interaction.guild, 'id', None))
         loaded = bot.policy is not None
-        await interaction.response.send_message(
-            f"Moderation bot online. Policy loaded={loaded}", ephemeral=True
-        )
+        lines = [f"Moderation bot online. Policy loaded={loaded}"]
+        if loaded:
+            lines.append(f"Policy version: {bot.policy.version} (reloads={bot.policy_reloader.reloads} failed={bot.policy_reloader.failures})")
+        scorer_stats = getattr(bot.toxicity_scorer, 'stats', None)
+        if callable(scorer_stats):
+            lines.append(f"Toxicity scorer: {type(bot.toxicity_scorer).__name__}")
+            lines.extend(_format_component_stats(scorer_stats()))
+        lines.extend(_format_component_stats(bot.work_queue.stats(bot.shard_latencies())))
+        lines.extend(_format_component_stats(bot.recent_messages.stats()))
+        lines.extend(_format_component_stats(bot.exemptions.stats()))
+        lines.extend(_format_component_stats(bot.edit_tracker.stats()))
+        lines.extend(_format_component_stats(bot.raid_detector.stats()))
+        lines.extend(_format_component_stats(bot.deletion_batcher.stats()))
+        lines.extend(_format_component_stats(bot.warning_dispatcher.stats()))
+        lines.extend(_format_component_stats(bot.rest_scheduler.stats()))
+        if bot.outbox is not None:
+            lines.extend(_format_component_stats(bot.outbox.stats()))
+        # one line per component keeps growing; stay under Discord's 2000-char cap
+        await interaction.response.send_message(truncate_for_discord("\n".join(lines)), ephemeral=True)
     return bot
@@ -1,64 +1,20 @@
 from __future__ import annotations
 
 import discord
-from typing import List
-
-from .client import bot, ModerationBot
+from .client import bot
+from ..utils.channel_utils import name_index
 from ..infrastructure.logging.structured_logging import (
     info as log_info,
     warning as log_warning,
     debug as log_debug,
-    error as log_error,
 )
-from ..services.escalation_service import evaluate_escalation_thresholds
-from ..domain.moderation.actions.runner import run_actions
-
-class EscalationContext:
-    def __init__(self, bot: ModerationBot, message: discord.Message, toxicity: float):
-        self.bot = bot
-        self.message = message
-        self.toxicity = toxicity
-        self.guild_id = getattr(message.guild, 'id', None)
-        self.window_minutes = bot.policy.escalation.window_minutes if bot.policy else 60
-        self.pending_followups: List[str] = []
-
-    def record(self, action: str, target_id: int, status: str = 'success', failure_reason: str | None = None):
-        self.bot.db.log_action(
-            self.guild_id,
-            getattr(self.message.channel, 'id', None),
-            getattr(self.bot.user, 'id', None),
-            action,
-            target_id,
-            f"toxicity={self.toxicity:.2f}",
-            evidence={"message_id": self.message.id, "excerpt": self.message.content[:140]},
-            status=status,
-            failure_reason=failure_reason,
-        )
-        if status != 'success':
-            return
-        if not self.bot.policy or not getattr(self.bot.policy, 'escalation', None):
-            return
-        followups = evaluate_escalation_thresholds(
-            self.bot.db,
-            self.bot.policy.escalation,
-            target_id,
-            action,
-            self.window_minutes,
-        )
-        for f in followups:
-            log_info(
-                "escalation.threshold_met",
-                base_action=action.split('(')[0].lower(),
-                follow_action=f,
-                target_id=target_id,
-            )
-            self.pending_followups.append(f)
 
 @bot.event
 async def on_ready():
     log_info("lifecycle.ready", bot_user=str(bot.user), bot_id=getattr(bot.user, 'id', None), guild_count=len(bot.guilds))
     for g in bot.guilds:
         log_info("lifecycle.guild", guild_name=g.name, guild_id=g.id, members=getattr(g, 'member_count', 'n/a'))
+        name_index.build(g)
 
 @bot.event
 async def on_disconnect():
@@ -68,34 +24,112 @@ async def on_disconnect():
 async def on_resumed():
     log_info("lifecycle.resumed")
 
+@bot.event
+async def on_shard_ready(shard_id: int):
+    log_info("lifecycle.shard_ready", shard_id=shard_id)
+
+@bot.event
+async def on_shard_disconnect(shard_id: int):
+    log_warning("lifecycle.shard_disconnected", shard_id=shard_id)
+
+@bot.event
+async def on_shard_resumed(shard_id: int):
+    log_info("lifecycle.shard_resumed", shard_id=shard_id)
+
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    name_index.build(guild)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    name_index.forget(guild.id)
+    bot.exemptions.invalidate_guild(guild.id)
+
+@bot.event
+async def on_guild_update(before: discord.Guild, after: discord.Guild):
+    if before.owner_id != after.owner_id:
+        bot.exemptions.invalidate_guild(after.id)
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    if before.roles != after.roles:
+        bot.exemptions.invalidate_member(after.guild.id, after.id)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    bot.exemptions.invalidate_guild(role.guild.id)
+    name_index.role_created(role)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    bot.exemptions.invalidate_guild(after.guild.id)
+    name_index.role_updated(before, after)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    bot.exemptions.invalidate_guild(role.guild.id)
+    name_index.role_deleted(role)
+
+@bot.event
+async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+    bot.exemptions.invalidate_guild(channel.guild.id)
+    name_index.channel_created(channel)
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    bot.exemptions.invalidate_guild(after.guild.id)
+    name_index.channel_updated(before, after)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    bot.exemptions.invalidate_guild(channel.guild.id)
+    name_index.channel_deleted(channel)
+    bot.raid_detector.forget_channel(channel.id)
+
 @bot.event
 async def on_message(message: discord.Message):
     if message.author.bot:
         return
+    # A redelivered MESSAGE_CREATE stops here, before any tracker sees it.
+    if not bot.recent_messages.add(message.id):
+        log_debug("message.duplicate", message_id=message.id)
+        return
     if not bot.policy:
         return
-    if isinstance(message.author, discord.Member) and bot.is_moderator(message.author):
-        log_debug("message.skip_exempt", user_id=message.author.id)
+    skip = bot.exemptions.skip_reason(message)
+    if skip:
+        log_debug("message.skip_exempt", user_id=message.author.id, reason=skip)
         return
-    try:
-        toxicity_score = await bot.toxicity_scorer.score(message.content)
-    except Exception as e:  
-        log_error("toxicity.error", error=str(e))
-        toxicity_score = 0.0
-    rule, actions = bot.policy.evaluate_toxicity(toxicity_score)
-    if rule:
-        log_info("moderation.rule_match", rule=rule.name, toxicity=round(toxicity_score, 4), actions=actions)
-        escalation_ctx = EscalationContext(bot, message, toxicity_score)
+    if bot.config.edit_rescoring_enabled:
+        bot.edit_tracker.remember(message)
+    # Raid tracking must see every message in order, so it runs here rather than on a worker.
+    raid = bot.raid_detector.observe(message)
+    # Scoring and actions run on the work queue's workers; see ModerationWorkQueue.
+    bot.work_queue.put(message, raid=raid)
+
+@bot.event
+async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent):
+    if not bot.config.edit_rescoring_enabled or not bot.policy:
+        return
+    content = payload.data.get('content')
+    if content is None:  # embed unfurl, pin, flags: text did not change
+        return
+    author = payload.data.get('author') or {}
+    if author.get('bot') or payload.guild_id is None:
+        return
+    if bot.edit_tracker.is_unchanged(payload.message_id, content):
+        return
+    message = getattr(payload, 'message', None)  # discord.py >= 2.5
+    if message is None:
+        channel = bot.get_channel(payload.channel_id)
+        if channel is None:
+            return
         try:
-            await run_actions(message, actions, toxicity_score, escalation_ctx)
-            if escalation_ctx.pending_followups:
-                log_info(
-                    "moderation.escalation_followups",
-                    count=len(escalation_ctx.pending_followups),
-                    actions=escalation_ctx.pending_followups,
-                )
-                await run_actions(message, escalation_ctx.pending_followups, toxicity_score, escalation_ctx)
-        except Exception as e:  
-            log_error("moderation.action_exec_error", error=str(e))
-    else:
-        log_debug("moderation.no_match", toxicity=round(toxicity_score,4), excerpt=message.content[:60])
+            message = await channel.fetch_message(payload.message_id)  # type: ignore[attr-defined]
+        except discord.HTTPException:
+            return
+    skip = bot.exemptions.skip_reason(message)
+    if skip:
+        log_debug("message.skip_exempt", user_id=message.author.id, reason=skip, edited=True)
+        return
+    bot.edit_tracker.schedule(message)
@@ -1,8 +1,10 @@
 """Import action modules to populate registry on package import."""
-from .registry import list_actions, register, find_handler  # re-export
+from .registry import list_actions, register, find_handler, get_handler  # re-export
 from . import timeout, escalate, ask_llm, delete_message, warn  # noqa: F401
+from .plan import ActionPlan, ActionCompileError, compile_action, compile_actions
 from .runner import ActionRunner
 
 __all__ = [
-    'list_actions', 'register', 'find_handler', 'ActionRunner'
+    'list_actions', 'register', 'find_handler', 'get_handler', 'ActionRunner',
+    'ActionPlan', 'ActionCompileError', 'compile_action', 'compile_actions',
 ]
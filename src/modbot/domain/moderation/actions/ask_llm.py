@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import discord
 from .registry import register
 from ..interfaces import Action
@@ -7,9 +7,12 @@ from .helpers import action_ask_llm
 
 
 class AskLLMAction:
-    def can_handle(self, action: str) -> bool:
-        return action.strip().lower() == 'ask_llm'
-    async def execute(self, message: discord.Message, action: str, toxicity: float, ctx) -> Tuple[bool, Optional[str]]:
+    name = 'ask_llm'
+    timeout_seconds = None  # bounded by the LLM provider's own timeout/retries
+
+    def build(self) -> Dict[str, Any]:
+        return {}
+    async def execute(self, message: discord.Message, params: Dict[str, Any], toxicity: float, ctx) -> Tuple[bool, Optional[str]]:  # noqa: ARG002
         success = await action_ask_llm(message, toxicity, ctx)
         return success, None if success else 'ask_llm_failed'
 
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional
 import discord
 from .registry import register
 from ..interfaces import Action
@@ -7,11 +7,15 @@ from .helpers import action_delete_message
 
 
 class DeleteMessageAction:
-    def can_handle(self, action: str) -> bool:
-        return action.strip().lower() == 'delete_message'
-    async def execute(self, message: discord.Message, action: str, toxicity: float, ctx) -> Tuple[bool, Optional[str]]:  # noqa: ARG002
-        await action_delete_message(message, f"toxicity={toxicity:.2f}")
-        return True, None
+    name = 'delete_message'
+
+    def build(self, reason: Optional[str] = None) -> Dict[str, Any]:
+        return {'reason': None if reason is None else str(reason)}
+    async def execute(self, message: discord.Message, params: Dict[str, Any], toxicity: float, ctx):  # noqa: ARG002
+        ok, failure, batch_id = await action_delete_message(message, params['reason'] or f"toxicity={toxicity:.2f}", ctx)
+        if batch_id is not None:
+            return ok, failure, {'batch_id': batch_id}
+        return ok, failure
 
 register(DeleteMessageAction())
 __all__ = ["DeleteMessageAction"]
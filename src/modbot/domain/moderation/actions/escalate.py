@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import discord
 from .registry import register
 from ..interfaces import Action
@@ -7,13 +7,17 @@ from .helpers import action_escalate
 
 
 class EscalateAction:
-    def can_handle(self, action: str) -> bool:
-        return action.startswith('escalate(') and action.endswith(')')
-    async def execute(self, message: discord.Message, action: str, toxicity: float, ctx) -> Tuple[bool, Optional[str]]:
-        label = 'human_mods'
-        if action.startswith('escalate(') and action.endswith(')'):
-            label = action[len('escalate('):-1] or label
-        success = await action_escalate(message, label, f"toxicity={toxicity:.2f}", ctx)
+    name = 'escalate'
+    label_params = ('label',)
+    phase = 1  # alert moderators once the enforcement actions have landed
+
+    def build(self, label: str = 'human_mods', reason: Optional[str] = None) -> Dict[str, Any]:
+        label = str(label).strip()
+        if not label:
+            raise ValueError("label must not be empty")
+        return {'label': label, 'reason': None if reason is None else str(reason)}
+    async def execute(self, message: discord.Message, params: Dict[str, Any], toxicity: float, ctx) -> Tuple[bool, Optional[str]]:
+        success = await action_escalate(message, params['label'], params['reason'] or f"toxicity={toxicity:.2f}", ctx)
         return success, None if success else 'escalation_send_failed'
 
 register(EscalateAction())
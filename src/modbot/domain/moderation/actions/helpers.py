@@ -9,7 +9,7 @@ import json
 import time
 import re
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import discord
 
 try:  # legacy logging utils location (will be refactored later)
@@ -26,22 +26,95 @@ except Exception:
     def resolve_escalation_target(*a, **kw): return (None, "")
     def find_text_channel(*a, **kw): return None
 
+from modbot.infrastructure.providers.toxicity.cache import content_key
+from modbot.services.rest_scheduler import RestPriority, rest_slot
+from ..interfaces import Queued
+
 _RE_DECISION = re.compile(r"\b(warn|ignore|escalate|delete)\b", re.I)
 
 
-async def action_delete_message(message: discord.Message, reason: str):
+def _ctx_scheduler(escalation_ctx):
+    """The bot's RestScheduler, if the action runs with one."""
+    return getattr(getattr(escalation_ctx, 'bot', None), 'rest_scheduler', None)
+
+
+def _ctx_outbox(escalation_ctx):
+    """The bot's ActionOutbox, if durable delivery is enabled."""
+    return getattr(getattr(escalation_ctx, 'bot', None), 'outbox', None)
+
+
+def _outbox_key(kind: str, message: discord.Message, detail) -> str:
+    """Idempotency key: same message *and content* -> same key, so a replay is
+    deduplicated while a re-moderation after an edit gets its own entry."""
+    revision = content_key(message.content or "").hex()[:16]
+    return f"{kind}:{message.id}:{revision}:{detail}"
+
+
+def _queued(outbox, outbox_id: int) -> Queued:
+    return Queued(lambda log_id: outbox.link(outbox_id, log_id))
+
+
+def _outbox_log(message: discord.Message, action: str) -> dict:
+    """What the outbox needs to record a delivery that finally failed."""
+    return {
+        'guild_id': getattr(message.guild, 'id', None),
+        'channel_id': getattr(message.channel, 'id', None),
+        'message_id': message.id,
+        'action': action,
+        'target_id': message.author.id,
+    }
+
+
+def _ctx_policy(escalation_ctx):
+    """Policy the current message is being handled under (survives hot reloads)."""
+    if escalation_ctx is None:
+        return None
+    return getattr(escalation_ctx, 'policy', None) or getattr(escalation_ctx.bot, 'policy', None)
+
+
+async def delete_single(message: discord.Message, reason: str, scheduler=None) -> Tuple[bool, Optional[str]]:
     try:
-        await message.delete()
+        async with rest_slot(scheduler, RestPriority.DELETE, ('channel', getattr(message.channel, 'id', None))):
+            await message.delete()
         log_info("action.delete_message", message_id=message.id, reason=reason)
+        return True, None
     except discord.NotFound:
         log_warning("action.delete_message.already_deleted", message_id=message.id)
+        return True, None  # gone either way
     except discord.Forbidden:
         log_error("action.delete_message.forbidden", message_id=message.id)
+        return False, 'forbidden'
     except Exception as e:  # noqa: BLE001
         log_error("action.delete_message.error", message_id=message.id, error=str(e))
+        return False, 'error'
+
+
+async def action_delete_message(message: discord.Message, reason: str, escalation_ctx=None) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Delete via the bot's DeletionBatcher when there is one; returns (ok, failure_reason, batch_id)."""
+    batcher = getattr(getattr(escalation_ctx, 'bot', None), 'deletion_batcher', None)
+    if batcher is not None:
+        return await batcher.delete(message, reason)
+    ok, failure = await delete_single(message, reason, _ctx_scheduler(escalation_ctx))
+    return ok, failure, None
+
+
+async def record_result(escalation_ctx, message: discord.Message, label: str, performed, failure_reason: Optional[str] = None, evidence: Optional[dict] = None) -> None:
+    """Log an action's outcome; a `Queued` result is logged as 'queued' and linked to its sender."""
+    if escalation_ctx is None:
+        return
+    target_id = message.author.id
+    if isinstance(performed, Queued):
+        row_id = await escalation_ctx.record(label, target_id, status='queued', evidence=evidence)
+        if row_id is not None:
+            performed.link(row_id)
+    elif performed:
+        await escalation_ctx.record(label, target_id, status='success', evidence=evidence)
+    else:
+        await escalation_ctx.record(label, target_id, status='failure', failure_reason=failure_reason or 'unspecified', evidence=evidence)
 
 
 async def action_warn_user(message: discord.Message, reason: str, escalation_ctx=None):
+    """Warn by DM (channel mention as fallback); `Queued` when the WarningDispatcher sends it."""
     user = message.author
     guild = message.guild
     excerpt = message.content[:240]
@@ -49,12 +122,13 @@ async def action_warn_user(message: discord.Message, reason: str, escalation_ctx
     next_threshold_text = ""
     appeals_text = ""
     window_mins = None
-    if escalation_ctx and getattr(escalation_ctx.bot.policy, 'escalation', None):
+    policy = _ctx_policy(escalation_ctx)
+    if escalation_ctx and getattr(policy, 'escalation', None):
         window_mins = escalation_ctx.window_minutes
         try:
             pre = escalation_ctx.bot.db.count_recent(user.id, 'warn_user', escalation_ctx.window_minutes)
             warn_number = pre + 1
-            thresholds = escalation_ctx.bot.policy.escalation.parsed.get('warn_user', [])
+            thresholds = policy.escalation.parsed.get('warn_user', [])
             nxt = None
             for cnt, follow in thresholds:
                 if cnt > warn_number:
@@ -64,7 +138,7 @@ async def action_warn_user(message: discord.Message, reason: str, escalation_ctx
                 next_threshold_text = f"Next action at warning #{nxt[0]}: {nxt[1]}"
         except Exception as e:  
             log_debug("action.warn.count_failed", error=str(e))
-        appeals_conf = getattr(escalation_ctx.bot.policy, 'appeals', None)
+        appeals_conf = getattr(policy, 'appeals', None)
         if appeals_conf and guild:
             ch = find_text_channel(guild, getattr(appeals_conf, 'channel', None))
             if ch:
@@ -79,18 +153,28 @@ async def action_warn_user(message: discord.Message, reason: str, escalation_ctx
         lines.append(appeals_text)
     lines.append(f"Excerpt: {excerpt}")
     dm_text = "\n".join(lines)
+    fallback_text = f"{user.mention} this message violated server rules. ({reason})"
+    dispatcher = getattr(getattr(escalation_ctx, 'bot', None), 'warning_dispatcher', None)
+    if dispatcher is not None:
+        # Sent after the coalescing window, merged with the user's other warnings.
+        return dispatcher.submit(user, message.channel, dm_text, fallback_text)
+    scheduler = _ctx_scheduler(escalation_ctx)
     try:
-        await user.send(dm_text)
+        async with rest_slot(scheduler, RestPriority.DM, ('dm', user.id)):
+            await user.send(dm_text)
         log_info("action.warn_user.dm_sent", user_id=user.id, warn_number=warn_number)
     except Exception:
         log_warning("action.warn_user.dm_failed", user_id=user.id)
         try:
-            await message.channel.send(f"{user.mention} this message violated server rules. ({reason})")
+            async with rest_slot(scheduler, RestPriority.DM, ('channel', getattr(message.channel, 'id', None))):
+                await message.channel.send(fallback_text)
         except Exception as e:  # noqa: BLE001
             log_error("action.warn_user.channel_notify_failed", user_id=user.id, error=str(e))
+    return True
 
 
-async def action_timeout_member(message: discord.Message, minutes: int, reason: str) -> bool:
+async def action_timeout_member(message: discord.Message, minutes: int, reason: str, escalation_ctx=None):
+    """True/False when applied directly, `Queued` when handed to the ActionOutbox."""
     member: discord.Member = message.author  # type: ignore
     guild = message.guild
     bot_member = getattr(guild, 'me', None) if guild else None
@@ -103,15 +187,27 @@ async def action_timeout_member(message: discord.Message, minutes: int, reason:
             bot_id=getattr(bot_member, 'id', None),
         )
         return False
+    until = discord.utils.utcnow() + timedelta(minutes=minutes)
+    outbox = _ctx_outbox(escalation_ctx)
+    if outbox is not None and guild is not None:
+        try:
+            outbox_id, _ = outbox.enqueue_timeout(
+                _outbox_key("timeout", message, minutes), guild.id, member.id, until, reason,
+                _outbox_log(message, f"timeout_member({minutes})"),
+            )
+            log_info("action.timeout.queued", user_id=member.id, minutes=minutes, outbox_id=outbox_id)
+            return _queued(outbox, outbox_id)
+        except Exception as e:  # noqa: BLE001
+            log_error("action.timeout.outbox_error", user_id=member.id, error=str(e))
     try:
-        until = discord.utils.utcnow() + timedelta(minutes=minutes)
         used_api = None
-        if hasattr(member, 'timeout') and callable(getattr(member, 'timeout')):
-            await member.timeout(until, reason=reason)  # type: ignore[attr-defined]
-            used_api = 'member.timeout()'
-        else:
-            await member.edit(communication_disabled_until=until, reason=reason)
-            used_api = 'member.edit(communication_disabled_until=...)'
+        async with rest_slot(_ctx_scheduler(escalation_ctx), RestPriority.TIMEOUT, ('guild', getattr(guild, 'id', None))):
+            if hasattr(member, 'timeout') and callable(getattr(member, 'timeout')):
+                await member.timeout(until, reason=reason)  # type: ignore[attr-defined]
+                used_api = 'member.timeout()'
+            else:
+                await member.edit(communication_disabled_until=until, reason=reason)
+                used_api = 'member.edit(communication_disabled_until=...)'
         log_info(
             "action.timeout.success",
             user_id=member.id,
@@ -129,7 +225,8 @@ async def action_timeout_member(message: discord.Message, minutes: int, reason:
     return False
 
 
-async def action_escalate(message: discord.Message, label: str, reason: str, escalation_ctx=None) -> bool:
+async def action_escalate(message: discord.Message, label: str, reason: str, escalation_ctx=None):
+    """True/False when posted directly, `Queued` when handed to the ActionOutbox."""
     guild = message.guild
     if not guild:
         log_warning("action.escalate.no_guild")
@@ -141,8 +238,21 @@ async def action_escalate(message: discord.Message, label: str, reason: str, esc
         return False
     author = message.author
     snippet = message.content[:180]
+    content = f"{role_mention}[ESCALATION:{label}] user={author} (id={author.id}) | {reason} | excerpt=\"{snippet}\""
+    outbox = _ctx_outbox(escalation_ctx)
+    if outbox is not None:
+        try:
+            outbox_id, _ = outbox.enqueue_send(
+                _outbox_key("escalate", message, label), channel.id, content, RestPriority.ESCALATE,
+                _outbox_log(message, f"escalate({label})"),
+            )
+            log_info("action.escalate.queued", label=label, user_id=author.id, outbox_id=outbox_id)
+            return _queued(outbox, outbox_id)
+        except Exception as e:  # noqa: BLE001
+            log_error("action.escalate.outbox_error", label=label, user_id=author.id, error=str(e))
     try:
-        await channel.send(f"{role_mention}[ESCALATION:{label}] user={author} (id={author.id}) | {reason} | excerpt=\"{snippet}\"")
+        async with rest_slot(_ctx_scheduler(escalation_ctx), RestPriority.ESCALATE, ('channel', getattr(channel, 'id', None))):
+            await channel.send(content)
         log_info("action.escalate.sent", label=label, user_id=author.id, channel_id=getattr(channel, 'id', None))
         return True
     except Exception as e:  # noqa: BLE001
@@ -230,6 +340,7 @@ async def action_ask_llm(message: discord.Message, toxicity: float, escalation_c
             'toxicity': round(toxicity, 4),
             'mcp_response': mcp_response,
             'latency_ms': latency_ms,
+            'policy_version': getattr(_ctx_policy(escalation_ctx), 'version', None),
         }
         if escalation_ctx:
             escalation_ctx.bot.db.log_action(
@@ -250,28 +361,24 @@ async def action_ask_llm(message: discord.Message, toxicity: float, escalation_c
             tool_args = call.get("arguments", {}) or {}
 
             if tool_name == "delete_message":
-                await action_delete_message(message, tool_args.get("reason", "MCP Decision"))
-                if escalation_ctx:
-                    escalation_ctx.record('delete_message', message.author.id)
+                ok, failure, batch_id = await action_delete_message(message, tool_args.get("reason", "MCP Decision"), escalation_ctx)
+                await record_result(escalation_ctx, message, 'delete_message', ok, failure, {'batch_id': batch_id} if batch_id else None)
             elif tool_name == "warn_user":
-                await action_warn_user(message, tool_args.get("reason", "MCP Decision"), escalation_ctx)
-                if escalation_ctx:
-                    escalation_ctx.record('warn_user', message.author.id)
+                warned = await action_warn_user(message, tool_args.get("reason", "MCP Decision"), escalation_ctx)
+                await record_result(escalation_ctx, message, 'warn_user', warned)
             elif tool_name == "timeout_member":
                 # tolerate both "minutes" and "duration_minutes"
                 minutes = tool_args.get("minutes", tool_args.get("duration_minutes", 30))
-                await action_timeout_member(message, int(minutes), tool_args.get("reason", "MCP Decision"))
-                if escalation_ctx:
-                    escalation_ctx.record(f'timeout_member({minutes})', message.author.id)
+                timed_out = await action_timeout_member(message, int(minutes), tool_args.get("reason", "MCP Decision"), escalation_ctx)
+                await record_result(escalation_ctx, message, f'timeout_member({int(minutes)})', timed_out, 'timeout_failed')
             elif tool_name == "ignore":
                 # nothing to do
                 pass
             elif tool_name == "escalate":
                 label = tool_args.get("label", "human_mods")
                 reason = tool_args.get("reason", f"toxicity={toxicity:.2f}")
-                await action_escalate(message, label, reason, escalation_ctx)
-                if escalation_ctx:
-                    escalation_ctx.record(f'escalate({label})', message.author.id)
+                escalated = await action_escalate(message, label, reason, escalation_ctx)
+                await record_result(escalation_ctx, message, f'escalate({label})', escalated, 'escalation_send_failed')
 
         return True
 
@@ -376,6 +483,7 @@ async def _legacy_action_ask_llm(message: discord.Message, toxicity: float, esca
         'llm_raw': raw[:800],
         'decision': decision or 'none',
         'latency_ms': latency_ms,
+        'policy_version': getattr(_ctx_policy(escalation_ctx), 'version', None),
     }
     if escalation_ctx:
         escalation_ctx.bot.db.log_action(
@@ -388,17 +496,17 @@ async def _legacy_action_ask_llm(message: discord.Message, toxicity: float, esca
             evidence=evidence,
         )
     if decision == 'warn':
-        await action_warn_user(message, f"toxicity={toxicity:.2f} (ask_llm)", escalation_ctx=escalation_ctx)
-        if escalation_ctx:
-            escalation_ctx.record('warn_user', message.author.id)
+        warned = await action_warn_user(message, f"toxicity={toxicity:.2f} (ask_llm)", escalation_ctx=escalation_ctx)
+        await record_result(escalation_ctx, message, 'warn_user', warned)
     elif decision == 'escalate':
         esc_ok = await action_escalate(message, 'human_mods', f"toxicity={toxicity:.2f} (ask_llm)", escalation_ctx)
-        if esc_ok and escalation_ctx:
-            escalation_ctx.record('escalate(human_mods)', message.author.id)
+        if esc_ok:
+            await record_result(escalation_ctx, message, 'escalate(human_mods)', esc_ok)
     elif decision == 'delete':
-        await action_delete_message(message, f"toxicity={toxicity:.2f} (ask_llm)")
+        ok, failure, batch_id = await action_delete_message(message, f"toxicity={toxicity:.2f} (ask_llm)", escalation_ctx)
+        await record_result(escalation_ctx, message, 'delete_message', ok, failure, {'batch_id': batch_id} if batch_id else None)
     return True
 
 __all__ = [
-    'action_delete_message', 'action_warn_user', 'action_timeout_member', 'action_escalate', 'action_ask_llm', '_legacy_action_ask_llm'
+    'delete_single', 'record_result', 'action_delete_message', 'action_warn_user', 'action_timeout_member', 'action_escalate', 'action_ask_llm', '_legacy_action_ask_llm'
 ]
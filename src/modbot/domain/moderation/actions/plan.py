@@ -0,0 +1,96 @@
+"""Compile policy action strings into executable plans.
+
+Actions are written as Python-like calls, e.g. `delete_message`,
+`timeout_member(30)`, `escalate(human_mods)` or
+`warn_user(reason='Please be civil.')`. Bare names inside the parentheses
+are taken as string labels. Each string is parsed once (at policy load) into
+an `ActionPlan` holding the resolved handler and its validated arguments, so
+the runner never re-parses or searches for handlers per message.
+"""
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple
+
+from .registry import get_handler
+
+
+class ActionCompileError(ValueError):
+    """Raised when an action string is malformed or names an unknown action."""
+
+
+@dataclass(frozen=True)
+class ActionPlan:
+    source: str
+    name: str
+    handler: Any = field(repr=False, compare=False)
+    params: Dict[str, Any] = field(compare=False)
+    # Name recorded in action_log; escalation thresholds count on it, so it
+    # holds only the handler's `label_params` (e.g. timeout minutes, the
+    # escalation target), never free text such as a reason.
+    label: str = ""
+
+    def __str__(self) -> str:
+        return self.label
+
+
+def _literal(node: ast.AST, source: str) -> Any:
+    if isinstance(node, ast.Name):
+        return node.id
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise ActionCompileError(f"Unsupported argument in action '{source}'") from None
+
+
+def action_label(handler, params: Dict[str, Any]) -> str:
+    """`name(value, ...)` over the params that tell counters apart, else just `name`.
+
+    `warn_user('spam')` and `warn_user` both log as `warn_user`, so they add
+    up toward the same escalation threshold; `timeout_member` and
+    `timeout_member(30)` both log as `timeout_member(30)`.
+    """
+    values = [params[p] for p in getattr(handler, 'label_params', ()) if params.get(p) is not None]
+    return f"{handler.name}({', '.join(str(v) for v in values)})" if values else handler.name
+
+
+def compile_action(source: str) -> ActionPlan:
+    text = str(source).strip()
+    try:
+        expr = ast.parse(text, mode="eval").body
+    except SyntaxError as e:
+        raise ActionCompileError(f"Malformed action '{text}': {e.msg}") from None
+    if isinstance(expr, ast.Name):
+        name, args, kwargs = expr.id, [], {}
+    elif isinstance(expr, ast.Call) and isinstance(expr.func, ast.Name):
+        name = expr.func.id
+        args = [_literal(a, text) for a in expr.args]
+        kwargs = {kw.arg: _literal(kw.value, text) for kw in expr.keywords if kw.arg}
+        if len(kwargs) != len(expr.keywords):
+            raise ActionCompileError(f"Malformed action '{text}': **kwargs not supported")
+    else:
+        raise ActionCompileError(f"Malformed action '{text}'")
+    name = name.lower()
+    handler = get_handler(name)
+    if handler is None:
+        raise ActionCompileError(f"Unknown action '{name}' in '{text}'")
+    try:
+        params = handler.build(*args, **kwargs)
+    except (TypeError, ValueError) as e:
+        raise ActionCompileError(f"Invalid arguments for '{text}': {e}") from None
+    return ActionPlan(source=text, name=name, handler=handler, params=params, label=action_label(handler, params))
+
+
+@lru_cache(maxsize=1024)
+def compile_cached(source: str) -> ActionPlan:
+    """Cached compile for action strings produced at runtime (escalation follow-ups)."""
+    return compile_action(source)
+
+
+def compile_actions(sources: Iterable[str]) -> Tuple[ActionPlan, ...]:
+    return tuple(compile_action(s) for s in sources)
+
+
+__all__ = ['ActionPlan', 'ActionCompileError', 'action_label', 'compile_action', 'compile_actions', 'compile_cached']
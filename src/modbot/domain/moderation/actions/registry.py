@@ -1,30 +1,25 @@
 """Action registry & lookup utilities."""
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from ..interfaces import Action
 
-_REGISTRY: List[Action] = []
+_REGISTRY: Dict[str, Action] = {}
 
 
-def register(action: Action):  # simple append (idempotent safety)
-    if action not in _REGISTRY:
-        _REGISTRY.append(action)
+def register(action: Action):  # keyed by action name (idempotent)
+    _REGISTRY[action.name] = action
 
 
 def list_actions() -> List[Action]:
-    return list(_REGISTRY)
+    return list(_REGISTRY.values())
 
 
-def find_handler(action_str: str) -> Optional[Action]:
-    act = action_str.strip()
-    for handler in _REGISTRY:
-        try:
-            if handler.can_handle(act):  # type: ignore[attr-defined]
-                return handler
-        except Exception:  
-            continue
-    return None
+def get_handler(name: str) -> Optional[Action]:
+    return _REGISTRY.get(name)
+
 
-__all__ = ["register", "list_actions", "find_handler"]
+def find_handler(action_str: str) -> Optional[Action]:
+    return _REGISTRY.get(action_str.strip().split('(', 1)[0].strip().lower())
 
+__all__ = ["register", "list_actions", "get_handler", "find_handler"]
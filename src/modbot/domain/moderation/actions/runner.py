@@ -1,10 +1,13 @@
 """ActionRunner orchestrates execution & escalation recording."""
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+from itertools import groupby
+from typing import List, Sequence, Union
 import discord
 
-from .registry import find_handler, list_actions
+from .helpers import record_result
+from .plan import ActionCompileError, ActionPlan, compile_cached
 
 try:
     from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning, error as log_error
@@ -13,33 +16,56 @@ except Exception:
     def log_warning(*a, **kw): pass
     def log_error(*a, **kw): pass
 
+DEFAULT_ACTION_TIMEOUT = 10.0
+
 
 class ActionRunner:
-    def __init__(self):
+    """Runs a rule's compiled action plans, concurrently where they don't depend on each other.
+
+    Handlers may set `phase` (default 0): actions in the same phase run
+    together, and a phase starts only once the previous one has finished and
+    been recorded. `timeout_seconds` on a handler overrides the runner-wide
+    per-action timeout (None = unbounded, for handlers with their own limits).
+    A handler may return a third item, a dict merged into the logged evidence,
+    and a `Queued` result is logged as 'queued' until its sender reports back.
+    """
+    def __init__(self, timeout_seconds: float = DEFAULT_ACTION_TIMEOUT):
         # side-effect: importing actions modules ensures registry population
         from . import timeout, escalate, ask_llm, delete_message, warn  # noqa: F401  # pylint: disable=unused-import
+        self.timeout_seconds = timeout_seconds
+
+    async def run(self, message: discord.Message, actions: Sequence[Union[ActionPlan, str]], toxicity: float, escalation_ctx=None):
+        plans = [self._resolve(a) for a in actions]
+        plans.sort(key=lambda p: getattr(p.handler, 'phase', 0))  # stable: keeps policy order within a phase
+        for _, group in groupby(plans, key=lambda p: getattr(p.handler, 'phase', 0)):
+            await asyncio.gather(*(self._run_one(message, plan, toxicity, escalation_ctx) for plan in group))
+
+    @staticmethod
+    def _resolve(action: Union[ActionPlan, str]) -> ActionPlan:
+        if isinstance(action, ActionPlan):
+            return action
+        try:
+            return compile_cached(action)
+        except ActionCompileError as e:
+            log_warning('action.invalid', action=action, error=str(e))
+            return ActionPlan(source=str(action), name=str(action), handler=None, params={}, label=str(action).strip())
+
+    async def _execute(self, message, plan: ActionPlan, toxicity: float, escalation_ctx) -> tuple:
+        if plan.handler is None:
+            return False, 'unknown_action'
+        limit = getattr(plan.handler, 'timeout_seconds', self.timeout_seconds)
+        try:
+            return await asyncio.wait_for(plan.handler.execute(message, plan.params, toxicity, escalation_ctx), limit)
+        except asyncio.TimeoutError:
+            log_warning('action.execute.timeout', action=plan.label, timeout_seconds=limit)
+            return False, 'timeout'
+        except Exception as e:  # noqa: BLE001
+            log_error('action.execute.error', action=plan.label, error=str(e))
+            return False, 'exception'
 
-    async def run(self, message: discord.Message, actions: List[str], toxicity: float, escalation_ctx=None):
-        for original in actions:
-            act = original.strip()
-            handler = find_handler(act)
-            performed = False
-            failure_reason: Optional[str] = None
-            if not handler:
-                log_warning('action.unknown', action=act)
-                failure_reason = 'unknown_action'
-            else:
-                try:
-                    performed, failure_reason = await handler.execute(message, act, toxicity, escalation_ctx)  # type: ignore[attr-defined]
-                except Exception as e:  # noqa: BLE001
-                    log_error('action.execute.error', action=act, error=str(e))
-                    performed = False
-                    failure_reason = 'exception'
-            if escalation_ctx:
-                if performed:
-                    escalation_ctx.record(act, message.author.id, status='success')
-                else:
-                    escalation_ctx.record(act, message.author.id, status='failure', failure_reason=failure_reason or 'unspecified')
+    async def _run_one(self, message, plan: ActionPlan, toxicity: float, escalation_ctx) -> None:
+        performed, failure_reason, *extra = await self._execute(message, plan, toxicity, escalation_ctx)
+        await record_result(escalation_ctx, message, plan.label, performed, failure_reason, extra[0] if extra else None)
 
 __all__ = ["ActionRunner"]
 
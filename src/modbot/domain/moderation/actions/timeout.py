@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import discord
 from .registry import register
 from ..interfaces import Action
@@ -7,15 +7,15 @@ from .helpers import action_timeout_member
 
 
 class TimeoutAction:
-    def can_handle(self, action: str) -> bool:
-        return action.startswith('timeout_member')
-    async def execute(self, message: discord.Message, action: str, toxicity: float, ctx) -> Tuple[bool, Optional[str]]:
-        minutes = 30
-        if action.startswith('timeout_member(') and action.endswith(')'):
-            inside = action[len('timeout_member('):-1]
-            if inside.isdigit():
-                minutes = int(inside)
-        success = await action_timeout_member(message, minutes, f"toxicity={toxicity:.2f}")
+    name = 'timeout_member'
+    label_params = ('minutes',)  # counted per duration; the reason is not part of the label
+
+    def build(self, minutes: int = 30, reason: Optional[str] = None) -> Dict[str, Any]:
+        if isinstance(minutes, bool) or not isinstance(minutes, int) or minutes <= 0:
+            raise ValueError("minutes must be a positive integer")
+        return {'minutes': minutes, 'reason': None if reason is None else str(reason)}
+    async def execute(self, message: discord.Message, params: Dict[str, Any], toxicity: float, ctx) -> Tuple[bool, Optional[str]]:
+        success = await action_timeout_member(message, params['minutes'], params['reason'] or f"toxicity={toxicity:.2f}", escalation_ctx=ctx)
         return success, None if success else 'timeout_failed'
 
 register(TimeoutAction())
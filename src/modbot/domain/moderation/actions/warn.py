@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import discord
 from .registry import register
 from ..interfaces import Action
@@ -7,11 +7,13 @@ from .helpers import action_warn_user
 
 
 class WarnUserAction:
-    def can_handle(self, action: str) -> bool:
-        return action.strip().lower() == 'warn_user'
-    async def execute(self, message: discord.Message, action: str, toxicity: float, ctx) -> Tuple[bool, Optional[str]]:  # noqa: ARG002
-        await action_warn_user(message, f"toxicity={toxicity:.2f}", escalation_ctx=ctx)
-        return True, None
+    name = 'warn_user'
+
+    def build(self, reason: Optional[str] = None) -> Dict[str, Any]:
+        return {'reason': None if reason is None else str(reason)}
+    async def execute(self, message: discord.Message, params: Dict[str, Any], toxicity: float, ctx) -> Tuple[bool, Optional[str]]:
+        warned = await action_warn_user(message, params['reason'] or f"toxicity={toxicity:.2f}", escalation_ctx=ctx)
+        return warned, None
 
 register(WarnUserAction())
 __all__ = ["WarnUserAction"]
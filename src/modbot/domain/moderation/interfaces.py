@@ -4,13 +4,35 @@ Moved from legacy `contracts.py`.
 """
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable, Any, Tuple
+from typing import Protocol, runtime_checkable, Any, Callable, Dict, Tuple
 
 
 @runtime_checkable
 class Action(Protocol):
-    def can_handle(self, action: str) -> bool: ...  # noqa: D401,E701
-    async def execute(self, message, action: str, toxicity: float, ctx) -> Tuple[bool, str | None]: ...
+    name: str
+    # Optional `label_params`: names of built params that go into the logged
+    # action label (see `plan.action_label`); anything else, e.g. a reason,
+    # is left out so it cannot split escalation counts.
+    def build(self, *args: Any, **kwargs: Any) -> Dict[str, Any]: ...  # validate policy arguments once
+    # (performed, failure_reason), optionally with a third item: extra evidence for the action log.
+    # `performed` may be a `Queued` when the side effect is delivered later.
+    async def execute(self, message, params: Dict[str, Any], toxicity: float, ctx) -> Tuple[bool, str | None]: ...
+
+
+class Queued:
+    """Truthy `performed` value for an action handed to a background sender.
+
+    The action is logged with status 'queued' and the new action_log row id
+    is passed to `link`; the sender then moves that row to 'success' or
+    'failure' once it knows the outcome.
+    """
+    __slots__ = ("link",)
+
+    def __init__(self, link: Callable[[int], None]):
+        self.link = link
+
+    def __bool__(self) -> bool:
+        return True
 
 
 @runtime_checkable
@@ -23,4 +45,4 @@ class LLMProvider(Protocol):
     async def complete(self, prompt: str) -> str: ...
 
 
-__all__ = ["Action", "ToxicityScorer", "LLMProvider"]
+__all__ = ["Action", "Queued", "ToxicityScorer", "LLMProvider"]
@@ -0,0 +1,76 @@
+"""Interval index over toxicity rules.
+
+Rules cover half-open ranges `[min_inclusive, max_exclusive)` and the first
+rule in policy order wins. `RuleIndex` flattens that into a sorted array of
+boundaries where each elementary interval already knows its winning rule,
+so evaluation is one `bisect` and returns a prebuilt `(rule, plans)` tuple.
+
+Building the index also yields diagnostics: rules whose range overlaps an
+earlier rule (partially shadowed) and rules that can never win (fully
+shadowed).
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Any, List, Optional, Sequence, Tuple
+
+_NO_MATCH: Tuple[None, tuple] = (None, ())
+
+
+def _range_text(rule) -> str:
+    if rule.max_exclusive is None:
+        return f"[{rule.min_inclusive:.2f}, inf)"
+    return f"[{rule.min_inclusive:.2f}, {rule.max_exclusive:.2f})"
+
+
+class RuleIndex:
+    __slots__ = ("_bounds", "_results", "diagnostics")
+
+    def __init__(self, rules: Sequence[Any]):
+        points = set()
+        for r in rules:
+            points.add(r.min_inclusive)
+            if r.max_exclusive is not None:
+                points.add(r.max_exclusive)
+        bounds = sorted(points)
+        results: List[Tuple[Optional[Any], tuple]] = []
+        winners = set()
+        for lo in bounds:
+            hit = _NO_MATCH
+            for i, r in enumerate(rules):
+                if r.matches(lo):  # rule boundaries align with `bounds`, so lo is representative
+                    hit = (r, r.plans)
+                    winners.add(i)
+                    break
+            results.append(hit)
+        self._bounds = tuple(bounds)
+        self._results = tuple(results)
+        self.diagnostics: List[str] = self._diagnose(rules, winners)
+
+    @staticmethod
+    def _diagnose(rules: Sequence[Any], winners: set) -> List[str]:
+        out: List[str] = []
+        for j, later in enumerate(rules):
+            if j not in winners:
+                out.append(f"rule '{later.name}' {_range_text(later)} is fully shadowed by earlier rules and never fires")
+                continue
+            for earlier in rules[:j]:
+                lo = max(earlier.min_inclusive, later.min_inclusive)
+                hi_e = float("inf") if earlier.max_exclusive is None else earlier.max_exclusive
+                hi_l = float("inf") if later.max_exclusive is None else later.max_exclusive
+                if lo < min(hi_e, hi_l):
+                    out.append(
+                        f"rule '{later.name}' {_range_text(later)} overlaps earlier rule "
+                        f"'{earlier.name}' {_range_text(earlier)}; the earlier rule wins there"
+                    )
+        return out
+
+    def lookup(self, toxicity: float) -> Tuple[Optional[Any], tuple]:
+        i = bisect_right(self._bounds, toxicity) - 1
+        return self._results[i] if i >= 0 else _NO_MATCH
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+
+__all__ = ['RuleIndex']
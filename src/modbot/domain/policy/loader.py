@@ -1,22 +1,37 @@
 """Policy loader"""
 from __future__ import annotations
 
+import hashlib
 import os
 import yaml
 from .models import ModerationPolicy
 
+try:
+    from modbot.infrastructure.logging.structured_logging import warning as log_warning
+except Exception:
+    def log_warning(*a, **kw): pass
+
 POLICY_FILE = os.getenv("POLICY_FILE", "policies/moderation.yaml")
 
 
+def policy_version(data: bytes) -> str:
+    """Short content hash identifying a policy file revision."""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
 def load_policy(path: str = POLICY_FILE) -> ModerationPolicy:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"Policy file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f) or {}
+    with open(path, "rb") as f:
+        data = f.read()
+    raw = yaml.safe_load(data.decode("utf-8")) or {}
     try:
         policy = ModerationPolicy(**raw)
     except Exception as e: 
         raise ValueError(f"Invalid moderation policy: {e}") from e
+    policy._version = policy_version(data)
+    for issue in policy.diagnostics:
+        log_warning("policy.rule_overlap", path=path, issue=issue)
     return policy
 
-__all__ = ['load_policy', 'POLICY_FILE']
+__all__ = ['load_policy', 'policy_version', 'POLICY_FILE']
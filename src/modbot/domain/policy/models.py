@@ -1,9 +1,11 @@
 """Policy domain models"""
 from __future__ import annotations
 
-from typing import List, Optional, Tuple, Dict, Union
+from typing import Any, List, Optional, Tuple, Dict, Union
 import re
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
+
+from .index import RuleIndex
 
 _COND_RE = re.compile(
     r"^(?:"  # start
@@ -21,6 +23,12 @@ class ModerationRule(BaseModel):
     # Derived fields
     min_inclusive: float = 0.0
     max_exclusive: Optional[float] = None
+    _plans: tuple = PrivateAttr(default=())
+
+    @property
+    def plans(self) -> tuple:
+        """Compiled `ActionPlan`s for `actions` (filled in by ModerationPolicy)."""
+        return self._plans
 
     @field_validator("if_", mode="before")
     def validate_condition(cls, v: str):  # type: ignore[override]
@@ -109,19 +117,106 @@ class AppealsPolicy(BaseModel):
     retention_days: int
 
 
+class ScopePolicy(BaseModel):
+    """Channels/categories (names or IDs) that automated moderation covers."""
+    allow_channels: List[str] = Field(default_factory=list)  # empty = everywhere
+    allow_categories: List[str] = Field(default_factory=list)
+    deny_channels: List[str] = Field(default_factory=list)
+    deny_categories: List[str] = Field(default_factory=list)
+
+
+class DegradationPolicy(BaseModel):
+    """What the pipeline does when load shedding is active."""
+    llm_fallback_actions: List[str] = Field(default_factory=list)  # replaces ask_llm
+    sample_rate: float = Field(0.1, ge=0.0, le=1.0)
+    _fallback_plans: tuple = PrivateAttr(default=())
+
+    @property
+    def fallback_plans(self) -> tuple:
+        return self._fallback_plans
+
+
+class RaidPolicy(BaseModel):
+    """Channel-level raid detection; in raid mode matching messages skip scoring."""
+    enabled: bool = False
+    window_seconds: float = Field(10.0, gt=0)
+    max_messages: int = Field(30, ge=1)  # per channel within the window
+    duplicate_authors: int = Field(4, ge=2)  # distinct authors posting the same text
+    cooldown_seconds: float = Field(120.0, ge=0)
+    buffer_size: int = Field(256, ge=8)  # ring buffer length per channel
+    actions: List[str] = Field(default_factory=lambda: ["delete_message"])  # for raid duplicates
+    on_enter: List[str] = Field(default_factory=list)  # once, when a channel enters raid mode
+    _plans: tuple = PrivateAttr(default=())
+    _on_enter_plans: tuple = PrivateAttr(default=())
+
+    @model_validator(mode="after")
+    def check_buffer(self):  # type: ignore[override]
+        if self.buffer_size < self.max_messages:
+            raise ValueError("raid.buffer_size must be >= raid.max_messages")
+        return self
+
+    @property
+    def plans(self) -> tuple:
+        return self._plans
+
+    @property
+    def on_enter_plans(self) -> tuple:
+        return self._on_enter_plans
+
+
 class ModerationPolicy(BaseModel):
     rules: List[ModerationRule]
     escalation: EscalationPolicy
     exempt_roles: List[str] = Field(default_factory=list)
+    scope: ScopePolicy = Field(default_factory=ScopePolicy)
     appeals: AppealsPolicy
+    degradation: DegradationPolicy = Field(default_factory=DegradationPolicy)
+    raid: RaidPolicy = Field(default_factory=RaidPolicy)
+    _index: Any = PrivateAttr(default=None)
+    _version: str = PrivateAttr(default="inline")
+
+    @property
+    def version(self) -> str:
+        """Content hash of the source file (set by `load_policy`)."""
+        return self._version
+
+    @model_validator(mode="after")
+    def compile_actions(self):  # type: ignore[override]
+        """Compile every action string once; malformed or unknown actions fail the load."""
+        from ..moderation.actions.plan import compile_action, compile_actions
 
-    def evaluate_toxicity(self, toxicity: float) -> Tuple[Optional[ModerationRule], List[str]]:
         for rule in self.rules:
-            if rule.matches(toxicity):
-                return rule, rule.actions
-        return None, []
+            try:
+                rule._plans = compile_actions(rule.actions)
+            except ValueError as e:
+                raise ValueError(f"rule '{rule.name}': {e}") from None
+        for base, thresholds in self.escalation.parsed.items():
+            for count, follow in thresholds:
+                try:
+                    compile_action(follow)
+                except ValueError as e:
+                    raise ValueError(f"escalation '{base}' at {count}: {e}") from None
+        try:
+            self.degradation._fallback_plans = compile_actions(self.degradation.llm_fallback_actions)
+        except ValueError as e:
+            raise ValueError(f"degradation.llm_fallback_actions: {e}") from None
+        for attr, key in (("_plans", "actions"), ("_on_enter_plans", "on_enter")):
+            try:
+                setattr(self.raid, attr, compile_actions(getattr(self.raid, key)))
+            except ValueError as e:
+                raise ValueError(f"raid.{key}: {e}") from None
+        self._index = RuleIndex(self.rules)
+        return self
+
+    @property
+    def diagnostics(self) -> List[str]:
+        """Overlapping / shadowed rule warnings found when the index was built."""
+        return self._index.diagnostics
+
+    def evaluate_toxicity(self, toxicity: float) -> Tuple[Optional[ModerationRule], tuple]:
+        return self._index.lookup(toxicity)
 
 
 __all__ = [
-    'ModerationRule', 'EscalationPolicy', 'AppealsPolicy', 'ModerationPolicy'
+    'ModerationRule', 'EscalationPolicy', 'AppealsPolicy', 'ScopePolicy', 'DegradationPolicy', 'RaidPolicy', 'ModerationPolicy'
 ]
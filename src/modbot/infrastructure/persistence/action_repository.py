@@ -6,12 +6,18 @@ import json
 import sqlite3
 from typing import Optional, Dict
 
+# Statuses that count as "the bot took this action" (escalation thresholds,
+# history). 'queued' rows were handed to a background sender and move to
+# 'success' or 'failure' once it reports back.
+COUNTED_STATUSES = ('success', 'queued')
+_COUNTED_SQL = "status IN ('success','queued')"
+
 
 class ActionRepository:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
-    def log_action(
+    def insert_action(
         self,
         guild_id: Optional[int],
         channel_id: Optional[int],
@@ -38,13 +44,24 @@ class ActionRepository:
                 failure_reason,
             ),
         )
-        self.conn.commit()
         return int(cur.lastrowid)
 
+    def log_action(self, *a, **kw) -> int:
+        row_id = self.insert_action(*a, **kw)
+        self.conn.commit()
+        return row_id
+
+    def update_status(self, row_id: int, status: str, failure_reason: str | None = None) -> None:
+        self.conn.execute(
+            "UPDATE action_log SET status=?, failure_reason=? WHERE id=?",
+            (status, failure_reason, row_id),
+        )
+        self.conn.commit()
+
     def count_recent(self, target_id: int, action: str, window_minutes: int) -> int:
         cutoff = int(time.time()) - window_minutes * 60
         cur = self.conn.execute(
-            "SELECT COUNT(*) FROM action_log WHERE target_id=? AND action=? AND ts>=? AND status='success'",
+            f"SELECT COUNT(*) FROM action_log WHERE target_id=? AND action=? AND ts>=? AND {_COUNTED_SQL}",
             (str(target_id), action, cutoff),
         )
         row = cur.fetchone()
@@ -54,7 +71,7 @@ class ActionRepository:
         cutoff = int(time.time()) - window_minutes * 60
         pattern = f"{action_prefix}%"
         cur = self.conn.execute(
-            "SELECT COUNT(*) FROM action_log WHERE target_id=? AND action LIKE ? AND ts>=? AND status='success'",
+            f"SELECT COUNT(*) FROM action_log WHERE target_id=? AND action LIKE ? AND ts>=? AND {_COUNTED_SQL}",
             (str(target_id), pattern, cutoff),
         )
         row = cur.fetchone()
@@ -121,14 +138,14 @@ class ActionRepository:
     def aggregate_counts(self, window_minutes: int = 1440) -> Dict[str, int]:
         cutoff = int(time.time()) - window_minutes * 60
         cur = self.conn.execute(
-            "SELECT action, COUNT(*) FROM action_log WHERE ts >= ? AND status='success' GROUP BY action",
+            f"SELECT action, COUNT(*) FROM action_log WHERE ts >= ? AND {_COUNTED_SQL} GROUP BY action",
             (cutoff,),
         )
         return {r[0]: r[1] for r in cur.fetchall()}
 
     def get_last_action(self, user_id: int, window_minutes: int | None = None) -> Optional[dict]:
         params: list = [str(user_id)]
-        where = "target_id=? AND status='success'"
+        where = f"target_id=? AND {_COUNTED_SQL}"
         if window_minutes and window_minutes > 0:
             cutoff = int(time.time()) - window_minutes * 60
             where += " AND ts >= ?"
@@ -140,4 +157,4 @@ class ActionRepository:
             return None
         return {"id": row[0], "ts": row[1], "action": row[2], "reason": row[3]}
 
-__all__ = ["ActionRepository"]
+__all__ = ["ActionRepository", "COUNTED_STATUSES"]
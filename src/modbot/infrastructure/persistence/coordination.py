@@ -0,0 +1,101 @@
+"""Cross-process coordination for escalation counting.
+
+Several bot processes (each owning a range of shards) share one action log.
+Escalation thresholds fire when the count *after* recording an action equals
+the configured number, so the insert and the count must be one atomic step;
+otherwise two processes recording at the same moment could both see the
+same count and both fire the follow-up.
+
+`CoordinationBackend` is that atomic step. `SQLiteCoordination` does it in a
+`BEGIN IMMEDIATE` transaction on the shared WAL-mode database (the write lock
+is taken before the insert, so concurrent writers serialize). Waiting for
+that lock can take up to the busy timeout, so callers on the event loop run
+`record_and_count` through `asyncio.to_thread`; `ActionDB` gives the SQLite
+backend a connection of its own for that reason.
+`InMemoryCoordination` is a single-process stand-in: the log still goes to
+SQLite, but counting happens under a local lock.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Protocol, Tuple
+
+from .action_repository import COUNTED_STATUSES, ActionRepository, _COUNTED_SQL
+
+
+class CoordinationBackend(Protocol):
+    def record_and_count(
+        self,
+        log_kwargs: dict,
+        count_action: str,
+        window_minutes: int,
+        prefix: bool = False,
+    ) -> Tuple[int, int]:
+        """Insert an action_log row and return (row id, matching counted actions in window)."""
+        ...
+
+
+class SQLiteCoordination:
+    def __init__(self, conn: sqlite3.Connection, repo: ActionRepository):
+        self.conn = conn
+        self.repo = repo
+        self._lock = threading.Lock()  # one transaction at a time on this connection
+
+    def record_and_count(self, log_kwargs: dict, count_action: str, window_minutes: int, prefix: bool = False) -> Tuple[int, int]:
+        target = str(log_kwargs.get('target_id'))
+        cutoff = int(time.time()) - window_minutes * 60
+        op, value = ("LIKE", f"{count_action}%") if prefix else ("=", count_action)
+        with self._lock:
+            if self.conn.in_transaction:
+                self.conn.commit()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row_id = self.repo.insert_action(**log_kwargs)
+                cur = self.conn.execute(
+                    f"SELECT COUNT(*) FROM action_log WHERE target_id=? AND action {op} ? AND ts>=? AND {_COUNTED_SQL}",
+                    (target, value, cutoff),
+                )
+                count = int(cur.fetchone()[0])
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return row_id, count
+
+
+class InMemoryCoordination:
+    def __init__(self, repo: ActionRepository):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._events: Dict[str, Deque[Tuple[float, str]]] = defaultdict(deque)
+
+    def record_and_count(self, log_kwargs: dict, count_action: str, window_minutes: int, prefix: bool = False) -> Tuple[int, int]:
+        row_id = self.repo.log_action(**log_kwargs)
+        target = str(log_kwargs.get('target_id'))
+        now = time.time()
+        cutoff = now - window_minutes * 60
+        with self._lock:
+            events = self._events[target]
+            if log_kwargs.get('status', 'success') in COUNTED_STATUSES:
+                events.append((now, log_kwargs['action']))
+            while events and events[0][0] < now - 86400:  # keep a day of history per target
+                events.popleft()
+            count = sum(
+                1 for ts, action in events
+                if ts >= cutoff and (action.startswith(count_action) if prefix else action == count_action)
+            )
+        return row_id, count
+
+
+def create_coordination(kind: str, conn: sqlite3.Connection, repo: ActionRepository) -> CoordinationBackend:
+    if kind == "memory":
+        return InMemoryCoordination(repo)
+    if kind == "sqlite":
+        return SQLiteCoordination(conn, repo)
+    raise ValueError(f"Unknown coordination backend '{kind}' (use sqlite or memory)")
+
+
+__all__ = ['CoordinationBackend', 'SQLiteCoordination', 'InMemoryCoordination', 'create_coordination']
@@ -7,6 +7,8 @@ import sqlite3
 from .migrations import apply_runtime_migrations
 from .action_repository import ActionRepository
 from .appeals_repository import AppealsRepository
+from .outbox_repository import OutboxRepository
+from .coordination import create_coordination
 
 DB_PATH = os.getenv("SQLITE_PATH", "storage/mod.db")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
@@ -39,11 +41,31 @@ CREATE TABLE IF NOT EXISTS appeals(
     ts_decided INTEGER
 );
 CREATE INDEX IF NOT EXISTS idx_appeals_user_status ON appeals(user_id, status);
+CREATE TABLE IF NOT EXISTS action_outbox(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    payload_json TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_ts REAL NOT NULL,
+    lease_until REAL,
+    last_error TEXT,
+    ts_created INTEGER,
+    ts_updated INTEGER,
+    action_log_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON action_outbox(status, next_attempt_ts);
 """
 
 
 def init_connection(path: str = DB_PATH) -> sqlite3.Connection:
     conn = sqlite3.connect(path, check_same_thread=False)
+    # WAL lets several bot processes share the file: readers never block the
+    # writer, and busy_timeout makes writers wait for the lock instead of failing.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.executescript(SCHEMA)
     conn.commit()
     apply_runtime_migrations(conn)
@@ -53,18 +75,29 @@ def init_connection(path: str = DB_PATH) -> sqlite3.Connection:
 class ActionDB:
     """Backward-compatible facade used by existing code.
 
-    Wraps two repositories; new code should prefer using the repositories
-    directly for narrower dependency surfaces.
+    Wraps the action and appeals repositories; new code should prefer using
+    the repositories directly (e.g. `outbox`) for narrower dependency surfaces.
     """
-    def __init__(self, path: str = DB_PATH):
+    def __init__(self, path: str = DB_PATH, coordination: str = "sqlite"):
         self.conn = init_connection(path)
         self.actions = ActionRepository(self.conn)
         self.appeals = AppealsRepository(self.conn)
+        self.outbox = OutboxRepository(self.conn)
+        # The SQLite backend runs its transaction in a worker thread, so it gets
+        # its own connection rather than sharing one with event-loop writes.
+        coord_conn = init_connection(path) if coordination == "sqlite" else self.conn
+        self.coordination = create_coordination(coordination, coord_conn, ActionRepository(coord_conn))
 
     # Delegate methods (action log)
     def log_action(self, *a, **kw):  # type: ignore[override]
         return self.actions.log_action(*a, **kw)
 
+    def update_action_status(self, *a, **kw):
+        return self.actions.update_status(*a, **kw)
+
+    def record_and_count(self, *a, **kw):
+        return self.coordination.record_and_count(*a, **kw)
+
     def count_recent(self, *a, **kw):
         return self.actions.count_recent(*a, **kw)
 
@@ -103,5 +136,5 @@ class ActionDB:
         return self.appeals.purge_old_appeals(*a, **kw)
 
 __all__ = [
-    'ActionDB', 'init_connection', 'ActionRepository', 'AppealsRepository', 'DB_PATH'
+    'ActionDB', 'init_connection', 'ActionRepository', 'AppealsRepository', 'OutboxRepository', 'DB_PATH'
 ]
@@ -15,6 +15,11 @@ def apply_runtime_migrations(conn: sqlite3.Connection) -> None:
     if 'failure_reason' not in cols:
         conn.execute("ALTER TABLE action_log ADD COLUMN failure_reason TEXT")
         altered = True
+    cur = conn.execute("PRAGMA table_info(action_outbox)")
+    outbox_cols = {row[1] for row in cur.fetchall()}
+    if outbox_cols and 'action_log_id' not in outbox_cols:
+        conn.execute("ALTER TABLE action_outbox ADD COLUMN action_log_id INTEGER")
+        altered = True
     if altered:
         conn.commit()
 
@@ -0,0 +1,105 @@
+"""Durable outbox of pending Discord side effects."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class OutboxRepository:
+    """Rows move pending -> in_flight -> done | pending (retry) | dead.
+
+    `claim` takes a lease, so when several processes share the database
+    only one delivers a row; a process that dies mid-delivery leaves an
+    expired lease that any executor may reclaim.
+    """
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def enqueue(self, key: str, kind: str, payload: Dict[str, Any]) -> Tuple[int, bool]:
+        """Insert unless `key` exists; returns (row id, newly_created)."""
+        now = time.time()
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO action_outbox(idempotency_key,kind,payload_json,status,attempts,next_attempt_ts,ts_created,ts_updated) VALUES(?,?,?,'pending',0,?,?,?)",
+            (key, kind, json.dumps(payload), now, int(now), int(now)),
+        )
+        self.conn.commit()
+        if cur.rowcount:
+            return int(cur.lastrowid), True
+        row = self.conn.execute("SELECT id FROM action_outbox WHERE idempotency_key=?", (key,)).fetchone()
+        return int(row[0]), False
+
+    def link(self, row_id: int, action_log_id: int) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+        """Attach the action_log row tracking this entry (first link wins).
+
+        Returns (status, last_error, linked action_log id) as stored afterwards.
+        """
+        self.conn.execute(
+            "UPDATE action_outbox SET action_log_id=? WHERE id=? AND action_log_id IS NULL",
+            (action_log_id, row_id),
+        )
+        self.conn.commit()
+        row = self.conn.execute(
+            "SELECT status, last_error, action_log_id FROM action_outbox WHERE id=?", (row_id,),
+        ).fetchone()
+        return (row[0], row[1], row[2]) if row else (None, None, None)
+
+    def linked_log_id(self, row_id: int) -> Optional[int]:
+        row = self.conn.execute("SELECT action_log_id FROM action_outbox WHERE id=?", (row_id,)).fetchone()
+        return row[0] if row else None
+
+    def due(self, limit: int = 50, now: Optional[float] = None) -> List[dict]:
+        now = time.time() if now is None else now
+        cur = self.conn.execute(
+            "SELECT id, idempotency_key, kind, payload_json, attempts FROM action_outbox "
+            "WHERE (status='pending' AND next_attempt_ts<=?) OR (status='in_flight' AND lease_until<?) "
+            "ORDER BY next_attempt_ts LIMIT ?",
+            (now, now, limit),
+        )
+        return [
+            {"id": r[0], "key": r[1], "kind": r[2], "payload": json.loads(r[3]), "attempts": r[4]}
+            for r in cur.fetchall()
+        ]
+
+    def claim(self, row_id: int, lease_seconds: float) -> bool:
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE action_outbox SET status='in_flight', lease_until=?, attempts=attempts+1, ts_updated=? "
+            "WHERE id=? AND ((status='pending' AND next_attempt_ts<=?) OR (status='in_flight' AND lease_until<?))",
+            (now + lease_seconds, int(now), row_id, now, now),
+        )
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    def _finish(self, row_id: int, status: str, error: Optional[str], next_attempt_ts: Optional[float] = None) -> None:
+        self.conn.execute(
+            "UPDATE action_outbox SET status=?, last_error=?, lease_until=NULL, next_attempt_ts=COALESCE(?, next_attempt_ts), ts_updated=? WHERE id=?",
+            (status, error, next_attempt_ts, int(time.time()), row_id),
+        )
+        self.conn.commit()
+
+    def mark_done(self, row_id: int, note: Optional[str] = None) -> None:
+        self._finish(row_id, 'done', note)
+
+    def mark_retry(self, row_id: int, next_attempt_ts: float, error: str) -> None:
+        self._finish(row_id, 'pending', error, next_attempt_ts)
+
+    def mark_dead(self, row_id: int, error: str) -> None:
+        self._finish(row_id, 'dead', error)
+
+    def counts(self) -> Dict[str, int]:
+        cur = self.conn.execute("SELECT status, COUNT(*) FROM action_outbox GROUP BY status")
+        return {status: int(n) for status, n in cur.fetchall()}
+
+    def purge_finished(self, older_than_days: int = 7) -> int:
+        cutoff = int(time.time()) - older_than_days * 86400
+        cur = self.conn.execute(
+            "DELETE FROM action_outbox WHERE status IN ('done','dead') AND ts_updated<?",
+            (cutoff,),
+        )
+        self.conn.commit()
+        return cur.rowcount
+
+
+__all__ = ['OutboxRepository']
@@ -1,3 +1,12 @@
-from .factory import create_toxicity_scorer
+# Resolved lazily: spawned Detoxify workers import `detoxify_worker` from this
+# package and must not pull in the factory (and with it config and httpx).
+
+
+def __getattr__(name):
+    if name == 'create_toxicity_scorer':
+        from .factory import create_toxicity_scorer
+        return create_toxicity_scorer
+    raise AttributeError(name)
+
 
 __all__ = ['create_toxicity_scorer']
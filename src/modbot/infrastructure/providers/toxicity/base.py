@@ -0,0 +1,19 @@
+"""Toxicity provider error types."""
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+# Set by scorers that answered from a floor/fallback value (e.g. the Neutral
+# end of a cascade) so wrappers like the cache can avoid pinning it.
+score_degraded: ContextVar[bool] = ContextVar("toxicity_score_degraded", default=False)
+
+
+class ToxicityError(Exception):
+    """Base normalized toxicity scoring exception."""
+
+
+class ToxicityRateLimitError(ToxicityError):
+    pass
+
+
+__all__ = ['ToxicityError', 'ToxicityRateLimitError', 'score_degraded']
@@ -0,0 +1,109 @@
+"""Micro-batching helper for toxicity scorers.
+
+Concurrent `submit()` calls are collected for up to `max_wait_ms` (or until
+`max_batch_size` items are pending) and handed to a single batched call.
+Each caller gets back the result at its own position in the batch.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 1,
+    ):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight = 0
+        self._tasks: Set[asyncio.Task] = set()
+        # metrics
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._max_depth = 0
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._pending.append((item, fut))
+        if len(self._pending) > self._max_depth:
+            self._max_depth = len(self._pending)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending and self._inflight < self.max_concurrency:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            batch = [(item, fut) for item, fut in batch if not fut.done()]  # drop cancelled waiters
+            if not batch:
+                continue
+            self._inflight += 1
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self._batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:  # noqa: BLE001
+            self._errors += 1
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        else:
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+        finally:
+            self._inflight -= 1
+            self._batches += 1
+            self._items += len(items)
+        # Anything that queued up while we were busy goes out right away if it
+        # already fills a batch, otherwise it waits out a fresh window.
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, Any]:
+        avg = (self._items / self._batches) if self._batches else 0.0
+        return {
+            "queue_depth": len(self._pending),
+            "max_queue_depth": self._max_depth,
+            "inflight": self._inflight,
+            "batches": self._batches,
+            "items": self._items,
+            "errors": self._errors,
+            "avg_batch_size": round(avg, 2),
+            "batch_fill": round(avg / self.max_batch_size, 3),
+        }
+
+
+__all__ = ["MicroBatcher"]
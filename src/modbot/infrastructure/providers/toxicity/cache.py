@@ -0,0 +1,128 @@
+"""Content-hash score cache wrapping any toxicity scorer.
+
+Texts are normalized (Unicode NFKC, casefolded, zero-width characters
+stripped, whitespace collapsed) and hashed, so copypasta variants that only
+differ cosmetically share one entry. Entries live in a bounded LRU with a
+TTL; concurrent requests for the same key share a single upstream call.
+Failed upstream calls and degraded (floor) scores are never cached.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from .base import score_degraded
+
+_ZERO_WIDTH_RE = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "")
+    text = _ZERO_WIDTH_RE.sub("", text).casefold()
+    return _WS_RE.sub(" ", text).strip()
+
+
+def content_key(text: str) -> bytes:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+
+
+class CachingScorer:
+    def __init__(self, inner, max_entries: int = 10000, ttl_seconds: float = 600.0):
+        self.inner = inner
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl_seconds)
+        self._entries: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()  # key -> (score, expires_at)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def score(self, text: str) -> float:  # type: ignore[override]
+        key = content_key(text)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self._entries[key]
+            self.expirations += 1
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if pending.cancelled() and not (task and task.cancelling()):
+                    return await self.score(text)  # leader was cancelled, not us
+                raise
+        self.misses += 1
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        score_degraded.set(False)
+        try:
+            value = float(await self.inner.score(text))
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+                fut.exception()  # mark retrieved; coalesced waiters still get it
+            raise
+        else:
+            if not score_degraded.get():
+                self._store(key, value)
+            if not fut.done():
+                fut.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: bytes, value: float) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def aclose(self) -> None:
+        closer = getattr(self.inner, "aclose", None)
+        if closer is not None:
+            await closer()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        lookups = self.hits + self.misses + self.coalesced
+        hit_rate = (self.hits + self.coalesced) / lookups if lookups else 0.0
+        out: Dict[str, Dict[str, Any]] = {
+            "cache": {
+                "size": len(self._entries),
+                "max": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(hit_rate, 3),
+            }
+        }
+        inner_stats = getattr(self.inner, "stats", None)
+        if callable(inner_stats):
+            out.update(inner_stats())
+        return out
+
+
+__all__ = ['CachingScorer', 'normalize_text', 'content_key']
@@ -0,0 +1,171 @@
+"""Cascading toxicity scorer with a per-message latency budget.
+
+Providers are tried in order (e.g. Perspective -> Detoxify -> Neutral). Each
+non-terminal provider sits behind a circuit breaker: after
+`failure_threshold` consecutive timeouts/errors it opens and is skipped until
+`reset_timeout` elapses, then a single half-open probe decides whether it
+closes again. The last provider is the floor and is always called.
+
+Quota pushback (`ToxicityRateLimitError`) moves on to the next provider
+without counting against the breaker; the provider is healthy, just busy.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .base import ToxicityError, ToxicityRateLimitError, score_degraded
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = max(0.0, float(reset_timeout))
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_inflight = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._transition(HALF_OPEN)
+        if self._probe_inflight:
+            return False
+        self._probe_inflight = True
+        return True
+
+    def record_success(self) -> None:
+        self._probe_inflight = False
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._probe_inflight = False
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != OPEN:
+                self.times_opened += 1
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Call ended without a verdict (quota pushback, cancellation)."""
+        if not self._probe_inflight:
+            return
+        self._probe_inflight = False
+        if self.state == HALF_OPEN:
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        prev, self.state = self.state, state
+        log = log_warning if state == OPEN else log_info
+        log("toxicity.breaker.state", provider=self.name, prev=prev, state=state, failures=self.consecutive_failures)
+
+
+class CascadingScorer:
+    def __init__(
+        self,
+        providers: Sequence[Tuple[str, Any]],
+        budget_seconds: float = 2.5,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        if not providers:
+            raise ValueError("CascadingScorer needs at least one provider")
+        self.budget = max(0.01, float(budget_seconds))
+        self.providers: List[Tuple[str, Any, CircuitBreaker]] = [
+            (name, scorer, CircuitBreaker(name, failure_threshold, reset_timeout)) for name, scorer in providers
+        ]
+        self._counters: Dict[str, Dict[str, int]] = {
+            name: {"served": 0, "timeouts": 0, "errors": 0, "busy": 0, "skipped_open": 0} for name, _ in providers
+        }
+        self.budget_exhausted = 0
+
+    async def score(self, text: str) -> float:  # type: ignore[override]
+        deadline = time.monotonic() + self.budget
+        last = len(self.providers) - 1
+        for i, (name, scorer, breaker) in enumerate(self.providers):
+            counters = self._counters[name]
+            if i == last:
+                value = await scorer.score(text)
+                counters["served"] += 1
+                if last > 0:
+                    score_degraded.set(True)
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.budget_exhausted += 1
+                continue
+            if not breaker.allow():
+                counters["skipped_open"] += 1
+                continue
+            try:
+                value = await asyncio.wait_for(scorer.score(text), timeout=remaining)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except asyncio.TimeoutError:
+                counters["timeouts"] += 1
+                breaker.record_failure()
+                continue
+            except ToxicityRateLimitError:
+                counters["busy"] += 1
+                breaker.release()
+                continue
+            except Exception:  # noqa: BLE001
+                counters["errors"] += 1
+                breaker.record_failure()
+                continue
+            breaker.record_success()
+            counters["served"] += 1
+            return value
+        raise ToxicityError("no toxicity provider available")  # pragma: no cover - terminal returns above
+
+    async def aclose(self) -> None:
+        for _, scorer, _ in self.providers:
+            closer = getattr(scorer, "aclose", None)
+            if closer is not None:
+                await closer()
+
+    def breaker_states(self) -> Dict[str, str]:
+        return {name: breaker.state for name, _, breaker in self.providers[:-1]}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {
+            "cascade": {
+                "budget_ms": int(self.budget * 1000),
+                "budget_exhausted": self.budget_exhausted,
+                "order": ">".join(name for name, _, _ in self.providers),
+            }
+        }
+        for i, (name, scorer, breaker) in enumerate(self.providers):
+            entry: Dict[str, Any] = dict(self._counters[name])
+            if i < len(self.providers) - 1:
+                entry.update(breaker=breaker.state, consecutive_failures=breaker.consecutive_failures, times_opened=breaker.times_opened)
+            out[f"cascade.{name}"] = entry
+            inner_stats = getattr(scorer, "stats", None)
+            if callable(inner_stats):
+                out.update(inner_stats())
+        return out
+
+
+__all__ = ['CircuitBreaker', 'CascadingScorer']
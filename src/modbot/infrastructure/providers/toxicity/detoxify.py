@@ -1,20 +1,47 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any, Dict, List, Sequence
+
+from .batching import MicroBatcher
+
+
+def _toxicity_column(preds: Dict[str, Any]):
+    if "toxicity" in preds:
+        return preds["toxicity"]
+    return list(preds.values())[0]
+
+
 class DetoxifyScorer:
-    def __init__(self, model: str = "original"):
+    def __init__(self, model: str = "original", batch_size: int = 1, batch_wait_ms: float = 5.0):
         from detoxify import Detoxify  # type: ignore
         self.detox = Detoxify(model)
+        # batch_size <= 1 keeps the original one-forward-pass-per-message behaviour
+        self._batcher: MicroBatcher[str, float] | None = None
+        if batch_size > 1:
+            self._batcher = MicroBatcher(self.score_batch, max_batch_size=batch_size, max_wait_ms=batch_wait_ms)
+
+    def predict_batch(self, texts: List[str]) -> List[float]:
+        preds = self.detox.predict(list(texts))
+        return [float(v) for v in _toxicity_column(preds)]
+
+    async def score_batch(self, texts: Sequence[str]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.predict_batch, list(texts))
 
     async def score(self, text: str) -> float:  # type: ignore[override]
-        import asyncio
+        if self._batcher is not None:
+            return await self._batcher.submit(text)
         loop = asyncio.get_running_loop()
 
         def _run():
-            preds = self.detox.predict(text)
-            if "toxicity" in preds:
-                return float(preds["toxicity"])
-            return float(list(preds.values())[0])
+            return float(_toxicity_column(self.detox.predict(text)))
 
         return await loop.run_in_executor(None, _run)
 
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        if self._batcher is None:
+            return {"detoxify": {"batching": False}}
+        return {"detoxify": {"batching": True, **self._batcher.stats()}}
+
 __all__ = ['DetoxifyScorer']
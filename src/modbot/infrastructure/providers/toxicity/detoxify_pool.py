@@ -0,0 +1,114 @@
+"""Process-pool Detoxify backend.
+
+Each worker process loads the Detoxify model once (pool initializer) and
+then serves batched `predict` calls, so inference runs outside the GIL and
+off the shared default thread pool. Texts go out as a list of str; scores
+come back as a packed float32 array. A crashed worker breaks the pool; the
+scorer rebuilds it and retries the batch once.
+
+The pool is started by the first `score()` call, not at construction: the
+scorer is built when the bot module is imported, and `--dry-run` or a
+spawned child re-importing the entry point must not start workers.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import detoxify_worker
+from .batching import MicroBatcher
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+
+class ProcessPoolDetoxifyScorer:
+    def __init__(
+        self,
+        model: str = "original",
+        workers: int = 2,
+        batch_size: int = 16,
+        batch_wait_ms: float = 5.0,
+        torch_threads: int = 1,
+    ):
+        self.model = model
+        self.workers = max(1, int(workers))
+        self.torch_threads = int(torch_threads)
+        self._ctx = multiprocessing.get_context("spawn")  # torch is not fork-safe
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self.restarts = 0
+        # one batch in flight per worker keeps every core busy
+        self._batcher: MicroBatcher[str, float] = MicroBatcher(
+            self.score_batch,
+            max_batch_size=max(1, batch_size),
+            max_wait_ms=batch_wait_ms,
+            max_concurrency=self.workers,
+        )
+
+    def _start_pool(self) -> None:
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._ctx,
+            initializer=detoxify_worker.init_worker,
+            initargs=(self.model, self.torch_threads),
+        )
+        self._generation += 1
+        # Spawn and warm every worker at once rather than as batches trickle in.
+        for _ in range(self.workers):
+            self._executor.submit(detoxify_worker.ping)
+        log_info("toxicity.detoxify_pool.started", workers=self.workers, generation=self._generation)
+
+    def _restart_pool(self, generation: int) -> None:
+        if generation != self._generation:
+            return  # another batch already replaced the broken pool
+        self.restarts += 1
+        log_warning("toxicity.detoxify_pool.restart", restarts=self.restarts)
+        old = self._executor
+        self._start_pool()
+        if old is not None:
+            old.shutdown(wait=False, cancel_futures=True)
+
+    async def score_batch(self, texts: Sequence[str]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        payload = list(texts)
+        if self._executor is None:
+            self._start_pool()
+        for attempt in range(2):
+            generation = self._generation
+            try:
+                raw = await loop.run_in_executor(self._executor, detoxify_worker.predict, payload)
+                return array("f", raw).tolist()
+            except BrokenProcessPool:
+                self._restart_pool(generation)
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    async def score(self, text: str) -> float:  # type: ignore[override]
+        return await self._batcher.submit(text)
+
+    async def aclose(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "detoxify": {
+                "mode": "process",
+                "workers": self.workers,
+                "started": self._executor is not None,
+                "restarts": self.restarts,
+                **self._batcher.stats(),
+            }
+        }
+
+
+__all__ = ['ProcessPoolDetoxifyScorer']
@@ -0,0 +1,35 @@
+"""Worker-process side of the Detoxify process pool.
+
+Spawned workers import this module to unpickle their tasks, so it must
+stay free of the rest of the bot: only the standard library here, with
+Detoxify/torch imported inside the initializer.
+"""
+from __future__ import annotations
+
+import os
+from array import array
+from typing import List
+
+_WORKER_MODEL = None
+
+
+def init_worker(model: str, torch_threads: int) -> None:
+    global _WORKER_MODEL  # noqa: PLW0603
+    if torch_threads > 0:
+        try:
+            import torch  # type: ignore
+            torch.set_num_threads(torch_threads)
+        except Exception:
+            pass
+    from detoxify import Detoxify  # type: ignore
+    _WORKER_MODEL = Detoxify(model)
+
+
+def ping() -> int:
+    return os.getpid()
+
+
+def predict(texts: List[str]) -> bytes:
+    preds = _WORKER_MODEL.predict(texts)  # type: ignore[union-attr]
+    col = preds["toxicity"] if "toxicity" in preds else list(preds.values())[0]
+    return array("f", (float(v) for v in col)).tobytes()
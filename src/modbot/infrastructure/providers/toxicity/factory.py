@@ -5,25 +5,107 @@ import os
 from .perspective import PerspectiveScorer
 from .detoxify import DetoxifyScorer
 from .neutral import NeutralScorer
+from .cache import CachingScorer
+from .rate_limit import RateLimitedScorer
+from .cascade import CascadingScorer
+from .windowing import WindowedScorer
+from .prefilter import DEFAULT_BENIGN_TERMS, LexicalPrefilter, PrefilteredScorer, load_wordlist
 from ....config.settings import BotConfig
 
 
-def create_toxicity_scorer(conf: BotConfig):
-    api_key = conf.perspective_api_key or os.getenv("PERSPECTIVE_API_KEY")
-    if api_key:
-        attr_env = os.getenv("PERSPECTIVE_REQUESTED_ATTRIBUTES", "TOXICITY")
-        attributes = [a.strip().upper() for a in attr_env.split(',') if a.strip()]
-        try:
-            timeout = int(os.getenv("PERSPECTIVE_TIMEOUT_SECONDS", "10"))
-        except ValueError:
-            timeout = 10
-        return PerspectiveScorer(api_key, attributes=attributes, timeout=timeout)
+def _create_local_scorer(conf: BotConfig):
     try:
         import importlib
         if importlib.util.find_spec("detoxify"):
-            return DetoxifyScorer()
-    except Exception:  
+            if conf.detoxify_mode == "process":
+                from .detoxify_pool import ProcessPoolDetoxifyScorer
+                return ProcessPoolDetoxifyScorer(
+                    workers=conf.detoxify_workers,
+                    batch_size=conf.detoxify_batch_size,
+                    batch_wait_ms=conf.detoxify_batch_wait_ms,
+                    torch_threads=conf.detoxify_torch_threads,
+                )
+            return DetoxifyScorer(
+                batch_size=conf.detoxify_batch_size,
+                batch_wait_ms=conf.detoxify_batch_wait_ms,
+            )
+    except Exception:
         pass
-    return NeutralScorer()
+    return None
+
+
+def _create_perspective_scorer(conf: BotConfig, api_key: str):
+    attr_env = os.getenv("PERSPECTIVE_REQUESTED_ATTRIBUTES", "TOXICITY")
+    attributes = [a.strip().upper() for a in attr_env.split(',') if a.strip()]
+    return PerspectiveScorer(
+        api_key,
+        attributes=attributes,
+        timeout=conf.perspective_timeout_seconds,
+        max_connections=conf.perspective_max_connections,
+        max_keepalive_connections=conf.perspective_max_keepalive,
+        http2=conf.perspective_http2,
+    )
+
+
+def _create_base_scorer(conf: BotConfig):
+    """Build the Perspective -> Detoxify -> Neutral cascade from what is available."""
+    providers = []
+    api_key = conf.perspective_api_key or os.getenv("PERSPECTIVE_API_KEY")
+    if api_key:
+        # Keep Perspective under its project quota; bursts beyond it move on
+        # to the next provider rather than failing as 0.0.
+        providers.append(("perspective", RateLimitedScorer(
+            _create_perspective_scorer(conf, api_key),
+            qps=conf.perspective_qps,
+            burst=conf.perspective_burst,
+            max_queue=conf.perspective_max_queue,
+            deadline_seconds=conf.perspective_deadline_seconds,
+        )))
+    local = _create_local_scorer(conf)
+    if local is not None:
+        if conf.toxicity_window_tokens > 0:
+            # Only the local model is windowed; Perspective takes long text
+            # natively and windowing would multiply quota use.
+            local = WindowedScorer(
+                local,
+                window_tokens=conf.toxicity_window_tokens,
+                max_tokens=conf.toxicity_window_max_tokens,
+                reducer=conf.toxicity_window_reducer,
+            )
+        providers.append(("detoxify", local))
+    if not providers:
+        return NeutralScorer()
+    providers.append(("neutral", NeutralScorer()))
+    return CascadingScorer(
+        providers,
+        budget_seconds=conf.toxicity_latency_budget_ms / 1000.0,
+        failure_threshold=conf.toxicity_breaker_failures,
+        reset_timeout=conf.toxicity_breaker_reset_seconds,
+    )
+
+
+def _benign_terms(raw):
+    if raw is None:
+        return DEFAULT_BENIGN_TERMS
+    return [t.strip() for t in raw.split(',') if t.strip()]  # "" disables the allowlist
+
+
+def create_toxicity_scorer(conf: BotConfig):
+    scorer = _create_base_scorer(conf)
+    if conf.toxicity_cache_size > 0 and not isinstance(scorer, NeutralScorer):
+        scorer = CachingScorer(
+            scorer,
+            max_entries=conf.toxicity_cache_size,
+            ttl_seconds=conf.toxicity_cache_ttl_seconds,
+        )
+    if conf.prefilter_enabled:
+        prefilter = LexicalPrefilter(
+            load_wordlist(conf.prefilter_wordlist),
+            max_benign_len=conf.prefilter_max_benign_len,
+            hit_score=conf.prefilter_hit_score,
+            benign_terms=_benign_terms(conf.prefilter_benign_terms),
+        )
+        scorer = PrefilteredScorer(scorer, prefilter)
+    return scorer
 
 __all__ = ['create_toxicity_scorer']
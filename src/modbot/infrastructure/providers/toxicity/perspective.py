@@ -1,16 +1,54 @@
 from __future__ import annotations
 
+import importlib.util
 from typing import Optional, List, Dict
 import httpx
 from ...logging import structured_logging as _log  # placeholder if moved later
+from .base import ToxicityError, ToxicityRateLimitError
+
+
+DEFAULT_ENDPOINT = "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
 
 
 class PerspectiveScorer:
-    def __init__(self, api_key: str, attributes: Optional[List[str]] = None, timeout: int = 10):
+    """Perspective API scorer holding one long-lived, pooled HTTP client.
+
+    The client is created lazily on first use (inside the running loop) and
+    reused for every request so connections stay warm; call `aclose()` on
+    shutdown. HTTP/2 is used when the optional `h2` package is installed.
+    """
+    def __init__(
+        self,
+        api_key: str,
+        attributes: Optional[List[str]] = None,
+        timeout: int = 10,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        endpoint: str = DEFAULT_ENDPOINT,
+    ):
         self.api_key = api_key
         self.attributes = attributes or ["TOXICITY"]
         self.timeout = timeout
-        self.endpoint = "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze"
+        self.endpoint = endpoint
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = bool(http2) and importlib.util.find_spec("h2") is not None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def score(self, text: str) -> float:  # type: ignore[override]
         req = {
@@ -20,13 +58,18 @@ class PerspectiveScorer:
             "doNotStore": True,
         }
         params = {"key": self.api_key}
+        # Transport / HTTP failures raise instead of scoring 0.0 so callers
+        # (cache, fallbacks) can tell "clean" apart from "unknown".
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                r = await client.post(self.endpoint, params=params, json=req)
-                r.raise_for_status()
-                data = r.json()
-        except Exception:
-            return 0.0
+            r = await self._get_client().post(self.endpoint, params=params, json=req)
+            if r.status_code == 429:
+                raise ToxicityRateLimitError("perspective quota exceeded (429)")
+            r.raise_for_status()
+            data = r.json()
+        except ToxicityError:
+            raise
+        except Exception as e:
+            raise ToxicityError(f"perspective error: {e}") from e
         try:
             scores: Dict[str, float] = {}
             for attr in self.attributes:
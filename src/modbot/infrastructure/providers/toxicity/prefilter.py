@@ -0,0 +1,175 @@
+"""Cheap lexical pre-filter run before model scoring.
+
+`LexicalPrefilter.classify` returns a score without touching a model when
+the answer is obvious:
+ - a configured wordlist term appears as a whole word -> `hit_score`
+ - the message has no letters/digits (emoji, punctuation, custom emoji),
+   is at most `max_benign_len` characters, or is exactly one term of the
+   benign allowlist ("lol", "ok", "thanks"; surrounding punctuation
+   ignored) -> 0.0
+Everything else returns None and goes to the wrapped scorer. The length
+shortcut only covers single characters by default and the allowlist only
+whole-message matches, so short abuse ("kys") is still scored unless a
+wordlist term already caught it.
+
+Wordlist matching uses an Aho-Corasick automaton, so cost is linear in the
+message length regardless of how many terms are configured.
+"""
+from __future__ import annotations
+
+import re
+import string
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from .cache import normalize_text
+
+_CUSTOM_EMOJI_RE = re.compile(r"<a?:\w+:\d+>")
+_EDGE_CHARS = string.punctuation + string.whitespace
+
+DEFAULT_BENIGN_TERMS = (
+    "lol", "lmao", "ok", "okay", "k", "ty", "thx", "thanks", "thank you", "np",
+    "yes", "yeah", "yep", "no", "nope", "gg", "hi", "hey", "hello", "bye", "nice",
+)
+
+
+class AhoCorasick:
+    """Multi-pattern matcher over normalized text with whole-word checks."""
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # pattern lengths ending at node
+        self.size = 0
+        for p in patterns:
+            p = normalize_text(p)
+            if p:
+                self._add(p)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if len(pattern) not in self._out[node]:
+            self._out[node].append(len(pattern))
+            self.size += 1
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the first whole-word match in already-normalized `text`."""
+        if not self.size:
+            return None
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length in out[node]:
+                start = i - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (i + 1 == n or not text[i + 1].isalnum()):
+                    return text[start:i + 1]
+        return None
+
+
+def load_wordlist(path: str | None) -> List[str]:
+    if not path:
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+class LexicalPrefilter:
+    def __init__(
+        self,
+        terms: Iterable[str] = (),
+        max_benign_len: int = 1,
+        hit_score: float = 0.95,
+        benign_terms: Iterable[str] = DEFAULT_BENIGN_TERMS,
+    ):
+        self.matcher = AhoCorasick(terms)
+        self.benign = AhoCorasick(benign_terms)
+        self.max_benign_len = max(0, int(max_benign_len))
+        self.hit_score = float(hit_score)
+
+    def classify(self, text: str) -> Optional[float]:
+        norm = normalize_text(text)
+        # wordlist first: a short message that is a listed term is never "benign"
+        if self.matcher.search(norm) is not None:
+            return self.hit_score
+        stripped = _CUSTOM_EMOJI_RE.sub("", norm)
+        if not any(ch.isalnum() for ch in stripped):
+            return 0.0
+        if len(stripped.strip()) <= self.max_benign_len:
+            return 0.0
+        core = stripped.strip(_EDGE_CHARS)
+        if core and self.benign.search(core) == core:
+            return 0.0
+        return None
+
+
+class PrefilteredScorer:
+    def __init__(self, inner, prefilter: LexicalPrefilter):
+        self.inner = inner
+        self.prefilter = prefilter
+        self.total = 0
+        self.benign = 0
+        self.hits = 0
+
+    def prefilter_score(self, text: str) -> Optional[float]:
+        return self.prefilter.classify(text)
+
+    async def score(self, text: str) -> float:  # type: ignore[override]
+        self.total += 1
+        quick = self.prefilter.classify(text)
+        if quick is None:
+            return await self.inner.score(text)
+        if quick > 0:
+            self.hits += 1
+        else:
+            self.benign += 1
+        return quick
+
+    async def aclose(self) -> None:
+        closer = getattr(self.inner, "aclose", None)
+        if closer is not None:
+            await closer()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        skipped = self.benign + self.hits
+        out: Dict[str, Dict[str, Any]] = {
+            "prefilter": {
+                "terms": self.prefilter.matcher.size,
+                "total": self.total,
+                "benign": self.benign,
+                "wordlist_hits": self.hits,
+                "to_model": self.total - skipped,
+                "skip_fraction": round(skipped / self.total, 3) if self.total else 0.0,
+            }
+        }
+        inner_stats = getattr(self.inner, "stats", None)
+        if callable(inner_stats):
+            out.update(inner_stats())
+        return out
+
+
+__all__ = ['AhoCorasick', 'LexicalPrefilter', 'PrefilteredScorer', 'load_wordlist', 'DEFAULT_BENIGN_TERMS']
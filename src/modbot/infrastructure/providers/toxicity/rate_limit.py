@@ -0,0 +1,163 @@
+"""Token-bucket request scheduler for quota-limited toxicity providers.
+
+`RateLimitedScorer` keeps calls to the wrapped scorer under a configured
+QPS. Callers that arrive while the bucket is empty wait in a bounded queue;
+a call that would wait longer than its deadline, finds the queue full, times
+out, or hits an upstream 429 is handed to the fallback scorer instead of
+silently scoring 0.0. Without a fallback it raises, so an enclosing
+`CascadingScorer` moves on to its next provider.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from .base import ToxicityError, ToxicityRateLimitError
+
+try:
+    from modbot.infrastructure.logging.structured_logging import debug as log_debug
+except Exception:
+    def log_debug(*a, **kw): pass
+
+
+class TokenBucket:
+    """Reservation-style token bucket.
+
+    `reserve()` always takes a token, letting the balance go negative; the
+    returned delay is how long the caller must wait for its slot. Negative
+    balance therefore doubles as the length of the wait queue.
+    """
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = max(1e-6, float(rate))
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._ts = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+        self._ts = now
+
+    def peek_wait(self) -> float:
+        self._refill()
+        return max(0.0, (1.0 - self._tokens) / self.rate)
+
+    def reserve(self) -> float:
+        self._refill()
+        self._tokens -= 1.0
+        return max(0.0, -self._tokens / self.rate)
+
+    def refund(self) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + 1.0)
+
+    def drain(self) -> None:
+        """Upstream told us we're over quota: forfeit any banked burst."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimitedScorer:
+    def __init__(
+        self,
+        inner,
+        qps: float = 1.0,
+        burst: float = 1.0,
+        max_queue: int = 50,
+        deadline_seconds: float = 2.0,
+        fallback=None,
+        name: str = "perspective",
+    ):
+        self.inner = inner
+        self.fallback = fallback
+        self.name = name
+        self.bucket = TokenBucket(qps, burst)
+        self.max_queue = max(0, int(max_queue))
+        self.deadline = max(0.01, float(deadline_seconds))
+        self._waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.wait_seconds_total = 0.0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.timeouts = 0
+        self.upstream_errors = 0
+        self.upstream_429 = 0
+        self.fallbacks = 0
+
+    async def score(self, text: str) -> float:  # type: ignore[override]
+        predicted = self.bucket.peek_wait()
+        if predicted > 0:
+            if self._waiting >= self.max_queue:
+                self.shed_queue_full += 1
+                return await self._fall_through(text, "queue_full")
+            if predicted >= self.deadline:
+                self.shed_deadline += 1
+                return await self._fall_through(text, "deadline")
+        delay = self.bucket.reserve()
+        if delay > 0:
+            self.queued += 1
+            self._waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.bucket.refund()
+                raise
+            finally:
+                self._waiting -= 1
+                self.wait_seconds_total += delay
+        self.admitted += 1
+        try:
+            return await asyncio.wait_for(self.inner.score(text), timeout=max(0.01, self.deadline - delay))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return await self._fall_through(text, "timeout")
+        except ToxicityRateLimitError:
+            self.upstream_429 += 1
+            self.bucket.drain()
+            return await self._fall_through(text, "upstream_429")
+        except ToxicityError:
+            self.upstream_errors += 1
+            return await self._fall_through(text, "upstream_error")
+
+    async def _fall_through(self, text: str, reason: str) -> float:
+        log_debug("toxicity.rate_limit.fall_through", provider=self.name, reason=reason)
+        if self.fallback is None:
+            if reason in {"timeout", "upstream_error"}:
+                raise ToxicityError(f"{self.name} unavailable ({reason})")
+            raise ToxicityRateLimitError(f"{self.name} over quota ({reason})")
+        self.fallbacks += 1
+        return await self.fallback.score(text)
+
+    async def aclose(self) -> None:
+        for scorer in (self.inner, self.fallback):
+            closer = getattr(scorer, "aclose", None)
+            if closer is not None:
+                await closer()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        avg_wait_ms = (self.wait_seconds_total / self.queued * 1000) if self.queued else 0.0
+        out: Dict[str, Dict[str, Any]] = {
+            f"{self.name}.rate_limit": {
+                "qps": self.bucket.rate,
+                "queue_depth": self._waiting,
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "avg_wait_ms": round(avg_wait_ms, 1),
+                "shed_queue_full": self.shed_queue_full,
+                "shed_deadline": self.shed_deadline,
+                "timeouts": self.timeouts,
+                "upstream_429": self.upstream_429,
+                "upstream_errors": self.upstream_errors,
+                "fallbacks": self.fallbacks,
+            }
+        }
+        for scorer in (self.inner, self.fallback):
+            inner_stats = getattr(scorer, "stats", None)
+            if callable(inner_stats):
+                out.update(inner_stats())
+        return out
+
+
+__all__ = ['TokenBucket', 'RateLimitedScorer']
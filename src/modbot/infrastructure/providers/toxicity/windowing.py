@@ -0,0 +1,116 @@
+"""Sentence-windowed scoring for long messages.
+
+Long texts are split on sentence boundaries into windows of at most
+`window_tokens` whitespace tokens (oversized sentences are hard-split), all
+windows are scored in one batch, and the window scores are combined with a
+reducer. If the text exceeds `max_tokens`, evenly spaced windows are kept so
+the whole message is still sampled while per-message work stays bounded.
+
+Reducers: `max`, `mean`, `topk_mean:K` (mean of the K highest windows).
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Callable, Dict, List, Sequence
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def split_windows(text: str, window_tokens: int, max_tokens: int) -> List[str]:
+    window_tokens = max(1, window_tokens)
+    windows: List[List[str]] = []
+    current: List[str] = []
+    for sentence in _SENTENCE_RE.split(text):
+        tokens = sentence.split()
+        while tokens:
+            room = window_tokens - len(current)
+            if len(tokens) <= room:
+                current.extend(tokens)
+                tokens = []
+            elif current:
+                windows.append(current)
+                current = []
+            else:
+                windows.append(tokens[:window_tokens])
+                tokens = tokens[window_tokens:]
+    if current:
+        windows.append(current)
+    max_windows = max(1, max_tokens // window_tokens)
+    if len(windows) > max_windows:
+        step = (len(windows) - 1) / (max_windows - 1) if max_windows > 1 else 0
+        windows = [windows[round(i * step)] for i in range(max_windows)]
+    return [" ".join(w) for w in windows]
+
+
+def make_reducer(spec: str) -> Callable[[Sequence[float]], float]:
+    spec = (spec or "max").strip().lower()
+    if spec == "max":
+        return max
+    if spec == "mean":
+        return lambda xs: sum(xs) / len(xs)
+    if spec.startswith("topk_mean"):
+        _, _, k_raw = spec.partition(":")
+        k = int(k_raw) if k_raw.strip().isdigit() else 3
+        k = max(1, k)
+
+        def _topk(xs: Sequence[float]) -> float:
+            top = sorted(xs, reverse=True)[:k]
+            return sum(top) / len(top)
+        return _topk
+    raise ValueError(f"Unknown window reducer '{spec}' (use max, mean or topk_mean:K)")
+
+
+class WindowedScorer:
+    def __init__(self, inner, window_tokens: int = 64, max_tokens: int = 512, reducer: str = "max"):
+        self.inner = inner
+        self.window_tokens = max(1, int(window_tokens))
+        self.max_tokens = max(self.window_tokens, int(max_tokens))
+        self.reducer_name = reducer
+        self._reduce = make_reducer(reducer)
+        self.windowed = 0
+        self.windows_scored = 0
+        self.truncated = 0
+
+    async def score(self, text: str) -> float:  # type: ignore[override]
+        n_tokens = len(text.split())
+        if n_tokens <= self.window_tokens:
+            return await self.inner.score(text)
+        windows = split_windows(text, self.window_tokens, self.max_tokens)
+        self.windowed += 1
+        self.windows_scored += len(windows)
+        if n_tokens > self.max_tokens:
+            self.truncated += 1
+        batch = getattr(self.inner, "score_batch", None)
+        if batch is not None:
+            scores = await batch(windows)
+        else:
+            scores = await asyncio.gather(*(self.inner.score(w) for w in windows))
+        return float(self._reduce(scores))
+
+    async def score_batch(self, texts: Sequence[str]) -> List[float]:
+        return list(await asyncio.gather(*(self.score(t) for t in texts)))
+
+    async def aclose(self) -> None:
+        closer = getattr(self.inner, "aclose", None)
+        if closer is not None:
+            await closer()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {
+            "windowing": {
+                "window_tokens": self.window_tokens,
+                "max_tokens": self.max_tokens,
+                "reducer": self.reducer_name,
+                "windowed_messages": self.windowed,
+                "windows_scored": self.windows_scored,
+                "capped": self.truncated,
+            }
+        }
+        inner_stats = getattr(self.inner, "stats", None)
+        if callable(inner_stats):
+            out.update(inner_stats())
+        return out
+
+
+__all__ = ['WindowedScorer', 'split_windows', 'make_reducer']
@@ -0,0 +1,258 @@
+"""Durable delivery of moderation side effects.
+
+Timeouts and escalation posts are written to the `action_outbox` table
+(keyed by an idempotency key derived from the message, its content and the
+action) and the pipeline moves on. A background executor delivers due rows
+with the bot's REST client, retrying transient failures with exponential
+backoff. Rows survive restarts, and a replayed message cannot enqueue the
+same side effect twice; an edited message gets new keys.
+
+Errors are classified as:
+ - permanent (403/404 and other 4xx except 429): the row is marked dead;
+ - transient (429, 5xx, network, timeouts): retried until `max_attempts`.
+
+The action is logged as 'queued' and its action_log row is `link`ed to the
+outbox row (persisted, so it survives restarts too); delivery moves it to
+'success', a dead row to 'failure'. A second evaluation of the same message
+that hits an existing key is logged as a 'duplicate' failure. Dead rows
+with no linked action get a `failure` entry of their own.
+
+Deliveries use stored IDs only (no cached Message/Member objects), so any
+process sharing the database can deliver any row; claims take a lease. A
+delivery that is still waiting (REST slots, 429 backoff) at 80% of the lease
+is abandoned and retried, so the row is never handed out twice while in
+flight.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import discord
+
+from .rest_scheduler import RestPriority, rest_slot
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning, error as log_error
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+    def log_error(*a, **kw): pass
+
+
+class PermanentDeliveryError(Exception):
+    """Delivery can never succeed (missing permissions, unknown channel/member...)."""
+
+
+class ActionOutbox:
+    def __init__(
+        self,
+        db,
+        client,
+        scheduler=None,
+        poll_seconds: float = 1.0,
+        max_attempts: int = 6,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        lease_seconds: float = 60.0,
+        batch_size: int = 20,
+    ):
+        self.db = db
+        self.repo = db.outbox
+        self.client = client
+        self.scheduler = scheduler
+        self.poll_seconds = max(0.1, float(poll_seconds))
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_backoff = float(base_backoff)
+        self.max_backoff = float(max_backoff)
+        self.lease_seconds = float(lease_seconds)
+        self.batch_size = max(1, int(batch_size))
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.counts = {"enqueued": 0, "duplicates": 0, "delivered": 0, "retried": 0, "dead": 0}
+
+    # -- producer side -----------------------------------------------------
+    def _enqueue(self, key: str, kind: str, payload: Dict[str, Any]) -> Tuple[int, bool]:
+        row_id, created = self.repo.enqueue(key, kind, payload)
+        if created:
+            self.counts["enqueued"] += 1
+            if self._wakeup is not None:
+                self._wakeup.set()
+        else:
+            self.counts["duplicates"] += 1
+            log_info("outbox.duplicate", key=key, outbox_id=row_id)
+        return row_id, created
+
+    def link(self, outbox_id: int, action_log_id: int) -> None:
+        """Track delivery of `outbox_id` on the 'queued' action_log row `action_log_id`."""
+        status, error, linked = self.repo.link(outbox_id, action_log_id)
+        if linked != action_log_id:
+            # another evaluation of the same message owns this entry
+            self.db.update_action_status(action_log_id, 'failure', 'duplicate')
+        elif status == 'done':
+            self.db.update_action_status(action_log_id, 'success')
+        elif status == 'dead':
+            self.db.update_action_status(action_log_id, 'failure', (error or 'delivery failed')[:200])
+
+    def enqueue_timeout(self, key: str, guild_id: int, user_id: int, until: datetime, reason: str, log: Dict[str, Any]) -> Tuple[int, bool]:
+        return self._enqueue(key, "timeout", {
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "until_ts": until.timestamp(),
+            "reason": reason,
+            "log": log,
+        })
+
+    def enqueue_send(self, key: str, channel_id: int, content: str, priority: RestPriority, log: Dict[str, Any]) -> Tuple[int, bool]:
+        return self._enqueue(key, "send", {
+            "channel_id": channel_id,
+            "content": content,
+            "priority": priority.name,
+            "log": log,
+        })
+
+    # -- executor ----------------------------------------------------------
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        purged = self.repo.purge_finished()
+        pending = self.repo.counts().get("pending", 0)
+        log_info("outbox.started", pending=pending, purged=purged)
+        self._task = asyncio.create_task(self._run(), name="action-outbox")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                rows = [r for r in self.repo.due(self.batch_size) if self.repo.claim(r["id"], self.lease_seconds)]
+                if rows:
+                    await asyncio.gather(*(self._process(r) for r in rows))
+                    continue  # more may be due
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                log_error("outbox.loop_error", error=str(e))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, row: dict) -> None:
+        attempts = row["attempts"] + 1  # claim() counted this attempt
+        deadline = self.lease_seconds * 0.8  # finish well before the claim can be taken again
+        try:
+            note = await asyncio.wait_for(self._deliver(row["kind"], row["payload"]), deadline)
+        except PermanentDeliveryError as e:
+            self._give_up(row, str(e))
+            return
+        except Exception as e:  # noqa: BLE001
+            error = f"delivery timed out after {deadline:g}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+            if attempts >= self.max_attempts:
+                self._give_up(row, f"gave up after {attempts} attempts: {error}")
+                return
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            self.repo.mark_retry(row["id"], time.time() + delay, error)
+            self.counts["retried"] += 1
+            log_warning("outbox.retry", outbox_id=row["id"], kind=row["kind"], attempt=attempts, delay_s=round(delay, 1), error=error)
+            return
+        self.repo.mark_done(row["id"], note)
+        self.counts["delivered"] += 1
+        log_info("outbox.delivered", outbox_id=row["id"], kind=row["kind"], attempt=attempts, note=note)
+        self._update_linked(row["id"], 'success')
+
+    def _update_linked(self, outbox_id: int, status: str, failure_reason: Optional[str] = None) -> bool:
+        """Move the linked action_log row to its final status; False if nothing is linked yet."""
+        try:
+            log_id = self.repo.linked_log_id(outbox_id)
+            if log_id is None:
+                return False  # not linked yet: `link` applies the final status
+            self.db.update_action_status(log_id, status, failure_reason)
+            return True
+        except Exception as e:  # noqa: BLE001
+            log_error("outbox.status_update_failed", outbox_id=outbox_id, error=str(e))
+            return True
+
+    def _give_up(self, row: dict, error: str) -> None:
+        self.repo.mark_dead(row["id"], error)
+        self.counts["dead"] += 1
+        log_error("outbox.dead", outbox_id=row["id"], kind=row["kind"], error=error)
+        if self._update_linked(row["id"], 'failure', error[:200]):
+            return
+        log = row["payload"].get("log") or {}
+        try:
+            self.db.log_action(
+                guild_id=log.get("guild_id"),
+                channel_id=log.get("channel_id"),
+                actor_id=getattr(getattr(self.client, 'user', None), 'id', None),
+                action=log.get("action", row["kind"]),
+                target_id=log.get("target_id"),
+                reason="outbox delivery failed",
+                evidence={"outbox_id": row["id"], "idempotency_key": row["key"], "message_id": log.get("message_id")},
+                status="failure",
+                failure_reason=error[:200],
+            )
+        except Exception as e:  # noqa: BLE001
+            log_error("outbox.dead_log_failed", outbox_id=row["id"], error=str(e))
+
+    async def _deliver(self, kind: str, payload: Dict[str, Any]) -> Optional[str]:
+        try:
+            if kind == "timeout":
+                return await self._deliver_timeout(payload)
+            if kind == "send":
+                return await self._deliver_send(payload)
+        except discord.HTTPException as e:
+            if e.status != 429 and 400 <= e.status < 500:
+                raise PermanentDeliveryError(f"{e.status}: {e.text or e}") from None
+            raise
+        raise PermanentDeliveryError(f"unknown outbox kind '{kind}'")
+
+    async def _deliver_timeout(self, payload: Dict[str, Any]) -> Optional[str]:
+        until = datetime.fromtimestamp(payload["until_ts"], tz=timezone.utc)
+        if until <= datetime.now(timezone.utc):
+            return "expired"  # delivering now would be a no-op
+        guild_id = payload["guild_id"]
+        async with rest_slot(self.scheduler, RestPriority.TIMEOUT, ('guild', guild_id)):
+            await self.client.http.edit_member(
+                guild_id,
+                payload["user_id"],
+                reason=payload.get("reason"),
+                communication_disabled_until=until.isoformat(),
+            )
+        return None
+
+    async def _deliver_send(self, payload: Dict[str, Any]) -> Optional[str]:
+        channel_id = payload["channel_id"]
+        priority = RestPriority[payload.get("priority", "ESCALATE")]
+        channel = self.client.get_partial_messageable(channel_id)
+        async with rest_slot(self.scheduler, priority, ('channel', channel_id)):
+            await channel.send(payload["content"])
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            by_status = self.repo.counts()
+        except Exception:  # noqa: BLE001
+            by_status = {}
+        return {
+            "outbox": {
+                **self.counts,
+                "pending": by_status.get("pending", 0),
+                "in_flight": by_status.get("in_flight", 0),
+                "dead_total": by_status.get("dead", 0),
+            }
+        }
+
+
+__all__ = ['ActionOutbox', 'PermanentDeliveryError']
@@ -0,0 +1,149 @@
+"""Per-channel batching of message deletes.
+
+Deletes for the same channel arriving within `window_seconds` are sent as
+one `channel.delete_messages` call (Discord bulk delete, up to 100 IDs),
+so a raid costs a handful of REST calls instead of one per message.
+
+Discord only bulk-deletes messages younger than 14 days; older ones, and
+batches of one, use `message.delete()`. If a bulk call fails for any
+reason other than missing permissions, its messages are retried one by
+one so a single bad ID cannot lose the whole batch. Every result carries
+the batch ID so it can be recorded with the action.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+from ..domain.moderation.actions.helpers import delete_single
+from .rest_scheduler import RestPriority, rest_slot
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning, error as log_error
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+    def log_error(*a, **kw): pass
+
+BULK_MAX = 100
+# Discord's cutoff is 14 days; keep a margin for clock skew and queueing.
+BULK_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+DeleteResult = Tuple[bool, Optional[str], Optional[str]]  # (ok, failure_reason, batch_id)
+
+
+class _Pending:
+    __slots__ = ("channel", "items", "timer")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.items: List[Tuple[Any, str, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class DeletionBatcher:
+    def __init__(self, window_seconds: float = 0.5, scheduler=None):
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.scheduler = scheduler
+        self._pending: Dict[int, _Pending] = {}
+        self._tasks: set = set()
+        self.bulk_calls = 0
+        self.bulk_deleted = 0
+        self.single_deletes = 0
+        self.bulk_fallbacks = 0
+
+    @staticmethod
+    def _bulk_eligible(message) -> bool:
+        channel = message.channel
+        if message.guild is None or not hasattr(channel, 'delete_messages'):
+            return False
+        created = getattr(message, 'created_at', None)
+        return created is not None and discord.utils.utcnow() - created < BULK_MAX_AGE
+
+    async def delete(self, message, reason: str) -> DeleteResult:
+        """Delete `message`, batched with other deletes in its channel when possible."""
+        if self.window_seconds <= 0 or not self._bulk_eligible(message):
+            self.single_deletes += 1
+            ok, failure = await delete_single(message, reason, self.scheduler)
+            return ok, failure, None
+        loop = asyncio.get_running_loop()
+        channel_id = message.channel.id
+        pending = self._pending.get(channel_id)
+        if pending is None:
+            pending = self._pending[channel_id] = _Pending(message.channel)
+            pending.timer = loop.call_later(self.window_seconds, self._flush_channel, channel_id)
+        future = loop.create_future()
+        pending.items.append((message, reason, future))
+        if len(pending.items) >= BULK_MAX:
+            self._flush_channel(channel_id)
+        # Shield: a caller timing out must not cancel the shared batch result.
+        return await asyncio.shield(future)
+
+    def _flush_channel(self, channel_id: int) -> None:
+        pending = self._pending.pop(channel_id, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._send(pending.channel, pending.items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, channel, items: List[Tuple[Any, str, asyncio.Future]]) -> None:
+        results: List[DeleteResult]
+        if len(items) == 1:
+            message, reason, _ = items[0]
+            self.single_deletes += 1
+            ok, failure = await delete_single(message, reason, self.scheduler)
+            results = [(ok, failure, None)]  # not a bulk call: no batch to point at
+        else:
+            results = await self._send_bulk(channel, items, uuid.uuid4().hex[:12])
+        for (_, _, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _send_bulk(self, channel, items, batch_id: str) -> List[DeleteResult]:
+        reasons = {reason for _, reason, _ in items}
+        audit_reason = reasons.pop() if len(reasons) == 1 else f"moderation batch {batch_id}"
+        try:
+            async with rest_slot(self.scheduler, RestPriority.DELETE, ('channel', channel.id)):
+                await channel.delete_messages([m for m, _, _ in items], reason=audit_reason)
+        except discord.Forbidden:
+            log_error("action.delete_message.bulk_forbidden", channel_id=channel.id, batch_id=batch_id, count=len(items))
+            return [(False, 'forbidden', batch_id)] * len(items)
+        except Exception as e:  # noqa: BLE001
+            log_warning("action.delete_message.bulk_failed", channel_id=channel.id, batch_id=batch_id, count=len(items), error=str(e))
+            self.bulk_fallbacks += 1
+            self.single_deletes += len(items)
+            singles = await asyncio.gather(*(delete_single(m, reason, self.scheduler) for m, reason, _ in items))
+            return [(ok, failure, batch_id) for ok, failure in singles]
+        self.bulk_calls += 1
+        self.bulk_deleted += len(items)
+        log_info("action.delete_message.bulk", channel_id=channel.id, batch_id=batch_id, count=len(items))
+        return [(True, None, batch_id)] * len(items)
+
+    async def aclose(self) -> None:
+        """Send whatever is still pending and wait for in-flight batches."""
+        for channel_id in list(self._pending):
+            self._flush_channel(channel_id)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "deletes": {
+                "window_ms": int(self.window_seconds * 1000),
+                "pending": sum(len(p.items) for p in self._pending.values()),
+                "bulk_calls": self.bulk_calls,
+                "bulk_deleted": self.bulk_deleted,
+                "single": self.single_deletes,
+                "bulk_fallbacks": self.bulk_fallbacks,
+            }
+        }
+
+
+__all__ = ['DeletionBatcher', 'DeleteResult', 'BULK_MAX']
@@ -0,0 +1,90 @@
+"""Edit-aware rescoring.
+
+Message edits are fed back through the moderation queue, but only when the
+text actually changed and only once the user stops editing:
+
+ - Each seen message's content hash is remembered (bounded, oldest first
+   out). Edits whose hash matches are dropped without further work; this
+   covers embed unfurls, pins and other non-text updates.
+ - Changed edits are debounced per message: each new edit restarts the
+   timer, and only the final version is submitted.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+try:
+    from modbot.infrastructure.logging.structured_logging import debug as log_debug
+except Exception:
+    def log_debug(*a, **kw): pass
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+class EditTracker:
+    def __init__(self, submit: Callable[[Any], None], debounce_seconds: float = 2.0, max_tracked: int = 20_000):
+        self._submit = submit
+        self.debounce_seconds = max(0.0, float(debounce_seconds))
+        self.max_tracked = max(1, int(max_tracked))
+        self._hashes: "OrderedDict[int, bytes]" = OrderedDict()
+        self._pending: Dict[int, Any] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self.stats_counts = {"edits": 0, "unchanged": 0, "superseded": 0, "rescored": 0}
+
+    def _store(self, message_id: int, digest: bytes) -> None:
+        self._hashes[message_id] = digest
+        self._hashes.move_to_end(message_id)
+        while len(self._hashes) > self.max_tracked:
+            self._hashes.popitem(last=False)
+
+    def remember(self, message) -> None:
+        """Record the content of a freshly posted message."""
+        self._store(message.id, content_hash(message.content or ""))
+
+    def is_unchanged(self, message_id: int, content: str) -> bool:
+        """True if `content` matches what was last seen; otherwise records it."""
+        self.stats_counts["edits"] += 1
+        digest = content_hash(content)
+        if self._hashes.get(message_id) == digest:
+            self.stats_counts["unchanged"] += 1
+            return True
+        self._store(message_id, digest)
+        return False
+
+    def schedule(self, message) -> None:
+        """Debounce a changed edit; the last version within the window is submitted."""
+        mid = message.id
+        if mid in self._pending:
+            self.stats_counts["superseded"] += 1
+        self._pending[mid] = message
+        timer = self._timers.pop(mid, None)
+        if timer is not None:
+            timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timers[mid] = loop.call_later(self.debounce_seconds, self._flush, mid)
+
+    def _flush(self, message_id: int) -> None:
+        self._timers.pop(message_id, None)
+        message = self._pending.pop(message_id, None)
+        if message is None:
+            return
+        self.stats_counts["rescored"] += 1
+        log_debug("edit.rescore", message_id=message_id)
+        self._submit(message)
+
+    def cancel_all(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"edits": {"tracked": len(self._hashes), "pending": len(self._pending), **self.stats_counts}}
+
+
+__all__ = ['EditTracker', 'content_hash']
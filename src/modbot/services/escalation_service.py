@@ -18,23 +18,39 @@ class _ActionCountRepo(Protocol):  # minimal structural typing for DB
     def count_recent_like(self, target_id: int, action_prefix: str, window_minutes: int) -> int: ...
 
 
-def evaluate_escalation_thresholds(repo: _ActionCountRepo, escalation_policy, target_id: int, base_action: str, window_minutes: int) -> List[str]:
+def threshold_count_key(base_action: str) -> tuple[str, bool]:
+    """(action, is_prefix) used to count `base_action` toward escalation thresholds."""
+    base_root = base_action.split('(')[0].strip().lower()
+    return base_root, base_root == 'timeout_member'
+
+
+def evaluate_escalation_thresholds(
+    repo: _ActionCountRepo,
+    escalation_policy,
+    target_id: int,
+    base_action: str,
+    window_minutes: int,
+    current_count: int | None = None,
+) -> List[str]:
     """Return list of follow-up actions whose thresholds are newly met.
 
     A threshold triggers if the count *after* the just-logged action equals the configured count.
     Parameterized actions (e.g. timeout_member(30)) are aggregated by their base prefix.
+    Pass `current_count` when it was obtained atomically with the insert
+    (see `CoordinationBackend`) so the threshold fires exactly once across processes.
     """
     if not escalation_policy or not getattr(escalation_policy, 'parsed', None):
         return []
     parsed = getattr(escalation_policy, 'parsed', {}) or {}
-    base_root = base_action.split('(')[0].strip().lower()
+    base_root, prefix = threshold_count_key(base_action)
     thresholds = parsed.get(base_root, [])
     if not thresholds:
         return []
-    if base_root == 'timeout_member':
-        current_count = repo.count_recent_like(target_id, base_root, window_minutes)
-    else:
-        current_count = repo.count_recent(target_id, base_root, window_minutes)
+    if current_count is None:
+        if prefix:
+            current_count = repo.count_recent_like(target_id, base_root, window_minutes)
+        else:
+            current_count = repo.count_recent(target_id, base_root, window_minutes)
     return [follow for cnt, follow in thresholds if cnt == current_count]
 
 
@@ -48,5 +64,5 @@ class EscalationService:
 
 
 __all__ = [
-    'evaluate_escalation_thresholds', 'EscalationService'
+    'evaluate_escalation_thresholds', 'threshold_count_key', 'EscalationService'
 ]
@@ -0,0 +1,146 @@
+"""Per-guild exemption and scope index.
+
+Resolves, once per guild, which role IDs exempt a member from automated
+moderation (MOD_EXEMPT_ROLE_NAMES, policy `exempt_roles`, and roles granting
+Manage Server / Administrator) and which channels are in scope (policy
+`scope` allow/deny lists of channel and category names or IDs). Per-member
+and per-channel verdicts are cached, so the check in `on_message` is a couple
+of dict lookups.
+
+Event handlers keep it current: role and channel changes and policy reloads
+rebuild the affected guild, and member role changes drop that member's
+cached verdict.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Set
+
+try:
+    from modbot.infrastructure.logging.structured_logging import debug as log_debug
+except Exception:
+    def log_debug(*a, **kw): pass
+
+_MAX_MEMBER_VERDICTS = 50_000  # per guild; cleared wholesale when exceeded
+
+
+@dataclass
+class _GuildExemptions:
+    owner_id: Optional[int]
+    exempt_role_ids: FrozenSet[int]
+    allow_ids: FrozenSet[int]
+    deny_ids: FrozenSet[int]
+    members: Dict[int, bool] = field(default_factory=dict)
+    channels: Dict[int, bool] = field(default_factory=dict)
+
+
+def _resolve_ids(entries: Iterable[str], named: Dict[str, Set[int]]) -> Set[int]:
+    out: Set[int] = set()
+    for entry in entries:
+        e = str(entry).strip()
+        if e.isdigit():
+            out.add(int(e))
+        else:
+            out |= named.get(e.lower(), set())
+    return out
+
+
+class ExemptionIndex:
+    def __init__(self, role_names: Iterable[str], policy: Callable[[], Any]):
+        self.role_names = {r.strip().lower() for r in role_names if r.strip()}
+        self._policy = policy
+        self._guilds: Dict[int, _GuildExemptions] = {}
+        self.skipped = {"exempt_member": 0, "out_of_scope": 0}
+
+    # -- build / invalidate -----------------------------------------------
+    def _build(self, guild) -> _GuildExemptions:
+        policy = self._policy()
+        names = set(self.role_names)
+        names |= {r.strip().lower() for r in getattr(policy, 'exempt_roles', []) or [] if r.strip()}
+        exempt: Set[int] = set()
+        for role in getattr(guild, 'roles', []):
+            perms = getattr(role, 'permissions', None)
+            if role.name.lower() in names or getattr(perms, 'manage_guild', False) or getattr(perms, 'administrator', False):
+                exempt.add(role.id)
+        named: Dict[str, Set[int]] = {}
+        for ch in getattr(guild, 'channels', []):
+            named.setdefault(ch.name.lower(), set()).add(ch.id)
+        scope = getattr(policy, 'scope', None)
+        allow = _resolve_ids(getattr(scope, 'allow_channels', []), named) | _resolve_ids(getattr(scope, 'allow_categories', []), named)
+        deny = _resolve_ids(getattr(scope, 'deny_channels', []), named) | _resolve_ids(getattr(scope, 'deny_categories', []), named)
+        entry = _GuildExemptions(
+            owner_id=getattr(guild, 'owner_id', None),
+            exempt_role_ids=frozenset(exempt),
+            allow_ids=frozenset(allow),
+            deny_ids=frozenset(deny),
+        )
+        self._guilds[guild.id] = entry
+        log_debug("exemptions.built", guild_id=guild.id, exempt_roles=len(exempt), allow=len(allow), deny=len(deny))
+        return entry
+
+    def _get(self, guild) -> _GuildExemptions:
+        entry = self._guilds.get(guild.id)
+        return entry if entry is not None else self._build(guild)
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+    def invalidate_member(self, guild_id: int, member_id: int) -> None:
+        entry = self._guilds.get(guild_id)
+        if entry is not None:
+            entry.members.pop(member_id, None)
+
+    def invalidate_all(self) -> None:
+        self._guilds.clear()
+
+    # -- checks ------------------------------------------------------------
+    def is_exempt_member(self, member) -> bool:
+        guild = getattr(member, 'guild', None)
+        if guild is None:
+            return False
+        entry = self._get(guild)
+        verdict = entry.members.get(member.id)
+        if verdict is None:
+            verdict = member.id == entry.owner_id or any(r.id in entry.exempt_role_ids for r in getattr(member, 'roles', []))
+            if len(entry.members) >= _MAX_MEMBER_VERDICTS:
+                entry.members.clear()
+            entry.members[member.id] = verdict
+        return verdict
+
+    def channel_in_scope(self, channel) -> bool:
+        guild = getattr(channel, 'guild', None)
+        if guild is None:
+            return True
+        entry = self._get(guild)
+        verdict = entry.channels.get(channel.id)
+        if verdict is None:
+            # threads inherit their parent channel's scope
+            parent_id = getattr(channel, 'parent_id', None)
+            base = guild.get_channel(parent_id) if parent_id and hasattr(guild, 'get_channel') else None
+            ids = {channel.id, parent_id, getattr(channel, 'category_id', None), getattr(base, 'category_id', None)}
+            ids.discard(None)
+            if ids & entry.deny_ids:
+                verdict = False
+            else:
+                verdict = not entry.allow_ids or bool(ids & entry.allow_ids)
+            entry.channels[channel.id] = verdict
+        return verdict
+
+    def skip_reason(self, message) -> Optional[str]:
+        """Why `message` needs no moderation, or None if it should be scored."""
+        if message.guild is None:
+            return None
+        if not self.channel_in_scope(message.channel):
+            reason = "out_of_scope"
+        elif self.is_exempt_member(message.author):
+            reason = "exempt_member"
+        else:
+            return None
+        self.skipped[reason] += 1
+        return reason
+
+    def stats(self):
+        return {"exemptions": {"guilds_indexed": len(self._guilds), **self.skipped}}
+
+
+__all__ = ['ExemptionIndex']
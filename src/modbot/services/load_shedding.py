@@ -0,0 +1,120 @@
+"""Adaptive load-shedding tiers for the moderation pipeline.
+
+`LoadShedder` watches the work queue (fill fraction and recent queueing
+delay) and picks how much work each message gets:
+
+ - FULL: normal pipeline.
+ - NO_LLM: `ask_llm` is replaced by the policy's `degradation.llm_fallback_actions`.
+ - PREFILTER_ONLY: only the lexical pre-filter scores messages; anything it
+   cannot decide is left alone.
+ - SAMPLING: as PREFILTER_ONLY, but only a `degradation.sample_rate`
+   fraction of messages is looked at; the rest are skipped outright.
+
+Escalation to a higher tier is immediate. Recovery steps down one tier at a
+time, and only after load has stayed below that tier for `recover_seconds`,
+so the pipeline doesn't flap at a threshold.
+"""
+from __future__ import annotations
+
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, Sequence
+
+try:
+    from modbot.infrastructure.logging.structured_logging import warning as log_warning, info as log_info
+except Exception:
+    def log_warning(*a, **kw): pass
+    def log_info(*a, **kw): pass
+
+
+class ShedTier(IntEnum):
+    FULL = 0
+    NO_LLM = 1
+    PREFILTER_ONLY = 2
+    SAMPLING = 3
+
+
+def parse_thresholds(raw: str, cast: Callable[[str], float] = float) -> tuple:
+    """Parse 'a,b,c' into the entry thresholds for NO_LLM, PREFILTER_ONLY, SAMPLING."""
+    values = tuple(cast(v) for v in raw.split(',') if v.strip())
+    if len(values) != 3 or list(values) != sorted(values):
+        raise ValueError(f"Expected three ascending thresholds, got '{raw}'")
+    return values
+
+
+class LoadShedder:
+    def __init__(
+        self,
+        queue,
+        depth_fractions: Sequence[float] = (0.5, 0.75, 0.9),
+        wait_seconds: Sequence[float] = (2.0, 5.0, 10.0),
+        recover_seconds: float = 10.0,
+        enabled: bool = True,
+    ):
+        self.queue = queue
+        self.depth_fractions = tuple(depth_fractions)
+        self.wait_seconds = tuple(wait_seconds)
+        self.recover_seconds = float(recover_seconds)
+        self.enabled = enabled
+        self.tier = ShedTier.FULL
+        self._calm_since: float | None = None
+        self.changes = 0
+        self.counts: Dict[str, int] = {"llm_fallback": 0, "prefilter_only": 0, "sampled_out": 0}
+
+    def _target(self) -> ShedTier:
+        fill = self.queue.depth / max(1, self.queue.capacity)
+        wait = self.queue.recent_wait
+        target = ShedTier.FULL
+        for level in (ShedTier.NO_LLM, ShedTier.PREFILTER_ONLY, ShedTier.SAMPLING):
+            i = level - 1
+            if fill >= self.depth_fractions[i] or wait >= self.wait_seconds[i]:
+                target = level
+        return target
+
+    def update(self) -> ShedTier:
+        """Re-evaluate load and return the tier to apply to the next message."""
+        if not self.enabled:
+            return ShedTier.FULL
+        target = self._target()
+        now = time.monotonic()
+        if target > self.tier:
+            self._set(target)
+            self._calm_since = None
+        elif target < self.tier:
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= self.recover_seconds:
+                self._set(ShedTier(self.tier - 1))
+                self._calm_since = now
+        else:
+            self._calm_since = None
+        return self.tier
+
+    def _set(self, tier: ShedTier) -> None:
+        previous = self.tier
+        self.tier = tier
+        self.changes += 1
+        log = log_warning if tier > previous else log_info
+        log(
+            "loadshed.tier_change",
+            from_tier=previous.name,
+            to_tier=tier.name,
+            depth=self.queue.depth,
+            wait_ms=round(self.queue.recent_wait * 1000, 1),
+        )
+
+    def count(self, key: str) -> None:
+        self.counts[key] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "load_shedding": {
+                "enabled": self.enabled,
+                "tier": self.tier.name,
+                "tier_changes": self.changes,
+                **self.counts,
+            }
+        }
+
+
+__all__ = ['LoadShedder', 'ShedTier', 'parse_thresholds']
@@ -0,0 +1,57 @@
+"""Process-wide filter for redelivered messages.
+
+Gateway resumes (and reconnects under load) can deliver the same
+MESSAGE_CREATE more than once. `on_message` checks every message here
+first, before the edit tracker, raid detector or work queue see it, so a
+replay has no side effects at all. Edits reuse the message ID and never
+pass through this filter.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Set
+
+
+class RecentIdSet:
+    """Fixed-size set of the last `capacity` IDs seen (ring buffer + hash set).
+
+    `add` is O(1); once full, each new ID evicts the oldest one.
+    """
+    __slots__ = ("capacity", "_ring", "_pos", "_ids", "duplicates")
+
+    def __init__(self, capacity: int = 50_000):
+        self.capacity = max(1, int(capacity))
+        self._ring: List[Optional[int]] = [None] * self.capacity
+        self._pos = 0
+        self._ids: Set[int] = set()
+        self.duplicates = 0
+
+    def add(self, item_id: int) -> bool:
+        """Remember `item_id`; False if it was already among the recent IDs."""
+        if item_id in self._ids:
+            self.duplicates += 1
+            return False
+        evicted = self._ring[self._pos]
+        if evicted is not None:
+            self._ids.discard(evicted)
+        self._ring[self._pos] = item_id
+        self._ids.add(item_id)
+        self._pos = (self._pos + 1) % self.capacity
+        return True
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "dedup": {
+                "tracked": len(self._ids),
+                "capacity": self.capacity,
+                "duplicates_suppressed": self.duplicates,
+            }
+        }
+
+
+__all__ = ['RecentIdSet']
@@ -6,16 +6,23 @@ High-level responsibilities:
  3. Run primary actions via ActionRunner.
  4. Handle follow-up escalation actions if any are discovered by the
     escalation context (delegated to the action runner via ctx.record calls).
+ 5. Messages from a channel in raid mode (see `RaidDetector`) carrying a
+    raid fingerprint get the policy's raid actions without scoring; the
+    rest of the channel is scored without LLM adjudication.
 
 This keeps `on_message` event handlers thin. Integration layer supplies
 dependencies (policy, scorer, action runner, DB facade, logging funcs).
 """
 from __future__ import annotations
 
+import asyncio
+import random
 from dataclasses import dataclass, field
-from typing import List, Protocol, Any
+from typing import List, Protocol, Any, Sequence
 import discord
 
+from .load_shedding import ShedTier
+
 try:  # reuse existing logging if available
     from modbot.infrastructure.logging.structured_logging import info as log_info, debug as log_debug, error as log_error
 except Exception:  
@@ -29,15 +36,16 @@ class ToxicityScorerProto(Protocol):
 
 
 class PolicyProto(Protocol):  # structural subset
-    def evaluate_toxicity(self, toxicity: float): ...  # returns (rule, actions)
+    def evaluate_toxicity(self, toxicity: float): ...  # returns (rule, compiled action plans)
 
 
 class ActionRunnerProto(Protocol):
-    async def run(self, message: discord.Message, actions: List[str], toxicity: float, escalation_ctx=None): ...
+    async def run(self, message: discord.Message, actions: Sequence[Any], toxicity: float, escalation_ctx=None): ...  # ActionPlans or strings
 
 
 class ActionDBProto(Protocol):  # facade subset for escalation context
     def log_action(self, *a, **kw): ...
+    def record_and_count(self, log_kwargs: dict, count_action: str, window_minutes: int, prefix: bool = False): ...
     def count_recent(self, target_id: int, action: str, window_minutes: int) -> int: ...
     def count_recent_like(self, target_id: int, action_prefix: str, window_minutes: int) -> int: ...
 
@@ -48,65 +56,147 @@ class EscalationContext:
     message: discord.Message
     toxicity: float
     window_minutes: int
+    policy: Any = None  # snapshot taken when the message started; defaults to bot.policy
+    is_edit: bool = False
+    raid: bool = False  # actions come from the policy's raid section, not a score
     pending_followups: List[str] = field(default_factory=list)
 
-    def record(self, action: str, target_id: int, status: str = 'success', failure_reason: str | None = None):
-        self.bot.db.log_action(
-            getattr(self.message.guild, 'id', None),
-            getattr(self.message.channel, 'id', None),
-            getattr(self.bot.user, 'id', None),
-            action,
-            target_id,
-            f"toxicity={self.toxicity:.2f}",
-            evidence={"message_id": self.message.id, "excerpt": self.message.content[:140]},
+    def __post_init__(self):
+        if self.policy is None:
+            self.policy = getattr(self.bot, 'policy', None)
+
+    async def record(self, action: str, target_id: int, status: str = 'success', failure_reason: str | None = None, evidence: dict | None = None):
+        """Log `action` for `target_id`; returns the action_log row id."""
+        log_kwargs = dict(
+            guild_id=getattr(self.message.guild, 'id', None),
+            channel_id=getattr(self.message.channel, 'id', None),
+            actor_id=getattr(self.bot.user, 'id', None),
+            action=action,
+            target_id=target_id,
+            reason="raid" if self.raid else f"toxicity={self.toxicity:.2f}",
+            evidence={
+                "message_id": self.message.id,
+                "excerpt": self.message.content[:140],
+                "policy_version": getattr(self.policy, 'version', None),
+                "edited": self.is_edit,
+                "raid": self.raid,
+                **(evidence or {}),
+            },
             status=status,
             failure_reason=failure_reason,
         )
-        if status != 'success':
-            return
-        policy = getattr(self.bot, 'policy', None)
-        if not policy or not getattr(policy, 'escalation', None):
-            return
-        from .escalation_service import evaluate_escalation_thresholds
-        followups = evaluate_escalation_thresholds(self.bot.db, policy.escalation, target_id, action, self.window_minutes)
+        policy = self.policy
+        escalation = getattr(policy, 'escalation', None) if policy else None
+        from .escalation_service import evaluate_escalation_thresholds, threshold_count_key
+        from ..infrastructure.persistence.action_repository import COUNTED_STATUSES
+        count_action, prefix = threshold_count_key(action)
+        if status not in COUNTED_STATUSES or not escalation or count_action not in escalation.parsed:
+            return self.bot.db.log_action(**log_kwargs)
+        # Insert + count atomically so a threshold fires once even when
+        # several processes record for the same user at the same time. The
+        # transaction may wait on another process's write lock, so it runs
+        # off the event loop.
+        row_id, count = await asyncio.to_thread(
+            self.bot.db.record_and_count, log_kwargs, count_action, self.window_minutes, prefix=prefix
+        )
+        followups = evaluate_escalation_thresholds(self.bot.db, escalation, target_id, action, self.window_minutes, current_count=count)
         for f in followups:
             log_info(
                 "escalation.threshold_met",
-                base_action=action.split('(')[0].lower(),
+                base_action=count_action,
                 follow_action=f,
                 target_id=target_id,
+                count=count,
             )
             self.pending_followups.append(f)
+        return row_id
 
 
 class ModerationPipeline:
-    def __init__(self, scorer: ToxicityScorerProto, action_runner: ActionRunnerProto, policy: PolicyProto, db: ActionDBProto):
+    def __init__(self, scorer: ToxicityScorerProto, action_runner: ActionRunnerProto, policy: PolicyProto, db: ActionDBProto, shedder=None):
         self.scorer = scorer
         self.action_runner = action_runner
         self.policy = policy
         self.db = db
-
-    async def process_message(self, bot, message: discord.Message):  # noqa: ANN001
-        if message.author.bot:
-            return
-        if not self.policy:
-            return
+        self.shedder = shedder
+
+    async def _score(self, message: discord.Message, tier: ShedTier, policy) -> float | None:
+        """Score per the load-shedding tier; None means the message is not moderated."""
+        if tier >= ShedTier.PREFILTER_ONLY:
+            degradation = getattr(policy, 'degradation', None)
+            if tier == ShedTier.SAMPLING and random.random() >= getattr(degradation, 'sample_rate', 0.0):
+                self.shedder.count("sampled_out")
+                return None
+            prefilter = getattr(self.scorer, 'prefilter_score', None)
+            quick = prefilter(message.content) if prefilter is not None else None
+            if quick is None:
+                self.shedder.count("prefilter_only")
+            return quick
         try:
-            toxicity = await self.scorer.score(message.content)
+            return await self.scorer.score(message.content)
         except Exception as e:  
             log_error("toxicity.error", error=str(e))
-            toxicity = 0.0
-        rule, actions = self.policy.evaluate_toxicity(toxicity)
+            return 0.0
+
+    def _without_llm(self, rule, actions, policy):
+        if not any(plan.name == 'ask_llm' for plan in actions):
+            return actions
+        fallback = getattr(getattr(policy, 'degradation', None), 'fallback_plans', ())
+        out = []
+        for plan in actions:
+            out.extend(fallback if plan.name == 'ask_llm' else (plan,))
+        log_info("moderation.llm_skipped", rule=rule.name, fallback=[str(p) for p in fallback])
+        if self.shedder is not None:
+            self.shedder.count("llm_fallback")
+        return out
+
+    async def _run(self, bot, message: discord.Message, actions, toxicity: float, policy, is_edit: bool = False, raid: bool = False):  # noqa: ANN001
+        window_minutes = getattr(getattr(policy, 'escalation', None), 'window_minutes', 60)
+        esc_ctx = EscalationContext(bot=bot, message=message, toxicity=toxicity, window_minutes=window_minutes, policy=policy, is_edit=is_edit, raid=raid)
+        try:
+            await self.action_runner.run(message, actions, toxicity, esc_ctx)
+            if esc_ctx.pending_followups:
+                log_info("moderation.escalation_followups", count=len(esc_ctx.pending_followups), actions=esc_ctx.pending_followups)
+                await self.action_runner.run(message, esc_ctx.pending_followups, toxicity, esc_ctx)
+        except Exception as e:  
+            log_error("moderation.action_exec_error", error=str(e))
+
+    async def _process_raid(self, bot, message: discord.Message, verdict, policy) -> bool:  # noqa: ANN001
+        """Handle a message from a raiding channel; True when no scoring is needed."""
+        raid = policy.raid
+        if verdict.entered and raid.on_enter_plans:
+            await self._run(bot, message, raid.on_enter_plans, 0.0, policy, raid=True)
+        if not verdict.duplicate:
+            return False
+        log_info("moderation.raid_match", channel_id=getattr(message.channel, 'id', None), actions=[str(a) for a in raid.plans], policy_version=getattr(policy, 'version', None))
+        if raid.plans:
+            await self._run(bot, message, raid.plans, 0.0, policy, raid=True)
+        return True
+
+    async def process_message(self, bot, message: discord.Message, skip_llm: bool = False, is_edit: bool = False, raid=None):  # noqa: ANN001
+        if message.author.bot:
+            return
+        # Snapshot: a hot reload swapping self.policy mid-message must not
+        # mix two policies within one decision.
+        policy = self.policy
+        if not policy:
+            return
+        if raid is not None and await self._process_raid(bot, message, raid, policy):
+            return
+        tier = self.shedder.update() if self.shedder is not None else ShedTier.FULL
+        if skip_llm or raid is not None:
+            tier = max(tier, ShedTier.NO_LLM)
+        toxicity = await self._score(message, tier, policy)
+        if toxicity is None:
+            return
+        rule, actions = policy.evaluate_toxicity(toxicity)
         if not rule:
             log_debug("moderation.no_match", toxicity=round(toxicity,4), excerpt=message.content[:60])
             return
-        log_info("moderation.rule_match", rule=rule.name, toxicity=round(toxicity, 4), actions=actions)
-        window_minutes = getattr(getattr(self.policy, 'escalation', None), 'window_minutes', 60)
-        esc_ctx = EscalationContext(bot=bot, message=message, toxicity=toxicity, window_minutes=window_minutes)
-        await self.action_runner.run(message, actions, toxicity, esc_ctx)
-        if esc_ctx.pending_followups:
-            log_info("moderation.escalation_followups", count=len(esc_ctx.pending_followups), actions=esc_ctx.pending_followups)
-            await self.action_runner.run(message, esc_ctx.pending_followups, toxicity, esc_ctx)
+        if tier >= ShedTier.NO_LLM:
+            actions = self._without_llm(rule, actions, policy)
+        log_info("moderation.rule_match", rule=rule.name, toxicity=round(toxicity, 4), actions=[str(a) for a in actions], policy_version=getattr(policy, 'version', None), edited=is_edit)
+        await self._run(bot, message, actions, toxicity, policy, is_edit=is_edit)
 
 __all__ = [
     'ModerationPipeline', 'EscalationContext'
@@ -0,0 +1,93 @@
+"""Background policy hot reload.
+
+`PolicyReloader` polls the policy file's mtime and, on change (or when
+`/mod_reload` asks), loads, validates and compiles the new policy in a worker
+thread. Only a fully built policy is handed to `apply`, which swaps it in with
+plain attribute assignment, so the event loop never sees a half-loaded policy.
+Messages already in the pipeline keep the snapshot they started with. A
+policy that fails to load is logged and the current one stays active.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Callable, Optional, Tuple
+
+from ..domain.policy.loader import load_policy, POLICY_FILE
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, error as log_error
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_error(*a, **kw): pass
+
+
+class PolicyReloader:
+    def __init__(
+        self,
+        apply: Callable[[Any], None],
+        current: Callable[[], Any],
+        path: str = POLICY_FILE,
+        poll_seconds: float = 5.0,
+    ):
+        self._apply = apply
+        self._current = current
+        self.path = path
+        self.poll_seconds = float(poll_seconds)
+        self._mtime: Optional[float] = self._stat()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.failures = 0
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def start(self) -> None:
+        if self.poll_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch(), name="policy-reload")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            mtime = self._stat()
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                await self.reload(source="watch")
+
+    async def reload(self, source: str = "manual") -> Tuple[bool, str]:
+        """Load and swap in the policy file. Returns (swapped, human-readable outcome)."""
+        async with self._lock:
+            old = self._current()
+            old_version = getattr(old, 'version', None)
+            try:
+                new = await asyncio.to_thread(load_policy, self.path)
+            except Exception as e:  # noqa: BLE001
+                self.failures += 1
+                log_error("policy.reload_failed", source=source, path=self.path, error=str(e))
+                return False, f"Reload failed, keeping policy {old_version}: {e}"
+            if new.version == old_version:
+                return False, f"Policy unchanged ({old_version})"
+            self._apply(new)
+            self.reloads += 1
+            log_info(
+                "policy.reloaded",
+                source=source,
+                path=self.path,
+                old_version=old_version,
+                new_version=new.version,
+                rules=len(new.rules),
+            )
+            return True, f"Policy reloaded: {old_version} -> {new.version} ({len(new.rules)} rules)"
+
+
+__all__ = ['PolicyReloader']
@@ -0,0 +1,186 @@
+"""Channel-level raid detection.
+
+Every guild message is observed (cheaply, before it is queued) into a
+fixed-size ring buffer per channel holding `(timestamp, fingerprint,
+author)`. A channel enters raid mode when, within `window_seconds`:
+
+ - it received at least `max_messages` messages, or
+ - at least `duplicate_authors` distinct authors posted the same
+   fingerprint (normalized text with mentions stripped).
+
+Fingerprints that crossed the duplicate threshold are remembered for the
+rest of the raid; messages carrying them get the policy's raid actions
+directly, without scoring. Other messages in a raiding channel are still
+scored but never go to LLM adjudication. Raid mode ends `cooldown_seconds`
+after the last trigger.
+
+Channels that are not raiding and have seen nothing for `window_seconds`
+are dropped (swept at most once per window), so state stays proportional
+to the channels that are currently active.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+from ..infrastructure.providers.toxicity.cache import content_key
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+
+_MENTION_RE = re.compile(r"<(?:@[!&]?|#)\d+>")
+
+
+def fingerprint(text: str) -> Optional[bytes]:
+    """Content fingerprint that ignores case, spacing and pinged users/roles/channels."""
+    stripped = _MENTION_RE.sub("", text or "")
+    if not stripped.strip():
+        return None  # attachment/sticker-only: counts toward the rate, never a duplicate
+    return content_key(stripped)
+
+
+@dataclass(frozen=True)
+class RaidVerdict:
+    duplicate: bool  # carries a raid fingerprint -> raid actions, no scoring
+    entered: bool = False  # this message switched the channel into raid mode
+
+
+class _ChannelState:
+    __slots__ = ("ring", "raid_until", "raid_fingerprints", "started_at")
+
+    def __init__(self, size: int):
+        self.ring: Deque[Tuple[float, Optional[bytes], int]] = deque(maxlen=size)
+        self.raid_until = 0.0
+        self.raid_fingerprints: Set[bytes] = set()
+        self.started_at = 0.0
+
+
+class RaidDetector:
+    def __init__(self, policy_getter: Callable[[], Any], clock: Callable[[], float] = time.monotonic):
+        self._policy = policy_getter
+        self._clock = clock
+        self._channels: Dict[Hashable, _ChannelState] = {}
+        self._last_sweep = clock()
+        self.raids_started = 0
+        self.duplicates = 0
+        self.raid_messages = 0
+        self.channels_evicted = 0
+
+    def _state(self, channel_id: Hashable, size: int) -> _ChannelState:
+        state = self._channels.get(channel_id)
+        if state is None or state.ring.maxlen != size:
+            # new channel, or buffer_size changed by a policy reload
+            old = state
+            state = self._channels[channel_id] = _ChannelState(size)
+            if old is not None:
+                state.ring.extend(old.ring)
+                state.raid_until, state.started_at = old.raid_until, old.started_at
+                state.raid_fingerprints = old.raid_fingerprints
+        return state
+
+    def observe(self, message) -> Optional[RaidVerdict]:
+        """Record `message`; returns a verdict while its channel is in raid mode."""
+        raid = getattr(self._policy(), 'raid', None)
+        if raid is None or not raid.enabled:
+            return None
+        channel_id = getattr(message.channel, 'id', None)
+        author_id = message.author.id
+        now = self._clock()
+        if now - self._last_sweep >= raid.window_seconds:
+            self._sweep(now, raid.window_seconds)
+        state = self._state(channel_id, raid.buffer_size)
+        fp = fingerprint(message.content)
+        state.ring.append((now, fp, author_id))
+
+        cutoff = now - raid.window_seconds
+        recent = 0
+        authors: Set[int] = set()
+        for ts, other_fp, other_author in reversed(state.ring):
+            if ts < cutoff:
+                break
+            recent += 1
+            if fp is not None and other_fp == fp:
+                authors.add(other_author)
+
+        active = now < state.raid_until
+        if state.raid_until and not active:
+            self._end(channel_id, state)
+        duplicate = fp is not None and len(authors) >= raid.duplicate_authors
+        if duplicate:
+            state.raid_fingerprints.add(fp)
+        triggered = duplicate or recent >= raid.max_messages
+        if triggered:
+            state.raid_until = now + raid.cooldown_seconds
+        if not (active or triggered):
+            return None
+
+        entered = triggered and not active
+        if entered:
+            state.started_at = now
+            self.raids_started += 1
+            log_warning(
+                "raid.started",
+                guild_id=getattr(message.guild, 'id', None),
+                channel_id=channel_id,
+                messages_in_window=recent,
+                duplicate_authors=len(authors),
+            )
+        self.raid_messages += 1
+        is_dup = fp is not None and fp in state.raid_fingerprints
+        if is_dup:
+            self.duplicates += 1
+        return RaidVerdict(duplicate=is_dup, entered=entered)
+
+    def _end(self, channel_id, state: _ChannelState) -> None:
+        log_info(
+            "raid.ended",
+            channel_id=channel_id,
+            duration_s=round(state.raid_until - state.started_at, 1),
+            fingerprints=len(state.raid_fingerprints),
+        )
+        state.raid_until = 0.0
+        state.raid_fingerprints = set()
+
+    def _sweep(self, now: float, window_seconds: float) -> None:
+        """Drop channels outside raid mode whose newest message left the window."""
+        self._last_sweep = now
+        idle = []
+        for channel_id, state in self._channels.items():
+            if now < state.raid_until:
+                continue
+            if state.ring and state.ring[-1][0] >= now - window_seconds:
+                continue
+            if state.raid_until:
+                self._end(channel_id, state)
+            idle.append(channel_id)
+        for channel_id in idle:
+            del self._channels[channel_id]
+        self.channels_evicted += len(idle)
+
+    def forget_channel(self, channel_id: Hashable) -> None:
+        self._channels.pop(channel_id, None)
+
+    def active_channels(self) -> int:
+        now = self._clock()
+        return sum(1 for s in self._channels.values() if now < s.raid_until)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "raid": {
+                "channels_tracked": len(self._channels),
+                "active_raids": self.active_channels(),
+                "raids_started": self.raids_started,
+                "raid_messages": self.raid_messages,
+                "duplicates": self.duplicates,
+                "channels_evicted": self.channels_evicted,
+            }
+        }
+
+
+__all__ = ['RaidDetector', 'RaidVerdict', 'fingerprint']
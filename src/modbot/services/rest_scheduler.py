@@ -0,0 +1,140 @@
+"""Priority scheduling for outbound Discord REST calls.
+
+discord.py already waits out 429s per rate-limit bucket, but it serves
+callers in arrival order: during an incident a backlog of DMs and
+escalation posts can sit ahead of the deletes that actually remove toxic
+content. Moderation side effects therefore take a slot from this
+scheduler first:
+
+ - at most `max_concurrent` calls are in flight overall, and at most
+   `route_limit` per route (e.g. one channel's deletes, one guild's member
+   edits), so a single hot bucket cannot hold every slot;
+ - when a slot frees up it goes to the highest-priority waiter whose route
+   has room (DELETE, then TIMEOUT, ESCALATE, DM), FIFO within a class.
+
+Queue time is tracked per class for `/mod_status`.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, Optional, Tuple
+
+try:
+    from modbot.infrastructure.logging.structured_logging import warning as log_warning
+except Exception:
+    def log_warning(*a, **kw): pass
+
+
+class RestPriority(IntEnum):
+    DELETE = 0
+    TIMEOUT = 1
+    ESCALATE = 2
+    DM = 3
+
+
+class _ClassStats:
+    __slots__ = ("granted", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.granted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class RestScheduler:
+    SLOW_WAIT_SECONDS = 5.0
+
+    def __init__(self, max_concurrent: int = 8, route_limit: int = 2):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.route_limit = max(1, int(route_limit))
+        self._in_flight = 0
+        self._route_in_flight: Dict[Hashable, int] = {}
+        self._waiting: Dict[RestPriority, Deque[Tuple[Hashable, float, asyncio.Future]]] = {p: deque() for p in RestPriority}
+        self._stats: Dict[RestPriority, _ClassStats] = {p: _ClassStats() for p in RestPriority}
+
+    def _has_room(self, route: Hashable) -> bool:
+        return self._route_in_flight.get(route, 0) < self.route_limit
+
+    def _grant(self, priority: RestPriority, route: Hashable, queued_at: float) -> None:
+        self._in_flight += 1
+        self._route_in_flight[route] = self._route_in_flight.get(route, 0) + 1
+        waited = time.monotonic() - queued_at
+        st = self._stats[priority]
+        st.granted += 1
+        st.wait_total += waited
+        if waited > st.wait_max:
+            st.wait_max = waited
+        if waited > self.SLOW_WAIT_SECONDS:
+            log_warning("rest.slow_slot", priority=priority.name, route=str(route), waited_s=round(waited, 2))
+
+    def _dispatch(self) -> None:
+        for priority in RestPriority:
+            queue = self._waiting[priority]
+            if not queue:
+                continue
+            kept: Deque[Tuple[Hashable, float, asyncio.Future]] = deque()
+            while queue:
+                route, queued_at, fut = queue.popleft()
+                if fut.done():  # waiter was cancelled
+                    continue
+                if self._in_flight < self.max_concurrent and self._has_room(route):
+                    self._grant(priority, route, queued_at)
+                    fut.set_result(None)
+                else:
+                    kept.append((route, queued_at, fut))
+            self._waiting[priority] = kept
+
+    def _release(self, route: Hashable) -> None:
+        self._in_flight -= 1
+        left = self._route_in_flight[route] - 1
+        if left:
+            self._route_in_flight[route] = left
+        else:
+            del self._route_in_flight[route]
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: RestPriority, route: Hashable) -> AsyncIterator[None]:
+        """Hold one REST slot for the duration of the block."""
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting[priority].append((route, time.monotonic(), fut))
+        self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._release(route)  # granted just as we were cancelled
+            raise
+        try:
+            yield
+        finally:
+            self._release(route)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Any] = {
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "route_limit": self.route_limit,
+        }
+        for priority in RestPriority:
+            st = self._stats[priority]
+            name = priority.name.lower()
+            out[f"{name}_queued"] = sum(1 for _, _, f in self._waiting[priority] if not f.done())
+            out[f"{name}_granted"] = st.granted
+            out[f"{name}_avg_wait_ms"] = round(st.wait_total / st.granted * 1000, 1) if st.granted else 0.0
+            out[f"{name}_max_wait_ms"] = round(st.wait_max * 1000, 1)
+        return {"rest": out}
+
+
+def rest_slot(scheduler: Optional[RestScheduler], priority: RestPriority, route: Hashable):
+    """`scheduler.slot(...)`, or a no-op context when there is no scheduler."""
+    if scheduler is None:
+        return contextlib.nullcontext()
+    return scheduler.slot(priority, route)
+
+
+__all__ = ['RestScheduler', 'RestPriority', 'rest_slot']
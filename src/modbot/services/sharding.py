@@ -0,0 +1,99 @@
+"""Per-shard moderation lanes.
+
+Each gateway shard gets its own lane: a work queue with its own workers,
+a load shedder and a pipeline (scorer, action runner and DB are shared).
+A reconnecting or flooded shard therefore only backs up its own queue, and
+depth / latency are reported per shard. Without sharding there is a single
+lane and the router is a thin pass-through.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info
+except Exception:
+    def log_info(*a, **kw): pass
+
+
+def parse_shard_ids(spec: str) -> List[int]:
+    """Parse '0-3,8' into [0, 1, 2, 3, 8]."""
+    ids: List[int] = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition('-')
+        if sep:
+            start, end = int(lo), int(hi)
+            if end < start:
+                raise ValueError(f"Invalid shard range '{part}'")
+            ids.extend(range(start, end + 1))
+        else:
+            ids.append(int(part))
+    return sorted(set(ids))
+
+
+@dataclass
+class ShardLane:
+    shard_id: int
+    queue: Any
+    shedder: Any
+    pipeline: Any
+
+
+class ShardedWorkQueue:
+    def __init__(self, make_lane: Callable[[int], ShardLane], sharded: bool = False):
+        self._make_lane = make_lane
+        self.sharded = sharded
+        self.lanes: Dict[int, ShardLane] = {}
+        self._started = False
+
+    def lane(self, shard_id: int) -> ShardLane:
+        lane = self.lanes.get(shard_id)
+        if lane is None:
+            lane = self.lanes[shard_id] = self._make_lane(shard_id)
+            if self._started:
+                lane.queue.start()
+            log_info("shard.lane_created", shard_id=shard_id)
+        return lane
+
+    def lane_for(self, message) -> ShardLane:
+        if not self.sharded:
+            return self.lane(0)
+        return self.lane(getattr(message.guild, 'shard_id', None) or 0)
+
+    def put(self, message, is_edit: bool = False, raid=None) -> bool:
+        return self.lane_for(message).queue.put(message, is_edit=is_edit, raid=raid)
+
+    def start(self) -> None:
+        self._started = True
+        if not self.sharded:
+            self.lane(0)
+        for lane in self.lanes.values():
+            lane.queue.start()
+
+    async def stop(self) -> None:
+        for lane in self.lanes.values():
+            await lane.queue.stop()
+
+    @property
+    def depth(self) -> int:
+        return sum(lane.queue.depth for lane in self.lanes.values())
+
+    def stats(self, latencies: Optional[Dict[int, float]] = None) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for sid in sorted(self.lanes):
+            lane = self.lanes[sid]
+            parts = {**lane.queue.stats(), **lane.shedder.stats()}
+            if not self.sharded:
+                out.update(parts)
+                continue
+            if latencies and sid in latencies:
+                parts["queue"] = {**parts["queue"], "gateway_latency_ms": round(latencies[sid] * 1000, 1)}
+            out.update({f"shard{sid}.{key}": values for key, values in parts.items()})
+        return out
+
+
+__all__ = ['ShardLane', 'ShardedWorkQueue', 'parse_shard_ids']
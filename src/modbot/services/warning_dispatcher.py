@@ -0,0 +1,221 @@
+"""Coalescing sender for warning DMs.
+
+`warn_user` hands its DM to the dispatcher and returns; the DM goes out
+`window_seconds` later together with any other warnings the same user
+collected meanwhile, as one message. Because of that delay, a small cap
+on concurrent sends and the lowest `RestScheduler` priority, DMs never
+compete with the deletes and timeouts issued for the same messages.
+
+DM channels are cached per user, and users whose DMs are closed (Discord
+error 50007) are remembered for `closed_ttl_seconds`, so their warnings go
+straight to the channel-mention fallback without a failing DM call.
+
+`submit` returns a `Queued` result: the warning is logged as 'queued' and
+`on_result(action_log_id, status, failure_reason)` moves the row to
+'success' once the DM (or the channel fallback) went out, or to 'failure'
+when neither did.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from ..domain.moderation.interfaces import Queued
+from .rest_scheduler import RestPriority, rest_slot
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning, error as log_error
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+    def log_error(*a, **kw): pass
+
+DM_CLOSED_CODE = 50007  # "Cannot send messages to this user"
+DM_MAX_LEN = 2000
+
+
+class _Ticket:
+    """Links one submitted warning to its action_log row; either side may come first."""
+    __slots__ = ("log_id", "outcome", "_on_result")
+
+    def __init__(self, on_result):
+        self.log_id: Optional[int] = None
+        self.outcome: Optional[Tuple[bool, Optional[str]]] = None
+        self._on_result = on_result
+
+    def link(self, log_id: int) -> None:
+        self.log_id = log_id
+        if self.outcome is not None:
+            self._report()
+
+    def resolve(self, ok: bool, failure_reason: Optional[str] = None) -> None:
+        if self.outcome is not None:
+            return
+        self.outcome = (ok, failure_reason)
+        if self.log_id is not None:
+            self._report()
+
+    def _report(self) -> None:
+        if self._on_result is None:
+            return
+        ok, failure_reason = self.outcome  # type: ignore[misc]
+        try:
+            self._on_result(self.log_id, 'success' if ok else 'failure', failure_reason)
+        except Exception as e:  # noqa: BLE001
+            log_error("action.warn_user.status_update_failed", action_log_id=self.log_id, error=str(e))
+
+
+_Entry = Tuple[Any, str, str, _Ticket]  # (channel, dm_text, fallback_text, ticket)
+
+
+class _PendingWarnings:
+    __slots__ = ("user", "entries", "timer")
+
+    def __init__(self, user):
+        self.user = user
+        self.entries: List[_Entry] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class WarningDispatcher:
+    def __init__(
+        self,
+        window_seconds: float = 3.0,
+        max_concurrent: int = 2,
+        closed_ttl_seconds: float = 6 * 3600,
+        max_cached: int = 5000,
+        scheduler=None,
+        on_result: Optional[Callable[[int, str, Optional[str]], None]] = None,
+    ):
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.closed_ttl_seconds = float(closed_ttl_seconds)
+        self.max_cached = max(1, int(max_cached))
+        self.scheduler = scheduler
+        self.on_result = on_result
+        self._sem = asyncio.Semaphore(max(1, int(max_concurrent)))
+        self._pending: Dict[int, _PendingWarnings] = {}
+        self._dm_channels: "OrderedDict[int, Any]" = OrderedDict()
+        self._dm_closed: "OrderedDict[int, float]" = OrderedDict()  # user_id -> expiry (monotonic)
+        self._tasks: set = set()
+        self.counts = {"queued": 0, "sent": 0, "coalesced": 0, "fallbacks": 0, "skipped_closed": 0, "failed": 0}
+
+    def submit(self, user, channel, dm_text: str, fallback_text: str) -> Queued:
+        """Queue a warning DM for `user`; `fallback_text` is posted in `channel` if the DM fails."""
+        self.counts["queued"] += 1
+        pending = self._pending.get(user.id)
+        if pending is None:
+            pending = self._pending[user.id] = _PendingWarnings(user)
+            pending.timer = asyncio.get_running_loop().call_later(self.window_seconds, self._flush, user.id)
+        else:
+            self.counts["coalesced"] += 1
+        ticket = _Ticket(self.on_result)
+        pending.entries.append((channel, dm_text, fallback_text, ticket))
+        return Queued(ticket.link)
+
+    def _flush(self, user_id: int) -> None:
+        pending = self._pending.pop(user_id, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._deliver(pending.user, pending.entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _compose(entries: List[_Entry]) -> str:
+        if len(entries) == 1:
+            return entries[0][1][:DM_MAX_LEN]
+        parts = [f"You received {len(entries)} moderation warnings:"]
+        parts.extend(text for _, text, _, _ in entries)
+        return "\n\n".join(parts)[:DM_MAX_LEN]
+
+    def _is_dm_closed(self, user_id: int) -> bool:
+        expiry = self._dm_closed.get(user_id)
+        if expiry is None:
+            return False
+        if expiry <= time.monotonic():
+            del self._dm_closed[user_id]
+            return False
+        return True
+
+    def _remember(self, cache: OrderedDict, key: int, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_cached:
+            cache.popitem(last=False)
+
+    async def _dm_channel(self, user):
+        channel = self._dm_channels.get(user.id) or getattr(user, 'dm_channel', None)
+        if channel is None:
+            async with rest_slot(self.scheduler, RestPriority.DM, ('dm', user.id)):
+                channel = await user.create_dm()
+        self._remember(self._dm_channels, user.id, channel)
+        return channel
+
+    async def _deliver(self, user, entries: List[_Entry]) -> None:
+        async with self._sem:
+            if self._is_dm_closed(user.id):
+                self.counts["skipped_closed"] += 1
+                await self._fallback(user, entries)
+                return
+            try:
+                channel = await self._dm_channel(user)
+                async with rest_slot(self.scheduler, RestPriority.DM, ('dm', user.id)):
+                    await channel.send(self._compose(entries))
+                self.counts["sent"] += 1
+                log_info("action.warn_user.dm_sent", user_id=user.id, warnings=len(entries))
+                for *_, ticket in entries:
+                    ticket.resolve(True)
+            except discord.Forbidden as e:
+                if getattr(e, 'code', None) == DM_CLOSED_CODE:
+                    self._remember(self._dm_closed, user.id, time.monotonic() + self.closed_ttl_seconds)
+                    self._dm_channels.pop(user.id, None)
+                log_warning("action.warn_user.dm_failed", user_id=user.id, code=getattr(e, 'code', None))
+                await self._fallback(user, entries)
+            except Exception as e:  # noqa: BLE001
+                log_warning("action.warn_user.dm_failed", user_id=user.id, error=str(e))
+                await self._fallback(user, entries)
+
+    async def _fallback(self, user, entries: List[_Entry]) -> None:
+        # one mention per channel, using its latest warning
+        by_channel: Dict[int, List[_Entry]] = {}
+        for entry in entries:
+            by_channel.setdefault(getattr(entry[0], 'id', id(entry[0])), []).append(entry)
+        for group in by_channel.values():
+            channel, _, text, _ = group[-1]
+            try:
+                async with rest_slot(self.scheduler, RestPriority.DM, ('channel', getattr(channel, 'id', None))):
+                    await channel.send(text)
+                self.counts["fallbacks"] += 1
+                outcome: Tuple[bool, Optional[str]] = (True, None)
+            except Exception as e:  # noqa: BLE001
+                self.counts["failed"] += 1
+                log_error("action.warn_user.channel_notify_failed", user_id=user.id, error=str(e))
+                outcome = (False, 'warn_undelivered')
+            for *_, ticket in group:
+                ticket.resolve(*outcome)
+
+    async def aclose(self) -> None:
+        """Deliver everything still waiting for its window."""
+        for user_id in list(self._pending):
+            self._flush(user_id)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "warn_dms": {
+                **self.counts,
+                "pending_users": len(self._pending),
+                "dm_channels_cached": len(self._dm_channels),
+                "dm_closed_known": len(self._dm_closed),
+            }
+        }
+
+
+__all__ = ['WarningDispatcher', 'DM_CLOSED_CODE']
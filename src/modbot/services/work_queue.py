@@ -0,0 +1,248 @@
+"""Bounded, fair moderation work queue.
+
+`on_message` only enqueues; a fixed pool of worker tasks drains the queue
+and runs the moderation pipeline. Items are served round-robin across
+guilds and, within a guild, across channels, so a flooded channel only
+delays itself.
+
+Overflow policies when `capacity` is reached:
+ - `drop_oldest`: evict the oldest item of the incoming message's channel
+   (or of the busiest channel if that one is empty) and admit the new one.
+ - `drop_newest`: reject the incoming message.
+ - `skip_llm`: keep admitting up to 2x capacity but mark overflow items so
+   the pipeline skips LLM adjudication for them; past that, `drop_oldest`.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+try:
+    from modbot.infrastructure.logging.structured_logging import info as log_info, warning as log_warning, error as log_error
+except Exception:
+    def log_info(*a, **kw): pass
+    def log_warning(*a, **kw): pass
+    def log_error(*a, **kw): pass
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "skip_llm")
+
+
+@dataclass
+class WorkItem:
+    message: Any
+    enqueued_at: float
+    skip_llm: bool = False
+    is_edit: bool = False
+    raid: Any = None  # RaidVerdict while the channel is in raid mode
+
+
+class _GuildLane:
+    __slots__ = ("channels", "ready")
+
+    def __init__(self):
+        self.channels: Dict[Hashable, Deque[WorkItem]] = {}
+        self.ready: Deque[Hashable] = deque()
+
+
+class ModerationWorkQueue:
+    def __init__(
+        self,
+        handler: Callable[[WorkItem], Awaitable[None]],
+        workers: int = 4,
+        capacity: int = 1000,
+        overflow: str = "drop_oldest",
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got '{overflow}'")
+        self._handler = handler
+        self.workers = max(1, int(workers))
+        self.capacity = max(1, int(capacity))
+        self.overflow = overflow
+        self._lanes: Dict[Hashable, _GuildLane] = {}
+        self._ready_guilds: Deque[Hashable] = deque()
+        self._size = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        # metrics
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped: Dict[str, int] = {"drop_oldest": 0, "drop_newest": 0}
+        self.skip_llm_marked = 0
+        self.max_depth = 0
+        self.dequeued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_ewma = 0.0  # recent queueing delay, seconds
+        self.busy = 0
+
+    # -- lifecycle ---------------------------------------------------------
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        if self._size:
+            self._wakeup.set()
+        self._tasks = [asyncio.create_task(self._worker(i), name=f"modqueue-{i}") for i in range(self.workers)]
+        log_info("queue.started", workers=self.workers, capacity=self.capacity, overflow=self.overflow)
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # -- producer side -----------------------------------------------------
+    @staticmethod
+    def _keys(message) -> tuple:
+        return getattr(message.guild, 'id', None), getattr(message.channel, 'id', None)
+
+    def put(self, message, is_edit: bool = False, raid=None) -> bool:
+        """Enqueue a message; returns False if it was dropped."""
+        guild_id, channel_id = self._keys(message)
+        skip_llm = False
+        if self._size >= self.capacity:
+            if self.overflow == "drop_newest":
+                self._record_drop("drop_newest", guild_id, channel_id)
+                return False
+            if self.overflow == "skip_llm" and self._size < self.capacity * 2:
+                skip_llm = True
+                self.skip_llm_marked += 1
+            else:
+                self._evict_oldest(guild_id, channel_id)
+        item = WorkItem(message=message, enqueued_at=time.monotonic(), skip_llm=skip_llm, is_edit=is_edit, raid=raid)
+        lane = self._lanes.get(guild_id)
+        if lane is None:
+            lane = self._lanes[guild_id] = _GuildLane()
+            self._ready_guilds.append(guild_id)
+        q = lane.channels.get(channel_id)
+        if q is None:
+            q = lane.channels[channel_id] = deque()
+            lane.ready.append(channel_id)
+        q.append(item)
+        self._size += 1
+        self.enqueued += 1
+        if self._size > self.max_depth:
+            self.max_depth = self._size
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _evict_oldest(self, guild_id, channel_id) -> None:
+        lane = self._lanes.get(guild_id)
+        q = lane.channels.get(channel_id) if lane else None
+        if not q:
+            # incoming channel is quiet: take from whichever channel is busiest
+            best = None
+            for g, l in self._lanes.items():
+                for c, cq in l.channels.items():
+                    if best is None or len(cq) > len(best[2]):
+                        best = (g, c, cq)
+            if best is None:
+                return
+            guild_id, channel_id, q = best
+        q.popleft()
+        self._size -= 1
+        if not q:
+            self._discard_channel(guild_id, channel_id)
+        self._record_drop("drop_oldest", guild_id, channel_id)
+
+    def _discard_channel(self, guild_id, channel_id) -> None:
+        lane = self._lanes[guild_id]
+        del lane.channels[channel_id]
+        try:
+            lane.ready.remove(channel_id)
+        except ValueError:
+            pass
+        if not lane.channels:
+            del self._lanes[guild_id]
+            try:
+                self._ready_guilds.remove(guild_id)
+            except ValueError:
+                pass
+
+    def _record_drop(self, reason: str, guild_id, channel_id) -> None:
+        self.dropped[reason] += 1
+        total = sum(self.dropped.values())
+        if total == 1 or total % 100 == 0:  # don't flood logs during a raid
+            log_warning("queue.overflow", reason=reason, guild_id=guild_id, channel_id=channel_id, dropped_total=total)
+
+    # -- consumer side -----------------------------------------------------
+    def _pop(self) -> Optional[WorkItem]:
+        if not self._ready_guilds:
+            return None
+        guild_id = self._ready_guilds.popleft()
+        lane = self._lanes[guild_id]
+        channel_id = lane.ready.popleft()
+        q = lane.channels[channel_id]
+        item = q.popleft()
+        self._size -= 1
+        if q:
+            lane.ready.append(channel_id)
+        else:
+            del lane.channels[channel_id]
+        if lane.ready:
+            self._ready_guilds.append(guild_id)
+        else:
+            del self._lanes[guild_id]
+        return item
+
+    async def _worker(self, idx: int) -> None:
+        assert self._wakeup is not None
+        while True:
+            item = self._pop()
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            waited = time.monotonic() - item.enqueued_at
+            self.dequeued += 1
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+            self.wait_ewma += 0.2 * (waited - self.wait_ewma)
+            self.busy += 1
+            try:
+                await self._handler(item)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                self.failed += 1
+                log_error("queue.handler_error", worker=idx, error=str(e))
+            finally:
+                self.busy -= 1
+
+    @property
+    def depth(self) -> int:
+        return self._size
+
+    @property
+    def recent_wait(self) -> float:
+        """Smoothed queueing delay of recently dequeued items (0 when idle)."""
+        return self.wait_ewma if self._size else 0.0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "queue": {
+                "depth": self._size,
+                "capacity": self.capacity,
+                "max_depth": self.max_depth,
+                "workers": self.workers,
+                "busy": self.busy,
+                "enqueued": self.enqueued,
+                "processed": self.processed,
+                "failed": self.failed,
+                "dropped_oldest": self.dropped["drop_oldest"],
+                "dropped_newest": self.dropped["drop_newest"],
+                "skip_llm_marked": self.skip_llm_marked,
+                "avg_wait_ms": round(self.wait_total / self.dequeued * 1000, 1) if self.dequeued else 0.0,
+                "max_wait_ms": round(self.wait_max * 1000, 1),
+            }
+        }
+
+
+__all__ = ['ModerationWorkQueue', 'WorkItem', 'OVERFLOW_POLICIES']
@@ -1,18 +1,103 @@
 """Channel / guild related helpers split from utils.py."""
 from __future__ import annotations
-from typing import Optional
+from typing import Dict, Iterable, Optional
 import discord
 
 from .format_utils import truncate_for_discord  # noqa: F401 (re-export convenience if desired)
 
+
+class _GuildNames:
+    __slots__ = ("channels", "roles")
+
+    def __init__(self, guild):
+        self.channels: Dict[str, discord.TextChannel] = {}
+        self.roles: Dict[str, discord.Role] = {}
+        for ch in getattr(guild, 'channels', []):
+            if isinstance(ch, discord.TextChannel):
+                self.channels.setdefault(ch.name.lower(), ch)
+        for role in getattr(guild, 'roles', []):
+            self.roles.setdefault(role.name.lower(), role)
+
+
+def _drop(mapping: Dict[str, object], obj, candidates: Iterable) -> None:
+    """Remove `obj` from its name slot, promoting another object with the same name."""
+    for name, current in list(mapping.items()):
+        if current.id == obj.id:
+            del mapping[name]
+            for other in candidates:
+                if other.id != obj.id and other.name.lower() == name:
+                    mapping[name] = other
+                    break
+            return
+
+
+class GuildNameIndex:
+    """Per-guild lowercase name -> text channel / role maps.
+
+    Built lazily per guild (or eagerly on ready) and patched by channel and
+    role create/update/delete events, so lookups are a dict hit instead of a
+    scan over every channel or role.
+    """
+    def __init__(self):
+        self._guilds: Dict[int, _GuildNames] = {}
+
+    def _get(self, guild) -> _GuildNames:
+        entry = self._guilds.get(guild.id)
+        if entry is None:
+            entry = self._guilds[guild.id] = _GuildNames(guild)
+        return entry
+
+    def build(self, guild) -> None:
+        self._guilds[guild.id] = _GuildNames(guild)
+
+    def forget(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+    def channel(self, guild, name: str) -> Optional[discord.TextChannel]:
+        return self._get(guild).channels.get(name.lower())
+
+    def role(self, guild, name: str) -> Optional[discord.Role]:
+        return self._get(guild).roles.get(name.lower())
+
+    # -- incremental updates (only for guilds already indexed) -------------
+    def channel_created(self, channel) -> None:
+        entry = self._guilds.get(channel.guild.id)
+        if entry is not None and isinstance(channel, discord.TextChannel):
+            entry.channels.setdefault(channel.name.lower(), channel)
+
+    def channel_deleted(self, channel) -> None:
+        entry = self._guilds.get(channel.guild.id)
+        if entry is not None and isinstance(channel, discord.TextChannel):
+            _drop(entry.channels, channel, getattr(channel.guild, 'text_channels', []))
+
+    def channel_updated(self, before, after) -> None:
+        if before.name != after.name or type(before) is not type(after):
+            self.channel_deleted(before)
+            self.channel_created(after)
+
+    def role_created(self, role) -> None:
+        entry = self._guilds.get(role.guild.id)
+        if entry is not None:
+            entry.roles.setdefault(role.name.lower(), role)
+
+    def role_deleted(self, role) -> None:
+        entry = self._guilds.get(role.guild.id)
+        if entry is not None:
+            _drop(entry.roles, role, getattr(role.guild, 'roles', []))
+
+    def role_updated(self, before, after) -> None:
+        if before.name != after.name:
+            self.role_deleted(before)
+            self.role_created(after)
+
+
+name_index = GuildNameIndex()
+
+
 def find_text_channel(guild: discord.Guild, name: str | None) -> Optional[discord.TextChannel]:
-    if not name:
+    if not name or guild is None:
         return None
-    name_l = name.lower()
-    for ch in getattr(guild, 'channels', []):
-        if isinstance(ch, discord.TextChannel) and ch.name.lower() == name_l:
-            return ch
-    return None
+    return name_index.channel(guild, name)
 
 def resolve_escalation_target(guild: discord.Guild, config=None, fallback_channel: str | None = None):
     ch_name = getattr(config, 'mod_alert_channel_name', None) or fallback_channel
@@ -20,10 +105,9 @@ def resolve_escalation_target(guild: discord.Guild, config=None, fallback_channe
     channel = find_text_channel(guild, ch_name) if ch_name else None
     role_mention = ""
     if role_name and channel:
-        for role in getattr(guild, 'roles', []):
-            if role.name.lower() == role_name.lower():
-                role_mention = role.mention + " "
-                break
+        role = name_index.role(guild, role_name)
+        if role is not None:
+            role_mention = role.mention + " "
     return channel, role_mention
 
-__all__ = ["find_text_channel", "resolve_escalation_target"]
+__all__ = ["find_text_channel", "resolve_escalation_target", "GuildNameIndex", "name_index"]
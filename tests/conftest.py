@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# db_core resolves SQLITE_PATH (and creates its directory) at import time;
+# point it somewhere disposable before any test imports modbot.
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(prefix="modbot-tests-"), "mod.db"))
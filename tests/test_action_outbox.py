@@ -0,0 +1,152 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import discord
+
+from modbot.infrastructure.persistence.db_core import ActionDB
+from modbot.services.action_outbox import ActionOutbox
+from modbot.services.rest_scheduler import RestPriority
+
+
+class _Response:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "test"
+
+
+class FakeClient:
+    def __init__(self, timeout_failures=0, send_status=None, stall_seconds=0.0):
+        self.timeout_failures = timeout_failures
+        self.stall_seconds = stall_seconds
+        self.send_status = send_status
+        self.timeouts = []
+        self.sent = []
+        self.user = SimpleNamespace(id=1)
+        self.http = self
+
+    async def edit_member(self, guild_id, user_id, reason=None, **fields):
+        if self.stall_seconds:
+            stall, self.stall_seconds = self.stall_seconds, 0.0
+            await asyncio.sleep(stall)  # e.g. stuck behind a long 429 wait
+        if self.timeout_failures:
+            self.timeout_failures -= 1
+            raise discord.HTTPException(_Response(503), "unavailable")
+        self.timeouts.append((guild_id, user_id))
+
+    def get_partial_messageable(self, channel_id):
+        client = self
+
+        class _Channel:
+            async def send(self, content):
+                if client.send_status is not None:
+                    raise discord.HTTPException(_Response(client.send_status), "rejected")
+                client.sent.append((channel_id, content))
+
+        return _Channel()
+
+
+def _outbox(tmp_path, client, **kw):
+    db = ActionDB(str(tmp_path / "mod.db"))
+    return db, ActionOutbox(db, client, base_backoff=0.01, poll_seconds=0.02, **kw)
+
+
+async def _drain(outbox, seconds=0.3):
+    outbox.start()
+    await asyncio.sleep(seconds)
+    await outbox.stop()
+
+
+def _until():
+    return discord.utils.utcnow() + timedelta(minutes=10)
+
+
+def test_transient_failures_are_retried_until_delivered(tmp_path):
+    client = FakeClient(timeout_failures=2)
+    db, outbox = _outbox(tmp_path, client)
+
+    async def run():
+        outbox.enqueue_timeout("timeout:1:a:10", 10, 77, _until(), "r", {"action": "timeout_member(10)", "target_id": 77})
+        await _drain(outbox)
+
+    asyncio.run(run())
+    assert client.timeouts == [(10, 77)]
+    assert outbox.counts["retried"] == 2 and outbox.counts["delivered"] == 1
+    assert db.outbox.counts() == {"done": 1}
+
+
+def test_duplicate_keys_are_enqueued_once(tmp_path):
+    client = FakeClient()
+    db, outbox = _outbox(tmp_path, client)
+
+    async def run():
+        first = outbox.enqueue_send("escalate:1:a:mods", 30, "hi", RestPriority.ESCALATE, {})
+        second = outbox.enqueue_send("escalate:1:a:mods", 30, "hi", RestPriority.ESCALATE, {})
+        await _drain(outbox)
+        return first, second
+
+    (first_id, created), (second_id, created_again) = asyncio.run(run())
+    assert created and not created_again and first_id == second_id
+    assert client.sent == [(30, "hi")]
+    assert outbox.counts["duplicates"] == 1
+
+
+def test_permanent_failure_marks_linked_action_failed(tmp_path):
+    client = FakeClient(send_status=403)
+    db, outbox = _outbox(tmp_path, client)
+
+    async def run():
+        outbox_id, _ = outbox.enqueue_send("escalate:2:a:mods", 30, "hi", RestPriority.ESCALATE, {})
+        log_id = db.log_action(1, 2, 3, "escalate(mods)", 77, "test", status="queued")
+        outbox.link(outbox_id, log_id)
+        await _drain(outbox)
+
+    asyncio.run(run())
+    assert db.outbox.counts() == {"dead": 1}
+    [row] = db.fetch_actions(77)
+    assert row["status"] == "failure" and row["failure_reason"].startswith("403")
+
+
+def test_link_after_delivery_applies_the_final_status(tmp_path):
+    client = FakeClient()
+    db, outbox = _outbox(tmp_path, client)
+
+    async def run():
+        outbox_id, _ = outbox.enqueue_send("escalate:3:a:mods", 30, "hi", RestPriority.ESCALATE, {})
+        await _drain(outbox)
+        first = db.log_action(1, 2, 3, "escalate(mods)", 77, "test", status="queued")
+        outbox.link(outbox_id, first)
+        # a second evaluation of the same message and content hits the same key
+        second = db.log_action(1, 2, 3, "escalate(mods)", 77, "test", status="queued")
+        outbox.link(outbox_id, second)
+
+    asyncio.run(run())
+    statuses = sorted((r["id"], r["status"], r["failure_reason"]) for r in db.fetch_actions(77))
+    assert [s[1:] for s in statuses] == [("success", None), ("failure", "duplicate")]
+
+
+def test_expired_timeouts_are_not_applied(tmp_path):
+    client = FakeClient()
+    db, outbox = _outbox(tmp_path, client)
+
+    async def run():
+        past = discord.utils.utcnow() - timedelta(minutes=1)
+        outbox.enqueue_timeout("timeout:4:a:1", 10, 77, past, "r", {})
+        await _drain(outbox)
+
+    asyncio.run(run())
+    assert client.timeouts == []
+    assert db.outbox.counts() == {"done": 1}
+
+
+def test_stalled_delivery_is_abandoned_before_its_lease_expires(tmp_path):
+    client = FakeClient(stall_seconds=5.0)
+    db, outbox = _outbox(tmp_path, client, lease_seconds=0.1)
+
+    async def run():
+        outbox.enqueue_timeout("timeout:5:a:10", 10, 77, _until(), "r", {})
+        await _drain(outbox, 0.5)
+
+    asyncio.run(run())
+    assert client.timeouts == [(10, 77)]  # delivered once, by the retry
+    assert outbox.counts["retried"] == 1 and outbox.counts["delivered"] == 1
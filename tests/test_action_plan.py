@@ -0,0 +1,24 @@
+import pytest
+
+from modbot.domain.moderation.actions.plan import ActionCompileError, compile_action
+from modbot.domain.moderation.actions.runner import ActionRunner
+
+ActionRunner()  # registers the built-in handlers
+
+
+@pytest.mark.parametrize("source, label", [
+    ("warn_user", "warn_user"),
+    ("warn_user('spam')", "warn_user"),
+    ("timeout_member", "timeout_member(30)"),
+    ("timeout_member(10, reason='x')", "timeout_member(10)"),
+    ("escalate(security_team, 'why')", "escalate(security_team)"),
+    ("delete_message('off topic')", "delete_message"),
+])
+def test_labels_only_carry_counter_defining_params(source, label):
+    assert compile_action(source).label == label
+
+
+@pytest.mark.parametrize("source", ["nope", "timeout_member(-1)", "warn_user(**x)", "1 + 1"])
+def test_bad_actions_fail_at_compile_time(source):
+    with pytest.raises(ActionCompileError):
+        compile_action(source)
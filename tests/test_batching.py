@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from modbot.infrastructure.providers.toxicity.batching import MicroBatcher
+
+
+class BatchFn:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [item * 10 for item in items]
+
+
+def test_concurrent_submits_share_one_batch_in_order():
+    fn = BatchFn()
+    batcher = MicroBatcher(fn, max_batch_size=16, max_wait_ms=5)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(run()) == [0, 10, 20, 30, 40]
+    assert fn.batches == [[0, 1, 2, 3, 4]]
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    fn = BatchFn()
+    batcher = MicroBatcher(fn, max_batch_size=3, max_wait_ms=10_000)
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(3))), 1.0)
+
+    assert asyncio.run(run()) == [0, 10, 20]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_items_queued_while_busy_go_in_the_next_batch():
+    fn = BatchFn(delay=0.02)
+    batcher = MicroBatcher(fn, max_batch_size=2, max_wait_ms=1, max_concurrency=1)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(run()) == [0, 10, 20, 30, 40]
+    assert [len(b) for b in fn.batches] == [2, 2, 1]
+
+
+def test_batch_errors_reach_every_caller():
+    batcher = MicroBatcher(BatchFn(fail=True), max_wait_ms=1)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert batcher.stats()["errors"] == 1
+
+
+def test_result_count_mismatch_is_an_error():
+    async def short(items):
+        return items[:-1]
+
+    batcher = MicroBatcher(short, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="results for"):
+        asyncio.run(batcher.submit(1))
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+from modbot.infrastructure.providers.toxicity.base import ToxicityRateLimitError, score_degraded
+from modbot.infrastructure.providers.toxicity.cascade import CLOSED, OPEN, CascadingScorer
+
+
+class Provider:
+    def __init__(self, value, error=None, delay=0.0):
+        self.value = value
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def score(self, text):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_breaker_opens_after_threshold_and_skips_provider():
+    primary = Provider(0.9, error=RuntimeError("500"))
+    floor = Provider(0.0)
+    cascade = CascadingScorer([("primary", primary), ("neutral", floor)], failure_threshold=3, reset_timeout=60)
+
+    async def run():
+        return [await cascade.score("x") for _ in range(5)]
+
+    assert asyncio.run(run()) == [0.0] * 5
+    assert primary.calls == 3  # the last two calls were skipped by the open breaker
+    assert cascade.breaker_states() == {"primary": OPEN}
+    assert cascade.stats()["cascade.primary"]["skipped_open"] == 2
+
+
+def test_half_open_probe_closes_breaker_on_success():
+    primary = Provider(0.9, error=RuntimeError("500"))
+    cascade = CascadingScorer([("primary", primary), ("neutral", Provider(0.0))], failure_threshold=1, reset_timeout=0.05)
+
+    async def run():
+        await cascade.score("x")
+        assert cascade.breaker_states() == {"primary": OPEN}
+        primary.error = None
+        await asyncio.sleep(0.06)
+        return await cascade.score("x")
+
+    assert asyncio.run(run()) == 0.9
+    assert cascade.breaker_states() == {"primary": CLOSED}
+
+
+def test_slow_provider_times_out_within_budget():
+    slow = Provider(0.9, delay=1.0)
+    cascade = CascadingScorer([("slow", slow), ("neutral", Provider(0.1))], budget_seconds=0.05)
+
+    async def run():
+        started = time.monotonic()
+        value = await cascade.score("x")
+        return value, time.monotonic() - started
+
+    value, elapsed = asyncio.run(run())
+    assert value == 0.1
+    assert elapsed < 0.5
+    assert cascade.stats()["cascade.slow"]["timeouts"] == 1
+
+
+def test_rate_limit_falls_through_without_tripping_breaker():
+    busy = Provider(0.9, error=ToxicityRateLimitError("quota"))
+    cascade = CascadingScorer([("busy", busy), ("neutral", Provider(0.2))], failure_threshold=1)
+
+    async def run():
+        return [await cascade.score("x") for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.2] * 3
+    assert busy.calls == 3
+    assert cascade.breaker_states() == {"busy": CLOSED}
+
+
+def test_floor_answer_is_flagged_degraded():
+    cascade = CascadingScorer([("primary", Provider(0.9, error=RuntimeError())), ("neutral", Provider(0.0))])
+
+    async def run():
+        await cascade.score("x")
+        return score_degraded.get()
+
+    assert asyncio.run(run()) is True
@@ -0,0 +1,103 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace as NS
+
+import pytest
+
+from modbot.infrastructure.persistence.db_core import ActionDB
+from modbot.services.moderation_pipeline import EscalationContext
+
+
+def _log(target_id, action="warn_user", status="success"):
+    return dict(guild_id=1, channel_id=2, actor_id=3, action=action, target_id=target_id, reason="test", status=status)
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "memory"])
+def test_counts_include_the_new_row(tmp_path, backend):
+    db = ActionDB(str(tmp_path / "mod.db"), coordination=backend)
+    counts = [db.record_and_count(_log(42), "warn_user", 60)[1] for _ in range(3)]
+    assert counts == [1, 2, 3]
+    # failures are logged but never counted
+    assert db.record_and_count(_log(42, status="failure"), "warn_user", 60)[1] == 3
+
+
+def test_prefix_counts_aggregate_timeout_durations(tmp_path):
+    db = ActionDB(str(tmp_path / "mod.db"))
+    db.record_and_count(_log(7, "timeout_member(10)"), "timeout_member", 60, prefix=True)
+    _, count = db.record_and_count(_log(7, "timeout_member(30)"), "timeout_member", 60, prefix=True)
+    assert count == 2
+
+
+def test_concurrent_writers_each_see_a_distinct_count(tmp_path):
+    """Separate connections (as separate processes would have) racing on one file."""
+    path = str(tmp_path / "mod.db")
+    ActionDB(path)  # create the schema once
+    writers, per_writer = 8, 10
+    counts, errors = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(writers)
+
+    def writer():
+        db = ActionDB(path)
+        start.wait()
+        try:
+            for _ in range(per_writer):
+                _, count = db.record_and_count(_log(99), "warn_user", 60)
+                with lock:
+                    counts.append(count)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    # every insert observed a different total, so a threshold can fire only once
+    assert sorted(counts) == list(range(1, writers * per_writer + 1))
+
+
+def test_queued_rows_count_until_they_fail(tmp_path):
+    db = ActionDB(str(tmp_path / "mod.db"))
+    row_id, count = db.record_and_count(_log(5, status="queued"), "warn_user", 60)
+    assert count == 1
+    db.update_action_status(row_id, "failure", "warn_undelivered")
+    assert db.count_recent(5, "warn_user", 60) == 0
+
+
+def test_escalation_record_waits_for_the_write_lock_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "mod.db")
+    db = ActionDB(path)
+    escalation = NS(parsed={"warn_user": [(2, "timeout_member(10)")]})
+    message = NS(id=1, content="bad", guild=NS(id=1), channel=NS(id=2), author=NS(id=77))
+    ctx = EscalationContext(bot=NS(db=db, user=NS(id=3), policy=NS(escalation=escalation)), message=message, toxicity=0.9, window_minutes=60)
+
+    other_process = sqlite3.connect(path, check_same_thread=False)
+    other_process.execute("BEGIN IMMEDIATE")
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.2, other_process.commit)
+        started = time.monotonic()
+        await ctx.record("warn_user", 77)
+        await ctx.record("warn_user", 77)
+        tick_task.cancel()
+        return ticks, time.monotonic() - started
+
+    ticks, elapsed = asyncio.run(run())
+    assert elapsed >= 0.2
+    assert ticks >= 5  # the loop kept running while the insert waited for the lock
+    assert ctx.pending_followups == ["timeout_member(10)"]
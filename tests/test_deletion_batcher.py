@@ -0,0 +1,117 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace as NS
+
+import discord
+
+from modbot.services.deletion_batcher import BULK_MAX, DeletionBatcher
+
+
+class _Response:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "test"
+
+
+class Channel:
+    def __init__(self, cid=1, bulk_error=None):
+        self.id = cid
+        self.bulk_error = bulk_error
+        self.bulk_calls = []
+
+    async def delete_messages(self, messages, reason=None):
+        self.bulk_calls.append([m.id for m in messages])
+        if self.bulk_error is not None:
+            raise self.bulk_error
+
+
+class Message:
+    def __init__(self, mid, channel, age=timedelta(seconds=5), error=None):
+        self.id = mid
+        self.channel = channel
+        self.guild = NS(id=9)
+        self.created_at = discord.utils.utcnow() - age
+        self.error = error
+        self.deleted = False
+
+    async def delete(self):
+        if self.error is not None:
+            raise self.error
+        self.deleted = True
+
+
+def _delete_all(batcher, messages):
+    async def run():
+        return await asyncio.gather(*(batcher.delete(m, "spam") for m in messages))
+    return asyncio.run(run())
+
+
+def test_same_channel_deletes_share_one_bulk_call_and_batch_id():
+    channel = Channel()
+    batcher = DeletionBatcher(window_seconds=0.02)
+    results = _delete_all(batcher, [Message(i, channel) for i in range(3)])
+    assert channel.bulk_calls == [[0, 1, 2]]
+    assert {r[:2] for r in results} == {(True, None)}
+    batch_ids = {r[2] for r in results}
+    assert len(batch_ids) == 1 and None not in batch_ids
+    assert batcher.stats()["deletes"]["bulk_deleted"] == 3
+
+
+def test_full_batch_flushes_without_waiting_for_the_window():
+    channel = Channel()
+    batcher = DeletionBatcher(window_seconds=30)
+
+    async def run():
+        messages = [Message(i, channel) for i in range(BULK_MAX)]
+        return await asyncio.wait_for(asyncio.gather(*(batcher.delete(m, "raid") for m in messages)), 1.0)
+
+    results = asyncio.run(run())
+    assert len(channel.bulk_calls) == 1 and len(channel.bulk_calls[0]) == BULK_MAX
+    assert all(ok for ok, _, _ in results)
+
+
+def test_old_messages_and_lone_deletes_use_single_delete():
+    channel = Channel()
+    batcher = DeletionBatcher(window_seconds=0.02)
+    old, lone = Message(1, channel, age=timedelta(days=15)), Message(2, Channel(cid=2))
+    results = _delete_all(batcher, [old, lone])
+    assert results == [(True, None, None), (True, None, None)]
+    assert old.deleted and lone.deleted
+    assert channel.bulk_calls == []
+    assert batcher.stats()["deletes"]["single"] == 2
+
+
+def test_failed_bulk_call_falls_back_to_single_deletes_with_the_batch_id():
+    channel = Channel(bulk_error=discord.HTTPException(_Response(400), "unknown message"))
+    forbidden = discord.Forbidden(_Response(403), "missing permissions")
+    messages = [Message(1, channel), Message(2, channel, error=forbidden), Message(3, channel)]
+    batcher = DeletionBatcher(window_seconds=0.02)
+    results = _delete_all(batcher, messages)
+    batch_id = results[0][2]
+    assert batch_id is not None
+    assert results == [(True, None, batch_id), (False, "forbidden", batch_id), (True, None, batch_id)]
+    assert messages[0].deleted and messages[2].deleted
+    assert batcher.stats()["deletes"]["bulk_fallbacks"] == 1
+
+
+def test_forbidden_bulk_call_fails_the_whole_batch():
+    channel = Channel(bulk_error=discord.Forbidden(_Response(403), "missing permissions"))
+    batcher = DeletionBatcher(window_seconds=0.02)
+    messages = [Message(i, channel) for i in range(2)]
+    results = _delete_all(batcher, messages)
+    assert [r[:2] for r in results] == [(False, "forbidden")] * 2
+    assert not any(m.deleted for m in messages)
+
+
+def test_aclose_sends_pending_batches():
+    channel = Channel()
+    batcher = DeletionBatcher(window_seconds=30)
+
+    async def run():
+        tasks = [asyncio.create_task(batcher.delete(Message(i, channel), "spam")) for i in range(2)]
+        await asyncio.sleep(0)
+        await batcher.aclose()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+    assert channel.bulk_calls == [[0, 1]] and all(ok for ok, _, _ in results)
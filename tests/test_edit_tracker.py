@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace as NS
+
+from modbot.services.edit_tracker import EditTracker
+
+
+def msg(mid, content):
+    return NS(id=mid, content=content)
+
+
+def test_unchanged_content_is_detected():
+    tracker = EditTracker(lambda m: None)
+    tracker.remember(msg(1, "hello"))
+    assert tracker.is_unchanged(1, "hello")
+    assert not tracker.is_unchanged(1, "hello!")
+    assert tracker.is_unchanged(1, "hello!")  # the changed text is now the baseline
+    assert not tracker.is_unchanged(2, "never seen")
+    assert tracker.stats()["edits"]["unchanged"] == 2
+
+
+def test_burst_of_edits_submits_only_the_last_version():
+    submitted = []
+    tracker = EditTracker(submitted.append, debounce_seconds=0.03)
+
+    async def run():
+        for text in ("a", "ab", "abc"):
+            tracker.schedule(msg(1, text))
+            await asyncio.sleep(0.01)
+        tracker.schedule(msg(2, "other"))
+        await asyncio.sleep(0.06)
+
+    asyncio.run(run())
+    assert [(m.id, m.content) for m in submitted] == [(1, "abc"), (2, "other")]
+    counts = tracker.stats()["edits"]
+    assert counts["superseded"] == 2 and counts["rescored"] == 2 and counts["pending"] == 0
+
+
+def test_cancel_all_drops_pending_edits():
+    submitted = []
+    tracker = EditTracker(submitted.append, debounce_seconds=0.01)
+
+    async def run():
+        tracker.schedule(msg(1, "x"))
+        tracker.cancel_all()
+        await asyncio.sleep(0.03)
+
+    asyncio.run(run())
+    assert submitted == []
+
+
+def test_oldest_hashes_are_evicted_past_max_tracked():
+    tracker = EditTracker(lambda m: None, max_tracked=2)
+    for i in range(3):
+        tracker.remember(msg(i, "same"))
+    assert tracker.stats()["edits"]["tracked"] == 2
+    assert not tracker.is_unchanged(0, "same")  # forgotten, treated as changed
+    assert tracker.is_unchanged(2, "same")
@@ -0,0 +1,100 @@
+from types import SimpleNamespace as NS
+
+from modbot.domain.policy.models import ScopePolicy
+from modbot.services.exemptions import ExemptionIndex
+
+NO_PERMS = NS(manage_guild=False, administrator=False)
+
+
+def make_guild(channels=(), roles=()):
+    guild = NS(id=1, owner_id=100, roles=list(roles), channels=list(channels))
+    by_id = {c.id: c for c in guild.channels}
+    guild.get_channel = by_id.get
+    for c in guild.channels:
+        c.guild = guild
+    return guild
+
+
+def channel(cid, name, category_id=None, parent_id=None):
+    return NS(id=cid, name=name, category_id=category_id, parent_id=parent_id)
+
+
+def role(rid, name, perms=NO_PERMS):
+    return NS(id=rid, name=name, permissions=perms)
+
+
+def index(scope=None, exempt_roles=(), role_names=("mod",)):
+    policy = NS(scope=scope or ScopePolicy(), exempt_roles=list(exempt_roles))
+    return ExemptionIndex(role_names, lambda: policy), policy
+
+
+def member(guild, mid, *roles):
+    return NS(id=mid, guild=guild, roles=list(roles))
+
+
+def test_exempt_by_name_policy_permission_and_ownership():
+    mod, helper, admin, plain = role(10, "Mod"), role(11, "helper"), role(12, "boss", NS(manage_guild=False, administrator=True)), role(13, "member")
+    guild = make_guild(roles=[mod, helper, admin, plain])
+    idx, _ = index(exempt_roles=["Helper"])
+    assert idx.is_exempt_member(member(guild, 1, mod))
+    assert idx.is_exempt_member(member(guild, 2, helper))
+    assert idx.is_exempt_member(member(guild, 3, admin))
+    assert idx.is_exempt_member(member(guild, 100))
+    assert not idx.is_exempt_member(member(guild, 4, plain))
+
+
+def test_member_verdict_is_cached_until_invalidated():
+    mod = role(10, "mod")
+    guild = make_guild(roles=[mod])
+    idx, _ = index()
+    assert not idx.is_exempt_member(member(guild, 1))
+    assert not idx.is_exempt_member(member(guild, 1, mod))  # cached
+    idx.invalidate_member(guild.id, 1)
+    assert idx.is_exempt_member(member(guild, 1, mod))
+
+
+def test_deny_beats_allow_and_threads_inherit_parent_scope():
+    general = channel(20, "general", category_id=5)
+    staff = channel(21, "staff-chat", category_id=6)
+    other = channel(22, "offtopic")
+    category, staff_category = channel(5, "community"), channel(6, "staff")
+    guild = make_guild([general, staff, other, category, staff_category])
+    idx, _ = index(ScopePolicy(allow_categories=["community", "staff"], deny_channels=["staff-chat"]))
+    thread = NS(id=30, guild=guild, parent_id=20, category_id=None)
+    staff_thread = NS(id=31, guild=guild, parent_id=21, category_id=None)
+
+    assert idx.channel_in_scope(general)
+    assert not idx.channel_in_scope(staff)
+    assert not idx.channel_in_scope(other)  # not in an allowed category
+    assert idx.channel_in_scope(thread)
+    assert not idx.channel_in_scope(staff_thread)
+
+
+def test_empty_allow_list_means_everywhere_and_ids_work():
+    general, logs = channel(20, "general"), channel(21, "logs")
+    guild = make_guild([general, logs])
+    idx, _ = index(ScopePolicy(deny_channels=["21"]))
+    assert idx.channel_in_scope(general)
+    assert not idx.channel_in_scope(logs)
+
+
+def test_policy_reload_takes_effect_after_invalidation():
+    general = channel(20, "general")
+    guild = make_guild([general])
+    idx, policy = index()
+    assert idx.channel_in_scope(general)
+    policy.scope = ScopePolicy(deny_channels=["general"])
+    assert idx.channel_in_scope(general)  # still cached
+    idx.invalidate_all()
+    assert not idx.channel_in_scope(general)
+
+
+def test_skip_reason_counts_each_reason():
+    general, logs, mod = channel(20, "general"), channel(21, "logs"), role(10, "mod")
+    guild = make_guild([general, logs], [mod])
+    idx, _ = index(ScopePolicy(deny_channels=["logs"]))
+    assert idx.skip_reason(NS(guild=guild, channel=logs, author=member(guild, 1))) == "out_of_scope"
+    assert idx.skip_reason(NS(guild=guild, channel=general, author=member(guild, 2, mod))) == "exempt_member"
+    assert idx.skip_reason(NS(guild=guild, channel=general, author=member(guild, 3))) is None
+    assert idx.skip_reason(NS(guild=None, channel=general, author=member(guild, 3))) is None
+    assert idx.stats()["exemptions"] == {"guilds_indexed": 1, "exempt_member": 1, "out_of_scope": 1}
@@ -0,0 +1,17 @@
+from modbot.services.message_dedup import RecentIdSet
+
+
+def test_repeated_ids_are_rejected():
+    seen = RecentIdSet(10)
+    assert seen.add(1) and seen.add(2)
+    assert not seen.add(1)
+    assert seen.stats()["dedup"]["duplicates_suppressed"] == 1
+
+
+def test_capacity_is_fixed_and_oldest_ids_are_forgotten():
+    seen = RecentIdSet(3)
+    for i in range(5):
+        seen.add(i)
+    assert len(seen) == 3
+    assert 0 not in seen and 1 not in seen and 4 in seen
+    assert seen.add(0)  # evicted, so it counts as new again
@@ -0,0 +1,100 @@
+from types import SimpleNamespace as NS
+
+import discord
+
+from modbot.utils.channel_utils import GuildNameIndex
+
+
+class TextChannel(discord.TextChannel):
+    def __init__(self, cid, name, guild):
+        self.id, self.name, self.guild = cid, name, guild
+
+
+def make_guild():
+    guild = NS(id=1, channels=[], roles=[])
+    guild.text_channels = guild.channels
+    return guild
+
+
+def add_channel(guild, cid, name):
+    ch = TextChannel(cid, name, guild)
+    guild.channels.append(ch)
+    return ch
+
+
+def add_role(guild, rid, name):
+    role = NS(id=rid, name=name, guild=guild)
+    guild.roles.append(role)
+    return role
+
+
+def test_lookup_is_case_insensitive_and_first_wins():
+    guild = make_guild()
+    first = add_channel(guild, 10, "Mod-Alerts")
+    add_channel(guild, 11, "mod-alerts")
+    guild.channels.append(NS(id=12, name="voice", guild=guild))  # not a text channel
+    idx = GuildNameIndex()
+    assert idx.channel(guild, "MOD-ALERTS") is first
+    assert idx.channel(guild, "voice") is None
+
+
+def test_deleting_a_channel_promotes_a_same_name_one():
+    guild = make_guild()
+    first = add_channel(guild, 10, "alerts")
+    second = add_channel(guild, 11, "alerts")
+    idx = GuildNameIndex()
+    idx.build(guild)
+    guild.channels.remove(first)
+    idx.channel_deleted(first)
+    assert idx.channel(guild, "alerts") is second
+    guild.channels.remove(second)
+    idx.channel_deleted(second)
+    assert idx.channel(guild, "alerts") is None
+
+
+def test_channel_rename_moves_the_entry():
+    guild = make_guild()
+    before = add_channel(guild, 10, "alerts")
+    other = add_channel(guild, 11, "alerts")
+    idx = GuildNameIndex()
+    idx.build(guild)
+    after = TextChannel(10, "mod-log", guild)
+    guild.channels[0] = after
+    idx.channel_updated(before, after)
+    assert idx.channel(guild, "alerts") is other
+    assert idx.channel(guild, "mod-log") is after
+
+
+def test_created_channel_does_not_replace_existing_name():
+    guild = make_guild()
+    first = add_channel(guild, 10, "alerts")
+    idx = GuildNameIndex()
+    idx.build(guild)
+    idx.channel_created(add_channel(guild, 11, "alerts"))
+    idx.channel_created(add_channel(guild, 12, "new"))
+    assert idx.channel(guild, "alerts") is first
+    assert idx.channel(guild, "new").id == 12
+
+
+def test_role_rename_and_delete():
+    guild = make_guild()
+    old = add_role(guild, 20, "Mods")
+    spare = add_role(guild, 21, "mods")
+    idx = GuildNameIndex()
+    assert idx.role(guild, "mods") is old
+    renamed = NS(id=20, name="staff", guild=guild)
+    guild.roles[0] = renamed
+    idx.role_updated(old, renamed)
+    assert idx.role(guild, "mods") is spare
+    assert idx.role(guild, "staff") is renamed
+    guild.roles.remove(renamed)
+    idx.role_deleted(renamed)
+    assert idx.role(guild, "staff") is None
+
+
+def test_events_for_unindexed_guilds_are_ignored():
+    guild = make_guild()
+    idx = GuildNameIndex()
+    idx.channel_created(add_channel(guild, 10, "alerts"))
+    idx.role_created(add_role(guild, 20, "mods"))
+    assert idx.channel(guild, "alerts").id == 10  # built lazily from the guild
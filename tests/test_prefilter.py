@@ -0,0 +1,70 @@
+import asyncio
+
+from modbot.config.settings import BotConfig
+from modbot.infrastructure.providers.toxicity.prefilter import AhoCorasick, LexicalPrefilter, PrefilteredScorer
+
+
+class Model:
+    def __init__(self):
+        self.seen = []
+
+    async def score(self, text):
+        self.seen.append(text)
+        return 0.5
+
+
+def test_short_abuse_still_reaches_the_model():
+    assert LexicalPrefilter().classify("kys") is None
+    assert LexicalPrefilter().classify("k") == 0.0
+
+
+def test_wordlist_wins_over_the_length_shortcut():
+    prefilter = LexicalPrefilter(["kys"], max_benign_len=5, hit_score=0.95)
+    assert prefilter.classify("KYS") == 0.95
+    assert prefilter.classify("ok") == 0.0
+
+
+def test_emoji_and_punctuation_only_skip_the_model():
+    prefilter = LexicalPrefilter(max_benign_len=0)
+    assert prefilter.classify("<:pog:1234> !!! ...") == 0.0
+    assert prefilter.classify("ab") is None
+
+
+def test_whole_word_matching():
+    matcher = AhoCorasick(["ass"])
+    assert matcher.search("you ass") == "ass"
+    assert matcher.search("classic") is None
+
+
+def test_default_setting_keeps_short_messages_scored():
+    assert BotConfig.model_fields["prefilter_max_benign_len"].default <= 1
+
+
+def test_prefiltered_scorer_only_forwards_ambiguous_text():
+    model = Model()
+    scorer = PrefilteredScorer(model, LexicalPrefilter(["idiot"]))
+
+    async def run():
+        return [await scorer.score(t) for t in ("idiot", "?", "kys", "hello there")]
+
+    assert asyncio.run(run()) == [0.95, 0.0, 0.5, 0.5]
+    assert model.seen == ["kys", "hello there"]
+    assert scorer.stats()["prefilter"]["to_model"] == 2
+
+
+def test_benign_replies_skip_the_model_but_short_abuse_does_not():
+    model = Model()
+    scorer = PrefilteredScorer(model, LexicalPrefilter())
+
+    async def run():
+        return [await scorer.score(t) for t in ("lol", "LOL!!", "thank you", "kys", "lol ok")]
+
+    assert asyncio.run(run()) == [0.0, 0.0, 0.0, 0.5, 0.5]
+    assert model.seen == ["kys", "lol ok"]
+
+
+def test_benign_allowlist_is_configurable():
+    assert LexicalPrefilter(benign_terms=()).classify("lol") is None
+    assert LexicalPrefilter(benign_terms=["brb"]).classify("BRB") == 0.0
+    # a wordlist term always wins over the allowlist
+    assert LexicalPrefilter(["ok"], benign_terms=["ok"]).classify("ok") == 0.95
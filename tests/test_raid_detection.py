@@ -0,0 +1,103 @@
+from types import SimpleNamespace as NS
+
+from modbot.domain.policy.models import RaidPolicy
+from modbot.services.raid_detection import RaidDetector, fingerprint
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def setup(**raid):
+    clock = Clock()
+    policy = NS(raid=RaidPolicy(enabled=True, **raid))
+    return RaidDetector(lambda: policy, clock=clock), clock, policy
+
+
+def msg(author, content="hello", channel=1):
+    return NS(channel=NS(id=channel), author=NS(id=author), guild=NS(id=9), content=content)
+
+
+def test_fingerprint_ignores_case_spacing_and_mentions():
+    assert fingerprint("JOIN   <@123> now") == fingerprint("join <@!456> now")
+    assert fingerprint("<@123> <#5>") is None
+
+
+def test_disabled_policy_observes_nothing():
+    detector = RaidDetector(lambda: NS(raid=RaidPolicy()))
+    assert detector.observe(msg(1)) is None
+    assert detector.stats()["raid"]["channels_tracked"] == 0
+
+
+def test_message_rate_triggers_raid_once():
+    detector, clock, _ = setup(max_messages=3, window_seconds=10, buffer_size=8)
+    verdicts = []
+    for i in range(5):
+        verdicts.append(detector.observe(msg(i, f"text {i}")))
+        clock.now += 1
+    assert verdicts[:2] == [None, None]
+    assert [v.entered for v in verdicts[2:]] == [True, False, False]
+    assert not any(v.duplicate for v in verdicts[2:])
+    assert detector.raids_started == 1
+
+
+def test_window_cutoff_forgets_old_messages():
+    detector, clock, _ = setup(max_messages=3, window_seconds=10, buffer_size=8)
+    detector.observe(msg(1, "a"))
+    detector.observe(msg(2, "b"))
+    clock.now += 11
+    assert detector.observe(msg(3, "c")) is None
+
+
+def test_duplicate_authors_threshold_marks_the_fingerprint():
+    detector, clock, _ = setup(duplicate_authors=3, max_messages=100, buffer_size=100)
+    assert detector.observe(msg(1, "free nitro")) is None
+    assert detector.observe(msg(1, "free nitro")) is None  # same author twice is not a raid
+    assert detector.observe(msg(2, "free nitro")) is None
+    third = detector.observe(msg(3, "FREE  nitro <@42>"))
+    assert third.entered and third.duplicate
+    later = detector.observe(msg(4, "free nitro"))
+    assert later.duplicate and not later.entered
+    other = detector.observe(msg(5, "hi all"))
+    assert other is not None and not other.duplicate  # scored, but still in raid mode
+
+
+def test_cooldown_expiry_ends_the_raid():
+    detector, clock, _ = setup(max_messages=2, window_seconds=5, cooldown_seconds=30, buffer_size=8, duplicate_authors=2)
+    detector.observe(msg(1, "spam"))
+    assert detector.observe(msg(2, "spam")).duplicate
+    clock.now += 20
+    assert detector.observe(msg(3, "spam")).duplicate  # still within the cooldown
+    clock.now += 31
+    verdict = detector.observe(msg(4, "spam"))
+    assert verdict is None  # raid over; its fingerprints were cleared
+    assert detector.active_channels() == 0
+
+
+def test_buffer_resize_on_reload_keeps_history():
+    detector, clock, policy = setup(max_messages=3, window_seconds=10, buffer_size=8)
+    detector.observe(msg(1, "a"))
+    detector.observe(msg(2, "b"))
+    policy.raid = RaidPolicy(enabled=True, max_messages=3, window_seconds=10, buffer_size=16)
+    verdict = detector.observe(msg(3, "c"))
+    assert verdict is not None and verdict.entered
+
+
+def test_idle_channels_are_evicted_but_raiding_ones_are_kept():
+    detector, clock, _ = setup(max_messages=2, window_seconds=10, cooldown_seconds=60, buffer_size=8)
+    detector.observe(msg(1, "a", channel=1))
+    detector.observe(msg(1, "x", channel=2))
+    detector.observe(msg(2, "y", channel=2))  # channel 2 enters raid mode
+    clock.now += 15
+    detector.observe(msg(3, "b", channel=3))
+    stats = detector.stats()["raid"]
+    assert stats["channels_tracked"] == 2  # channel 1 dropped, 2 raiding, 3 new
+    assert stats["channels_evicted"] == 1
+    assert stats["active_raids"] == 1
+    clock.now += 61
+    detector.observe(msg(4, "c", channel=3))
+    assert detector.stats()["raid"]["channels_tracked"] == 1
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from modbot.infrastructure.providers.toxicity.base import ToxicityRateLimitError
+from modbot.infrastructure.providers.toxicity.rate_limit import RateLimitedScorer, TokenBucket
+
+
+class Provider:
+    def __init__(self, value, error=None, delay=0.0):
+        self.value = value
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def score(self, text):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_bucket_reservations_queue_behind_the_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+    bucket.refund()
+    assert bucket.peek_wait() == pytest.approx(0.2, abs=0.01)
+
+
+def test_drain_forfeits_banked_burst():
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.drain()
+    assert bucket.peek_wait() == pytest.approx(0.1, abs=0.01)
+
+
+def test_calls_past_the_deadline_go_to_the_fallback():
+    inner, fallback = Provider(0.9), Provider(0.1)
+    scorer = RateLimitedScorer(inner, qps=1, burst=1, deadline_seconds=0.5, fallback=fallback)
+
+    async def run():
+        return [await scorer.score("x") for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.9, 0.1, 0.1]
+    assert inner.calls == 1
+    assert scorer.stats()["perspective.rate_limit"]["shed_deadline"] == 2
+
+
+def test_full_queue_sheds_immediately():
+    inner, fallback = Provider(0.9), Provider(0.1)
+    scorer = RateLimitedScorer(inner, qps=20, burst=1, max_queue=1, deadline_seconds=1.0, fallback=fallback)
+
+    async def run():
+        return await asyncio.gather(*(scorer.score("x") for _ in range(3)))
+
+    assert sorted(asyncio.run(run())) == [0.1, 0.9, 0.9]
+    assert scorer.shed_queue_full == 1 and scorer.queued == 1
+
+
+def test_upstream_429_drains_bucket_and_raises_without_fallback():
+    inner = Provider(0.9, error=ToxicityRateLimitError("429"))
+    scorer = RateLimitedScorer(inner, qps=1, burst=3)
+
+    with pytest.raises(ToxicityRateLimitError):
+        asyncio.run(scorer.score("x"))
+    assert scorer.upstream_429 == 1
+    assert scorer.bucket.peek_wait() > 0
+
+
+def test_slow_upstream_times_out_to_fallback():
+    scorer = RateLimitedScorer(Provider(0.9, delay=1.0), qps=10, deadline_seconds=0.05, fallback=Provider(0.2))
+    assert asyncio.run(scorer.score("x")) == 0.2
+    assert scorer.timeouts == 1
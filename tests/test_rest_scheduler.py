@@ -0,0 +1,67 @@
+import asyncio
+
+from modbot.services.rest_scheduler import RestPriority, RestScheduler
+
+
+def test_slots_go_to_higher_priority_first():
+    order = []
+
+    async def call(scheduler, priority, route, tag):
+        async with scheduler.slot(priority, route):
+            order.append(tag)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        scheduler = RestScheduler(max_concurrent=1, route_limit=1)
+        first = asyncio.create_task(call(scheduler, RestPriority.DM, ("dm", 0), "dm0"))
+        await asyncio.sleep(0)  # dm0 holds the only slot
+        waiters = [
+            asyncio.create_task(call(scheduler, RestPriority.DM, ("dm", 1), "dm1")),
+            asyncio.create_task(call(scheduler, RestPriority.ESCALATE, ("channel", 2), "escalate")),
+            asyncio.create_task(call(scheduler, RestPriority.DELETE, ("channel", 1), "delete")),
+            asyncio.create_task(call(scheduler, RestPriority.TIMEOUT, ("guild", 1), "timeout")),
+        ]
+        await asyncio.gather(first, *waiters)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert order == ["dm0", "delete", "timeout", "escalate", "dm1"]
+    assert scheduler.stats()["rest"]["in_flight"] == 0
+
+
+def test_route_limit_lets_other_routes_through():
+    active = {"channel": 0, "max": 0}
+
+    async def call(scheduler, route):
+        async with scheduler.slot(RestPriority.DELETE, route):
+            if route == ("channel", 1):
+                active["channel"] += 1
+                active["max"] = max(active["max"], active["channel"])
+            await asyncio.sleep(0.01)
+            if route == ("channel", 1):
+                active["channel"] -= 1
+
+    async def run():
+        scheduler = RestScheduler(max_concurrent=4, route_limit=1)
+        await asyncio.gather(*(call(scheduler, ("channel", 1)) for _ in range(3)), call(scheduler, ("channel", 2)))
+
+    asyncio.run(run())
+    assert active["max"] == 1
+
+
+def test_cancelled_waiter_does_not_hold_a_slot():
+    async def run():
+        scheduler = RestScheduler(max_concurrent=1)
+        holder = scheduler.slot(RestPriority.DELETE, "a")
+        await holder.__aenter__()
+        waiter = asyncio.create_task(scheduler.slot(RestPriority.DM, "b").__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await holder.__aexit__(None, None, None)
+        async with scheduler.slot(RestPriority.DM, "c"):
+            pass
+        return scheduler.stats()["rest"]
+
+    stats = asyncio.run(run())
+    assert stats["in_flight"] == 0 and stats["dm_queued"] == 0
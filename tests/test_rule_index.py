@@ -0,0 +1,46 @@
+import pytest
+
+from modbot.domain.policy.index import RuleIndex
+from modbot.domain.policy.models import ModerationRule
+
+
+def rule(name, cond):
+    return ModerationRule(name=name, actions=["warn_user"], **{"if": cond})
+
+
+def test_lookup_uses_half_open_ranges():
+    low, mid, high = rule("low", "0.3 <= toxicity < 0.6"), rule("mid", "0.6 <= toxicity < 0.85"), rule("high", "toxicity >= 0.85")
+    index = RuleIndex([low, mid, high])
+    assert index.lookup(0.1)[0] is None
+    assert index.lookup(0.3)[0] is low
+    assert index.lookup(0.5999)[0] is low
+    assert index.lookup(0.6)[0] is mid
+    assert index.lookup(0.85)[0] is high
+    assert index.lookup(1.0)[0] is high
+    assert index.diagnostics == []
+
+
+def test_gaps_between_rules_match_nothing():
+    index = RuleIndex([rule("a", "0.2 <= toxicity < 0.4"), rule("b", "0.6 <= toxicity < 0.8")])
+    assert index.lookup(0.5) == (None, ())
+    assert index.lookup(0.8) == (None, ())
+
+
+def test_earlier_rule_wins_and_overlap_is_reported():
+    broad, narrow = rule("broad", "toxicity >= 0.5"), rule("narrow", "0.4 <= toxicity < 0.7")
+    index = RuleIndex([broad, narrow])
+    assert index.lookup(0.45)[0] is narrow
+    assert index.lookup(0.6)[0] is broad
+    [message] = index.diagnostics
+    assert "'narrow'" in message and "overlaps earlier rule 'broad'" in message
+
+
+def test_fully_shadowed_rule_is_reported():
+    index = RuleIndex([rule("all", "toxicity >= 0.1"), rule("dead", "0.5 <= toxicity < 0.6")])
+    assert index.lookup(0.55)[0].name == "all"
+    assert index.diagnostics == ["rule 'dead' [0.50, 0.60) is fully shadowed by earlier rules and never fires"]
+
+
+@pytest.mark.parametrize("value", [0.0, 0.25, 0.999])
+def test_empty_index_matches_nothing(value):
+    assert RuleIndex([]).lookup(value) == (None, ())
@@ -0,0 +1,100 @@
+import asyncio
+
+from modbot.infrastructure.providers.toxicity.base import score_degraded
+from modbot.infrastructure.providers.toxicity.cache import CachingScorer
+
+
+class SlowScorer:
+    def __init__(self, value=0.7, delay=0.02, fail=False, degraded=False):
+        self.value = value
+        self.delay = delay
+        self.fail = fail
+        self.degraded = degraded
+        self.calls = 0
+
+    async def score(self, text):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        if self.degraded:
+            score_degraded.set(True)
+        return self.value
+
+
+def test_concurrent_identical_texts_share_one_upstream_call():
+    inner = SlowScorer()
+    cache = CachingScorer(inner)
+
+    async def run():
+        return await asyncio.gather(*(cache.score("same text") for _ in range(10)))
+
+    assert asyncio.run(run()) == [0.7] * 10
+    assert inner.calls == 1
+    assert cache.misses == 1 and cache.coalesced == 9
+
+
+def test_cosmetic_variants_hit_the_same_entry():
+    inner = SlowScorer(delay=0)
+    cache = CachingScorer(inner)
+
+    async def run():
+        await cache.score("You  are​ AWFUL")
+        return await cache.score("you are awful")
+
+    assert asyncio.run(run()) == 0.7
+    assert inner.calls == 1 and cache.hits == 1
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    inner = SlowScorer(fail=True)
+    cache = CachingScorer(inner)
+
+    async def run():
+        return await asyncio.gather(*(cache.score("x") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert inner.calls == 1
+    inner.fail = False
+    assert asyncio.run(cache.score("x")) == 0.7
+    assert inner.calls == 2
+
+
+def test_degraded_scores_are_not_cached():
+    inner = SlowScorer(delay=0, degraded=True)
+    cache = CachingScorer(inner)
+
+    async def run():
+        await cache.score("x")
+        await cache.score("x")
+
+    asyncio.run(run())
+    assert inner.calls == 2
+    assert cache.stats()["cache"]["size"] == 0
+
+
+def test_lru_evicts_oldest_entry():
+    inner = SlowScorer(delay=0)
+    cache = CachingScorer(inner, max_entries=2)
+
+    async def run():
+        for text in ("a", "b", "a", "c", "a", "b"):
+            await cache.score(text)
+
+    asyncio.run(run())
+    # "b" was least recently used when "c" arrived, so it had to be re-scored
+    assert inner.calls == 4
+    assert cache.evictions == 2
+
+
+def test_expired_entries_are_rescored():
+    inner = SlowScorer(delay=0)
+    cache = CachingScorer(inner, ttl_seconds=0)
+
+    async def run():
+        await cache.score("x")
+        await cache.score("x")
+
+    asyncio.run(run())
+    assert inner.calls == 2 and cache.expirations == 1
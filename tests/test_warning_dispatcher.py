@@ -0,0 +1,112 @@
+import asyncio
+
+import discord
+
+from modbot.services.warning_dispatcher import DM_CLOSED_CODE, WarningDispatcher
+
+
+class _Response:
+    status = 403
+    reason = "Forbidden"
+
+
+def dm_closed():
+    return discord.Forbidden(_Response(), {"code": DM_CLOSED_CODE, "message": "Cannot send messages to this user"})
+
+
+class Channel:
+    def __init__(self, cid, error=None):
+        self.id = cid
+        self.error = error
+        self.sent = []
+
+    async def send(self, content):
+        if self.error is not None:
+            raise self.error
+        self.sent.append(content)
+
+
+class User:
+    def __init__(self, uid, dm_error=None):
+        self.id = uid
+        self.dm_channel = None
+        self.dm = Channel(1000 + uid, dm_error)
+        self.create_dm_calls = 0
+
+    async def create_dm(self):
+        self.create_dm_calls += 1
+        return self.dm
+
+
+def collect():
+    results = []
+    return results, lambda log_id, status, reason: results.append((log_id, status, reason))
+
+
+def run_dispatch(dispatcher, submissions, links=True):
+    async def run():
+        queued = [dispatcher.submit(*args) for args in submissions]
+        if links:
+            for i, q in enumerate(queued):
+                q.link(i + 1)
+        await dispatcher.aclose()
+        return queued
+    return asyncio.run(run())
+
+
+def test_warnings_within_the_window_become_one_dm():
+    results, on_result = collect()
+    dispatcher = WarningDispatcher(window_seconds=0.01, on_result=on_result)
+    user, channel = User(1), Channel(5)
+    run_dispatch(dispatcher, [(user, channel, "first", "fb"), (user, channel, "second", "fb")])
+    [dm] = user.dm.sent
+    assert dm.startswith("You received 2 moderation warnings") and "first" in dm and "second" in dm
+    assert channel.sent == []
+    assert sorted(results) == [(1, "success", None), (2, "success", None)]
+    assert dispatcher.counts["coalesced"] == 1 and dispatcher.counts["sent"] == 1
+
+
+def test_closed_dms_are_remembered_and_fall_back_per_channel():
+    results, on_result = collect()
+    dispatcher = WarningDispatcher(window_seconds=0, on_result=on_result)
+    user = User(1, dm_error=dm_closed())
+    a, b = Channel(5), Channel(6)
+    run_dispatch(dispatcher, [(user, a, "dm", "a1"), (user, a, "dm", "a2"), (user, b, "dm", "b1")])
+    assert a.sent == ["a2"] and b.sent == ["b1"]  # one mention per channel, latest text
+    assert {s for _, s, _ in results} == {"success"}
+
+    run_dispatch(dispatcher, [(user, a, "dm", "a3")])
+    assert user.create_dm_calls == 1  # second round skipped the DM entirely
+    assert a.sent[-1] == "a3"
+    assert dispatcher.counts["skipped_closed"] == 1
+
+
+def test_failed_fallback_marks_only_that_channel_undelivered():
+    results, on_result = collect()
+    dispatcher = WarningDispatcher(window_seconds=0, on_result=on_result)
+    user = User(1, dm_error=RuntimeError("dm down"))
+    ok, broken = Channel(5), Channel(6, error=RuntimeError("no perms"))
+    run_dispatch(dispatcher, [(user, ok, "dm", "x"), (user, broken, "dm", "y")])
+    assert sorted(results) == [(1, "success", None), (2, "failure", "warn_undelivered")]
+
+
+def test_outcome_is_reported_when_the_link_arrives_late():
+    results, on_result = collect()
+    dispatcher = WarningDispatcher(window_seconds=0, on_result=on_result)
+    user = User(1)
+
+    async def run():
+        queued = dispatcher.submit(user, Channel(5), "dm", "fb")
+        await dispatcher.aclose()  # delivered before the action_log row exists
+        assert results == []
+        queued.link(42)
+
+    asyncio.run(run())
+    assert results == [(42, "success", None)]
+
+
+def test_unlinked_warnings_report_nothing():
+    results, on_result = collect()
+    dispatcher = WarningDispatcher(window_seconds=0, on_result=on_result)
+    run_dispatch(dispatcher, [(User(1), Channel(5), "dm", "fb")], links=False)
+    assert results == [] and dispatcher.counts["sent"] == 1